@@ -0,0 +1,75 @@
+"""
+Micro-benchmark de GcodeSimulator (G-code sin metadatos del slicer).
+
+Genera G-code sintético con perímetros, desplazamientos, cambios de
+aceleración (M204) y comentarios ';' y '(...)', y mide líneas/s de
+simulate_text y de simulate_file (mmap por bloques). Uso, desde la raíz
+del proyecto:
+
+    python benchmarks/bench_gcode_simulator.py [--lines 2000000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logic.gcode_simulator import GcodeSimulator  # noqa: E402
+
+
+def make_gcode(lines):
+    body = ["M83\n", "M204 P1500 R1500 T3000\n"]
+    x = y = 0.0
+    for i in range(lines):
+        x = (x + 0.37) % 200
+        y = (y + 0.53) % 200
+        if i % 97 == 0:
+            body.append(";TYPE:Perimeter\n")
+        elif i % 211 == 0:
+            body.append("M204 P1200 (perímetro exterior)\n")
+        elif i % 50 == 0:
+            body.append(f"G0 F9000 X{x:.3f} Y{y:.3f}\n")
+        else:
+            body.append(f"G1 X{x:.3f} Y{y:.3f} E0.02130\n")
+    return ''.join(body)
+
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(label, lines, seconds):
+    print(f"{label:<32} {seconds * 1000:9.1f} ms  {lines / seconds / 1e6:8.2f} M líneas/s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--lines', type=int, default=2_000_000)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    raw = make_gcode(args.lines).encode()
+    lines = raw.count(b'\n')
+    simulator = GcodeSimulator()
+    print(f"G-code sintético: {lines} líneas, {len(raw) / 1e6:.1f} MB\n")
+
+    report("simulate_text", lines, best_of(args.repeat, simulator.simulate_text, raw))
+    fd, path = tempfile.mkstemp(suffix='.gcode')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+        report("simulate_file (mmap)", lines, best_of(args.repeat, simulator.simulate_file, path))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark de la extracción de metadatos de SlicerParser.
+
+Compara el enfoque anterior (un re.search por clave y por slicer sobre el
+texto) con el patrón combinado de dialectos (una sola pasada), sobre G-code
+sintético grande. Uso, desde la raíz del proyecto:
+
+    python benchmarks/bench_slicer_parser.py [--lines 2000000] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logic.slicer_parser import SlicerParser  # noqa: E402
+
+PRUSA_FOOTER = """; estimated printing time (normal mode) = 1d 2h 3m 4s
+; filament used [mm] = 123456.78, 2345.6
+; filament used [cm3] = 296.3
+; filament used [g] = 367.41, 7.02
+; total filament cost = 9.18
+"""
+
+
+def make_gcode(lines):
+    """G-code con movimientos variados y los metadatos de Prusa al final."""
+    body = []
+    x = y = 0.0
+    e = 0.0
+    for i in range(lines):
+        x = (x + 0.37) % 200
+        y = (y + 0.53) % 200
+        e += 0.0213
+        if i % 97 == 0:
+            body.append(";TYPE:Perimeter\n")
+        elif i % 50 == 0:
+            body.append(f"G0 F9000 X{x:.3f} Y{y:.3f}\n")
+        else:
+            body.append(f"G1 X{x:.3f} Y{y:.3f} E{e:.5f}\n")
+    return ''.join(body) + PRUSA_FOOTER
+
+
+# --- Enfoque anterior: una búsqueda por clave -------------------------------
+
+def legacy_parse(content):
+    data = {}
+    time_match = re.search(r';TIME:(\d+)', content)
+    if time_match:
+        data['print_time_seconds'] = int(time_match.group(1))
+    len_match = re.search(r';Filament used: ([\d.]+)m', content)
+    if len_match:
+        data['filament_length_m'] = float(len_match.group(1))
+    weight_match = re.search(r';Filament weight: ([\d.]+)g', content)
+    if weight_match:
+        data['filament_weight_g'] = float(weight_match.group(1))
+    if 'print_time_seconds' in data:
+        return data
+
+    data = {}
+    time_match = re.search(r'; estimated printing time(?: \(normal mode\))? = (.*)', content)
+    if time_match:
+        time_str = time_match.group(1)
+        total = 0
+        for unit, factor in (('d', 86400), ('h', 3600), ('m', 60), ('s', 1)):
+            m = re.search(r'(\d+)' + unit, time_str)
+            if m:
+                total += int(m.group(1)) * factor
+        data['print_time_seconds'] = total
+    weight_match = re.search(r'; filament used \[g\] = ([\d.]+)', content)
+    if weight_match:
+        data['filament_weight_g'] = float(weight_match.group(1))
+    len_match = re.search(r'; filament used \[mm\] = ([\d.]+)', content)
+    if len_match:
+        data['filament_length_m'] = float(len_match.group(1)) / 1000.0
+    return data if 'print_time_seconds' in data else None
+
+
+def best_of(repeat, func, *args):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(label, lines, seconds):
+    print(f"{label:<42} {seconds * 1000:9.1f} ms  {lines / seconds / 1e6:8.2f} M líneas/s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--lines', type=int, default=2_000_000)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    text = make_gcode(args.lines)
+    raw = text.encode()
+    lines = text.count('\n')
+    parser = SlicerParser()
+    print(f"G-code sintético: {lines} líneas, {len(raw) / 1e6:.1f} MB\n")
+
+    t_old, old = best_of(args.repeat, legacy_parse, text)
+    report("Antes: re.search por clave (texto)", lines, t_old)
+    t_new, new = best_of(args.repeat, parser._parse_sample, raw)
+    report("Después: patrón de dialectos (bytes)", lines, t_new)
+    assert old['print_time_seconds'] == new['print_time_seconds']
+
+    fd, path = tempfile.mkstemp(suffix='.gcode')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+        t_scan, _ = best_of(args.repeat, parser.parse_file, path, True, False)
+        report("Después: parse_file(full_scan=True) con mmap", lines, t_scan)
+    finally:
+        os.remove(path)
+
+    print(f"\nMejora en la extracción: x{t_old / t_new:.1f}")
+
+
+if __name__ == '__main__':
+    main()
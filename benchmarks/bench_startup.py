@@ -0,0 +1,167 @@
+"""
+Benchmark de arranque de la aplicación (main.py) sin pantalla.
+
+Lanza src/main.py con la plataforma Qt "offscreen", --trace-startup y
+--quit-after-startup, y mide arranques en frío y en caliente:
+
+- frío: carpeta de datos vacía (se crea la BD y se aplican todas las
+  migraciones) y caché de bytecode vacía (PYTHONPYCACHEPREFIX nuevo).
+- caliente: se repite sobre la misma carpeta de datos y la misma caché.
+
+Cada ejecución guarda en --history una línea JSON con el commit actual, para
+comparar entre commits. Uso, desde la raíz del proyecto:
+
+    python benchmarks/bench_startup.py [--cold 3] [--warm 5] [--no-save]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MAIN = os.path.join(ROOT, 'src', 'main.py')
+DEFAULT_HISTORY = os.path.join(ROOT, 'benchmarks', 'startup_history.jsonl')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconocido'
+
+
+def launch(home, pycache, timeout):
+    """Un arranque completo; devuelve la traza con 'process_s' añadido."""
+    trace_path = os.path.join(home, 'startup_trace.json')
+    if os.path.exists(trace_path):
+        os.remove(trace_path)
+    env = dict(os.environ,
+               HOME=home, APPDATA=home, QT_QPA_PLATFORM='offscreen',
+               PYTHONPYCACHEPREFIX=pycache)
+    env.pop('FORMEXA_TRACE_STARTUP', None)
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, MAIN, f'--trace-startup={trace_path}', '--quit-after-startup'],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0 or not os.path.exists(trace_path):
+        raise RuntimeError(f"El arranque falló (código {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+    with open(trace_path, encoding='utf-8') as f:
+        trace = json.load(f)
+    trace['process_s'] = elapsed
+    return trace
+
+
+def summarize(traces):
+    """Medianas de tiempo de proceso, primer frame y cada fase (ms)."""
+    phases = {}
+    for trace in traces:
+        for phase in trace['phases']:
+            phases.setdefault(phase['name'], []).append(phase['ms'])
+    return {
+        'runs': len(traces),
+        'process_ms': round(statistics.median(t['process_s'] for t in traces) * 1000, 1),
+        'first_frame_ms': round(statistics.median(t['first_frame_s'] for t in traces) * 1000, 1),
+        'phases_ms': {name: round(statistics.median(values), 1) for name, values in phases.items()},
+    }
+
+
+def run(cold_runs, warm_runs, timeout):
+    cold, warm = [], []
+    for _ in range(cold_runs):
+        home = tempfile.mkdtemp(prefix='formexa-bench-')
+        pycache = os.path.join(home, 'pycache')
+        try:
+            cold.append(launch(home, pycache, timeout))
+            # La carpeta del último arranque en frío sirve para los en caliente
+            if len(cold) == cold_runs:
+                for _ in range(warm_runs):
+                    warm.append(launch(home, pycache, timeout))
+        finally:
+            shutil.rmtree(home, ignore_errors=True)
+    return cold, warm
+
+
+def print_summary(label, summary):
+    print(f"{label}: proceso {summary['process_ms']:.0f} ms, "
+          f"primer frame {summary['first_frame_ms']:.0f} ms (mediana de {summary['runs']})")
+    for name, ms in summary['phases_ms'].items():
+        print(f"  {name:<32} {ms:9.1f} ms")
+
+
+def previous_entry(history, commit):
+    """Última entrada del historial de otro commit (para comparar)."""
+    if not os.path.exists(history):
+        return None
+    entry = None
+    with open(history, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get('commit') != commit:
+                entry = data
+    return entry
+
+
+def print_delta(label, current, previous):
+    if not current or not previous:
+        return
+    before, after = previous['first_frame_ms'], current['first_frame_ms']
+    print(f"  {label}: {before:.0f} -> {after:.0f} ms ({(after - before) / before * 100:+.1f}%)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--cold', type=int, default=3, help="arranques en frío")
+    ap.add_argument('--warm', type=int, default=5, help="arranques en caliente")
+    ap.add_argument('--timeout', type=float, default=120.0)
+    ap.add_argument('--history', default=DEFAULT_HISTORY)
+    ap.add_argument('--no-save', action='store_true', help="no añadir el resultado al historial")
+    args = ap.parse_args()
+
+    cold, warm = run(max(1, args.cold), args.warm, args.timeout)
+    commit = git_commit()
+    entry = {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'cold': summarize(cold),
+        'warm': summarize(warm) if warm else None,
+        'imports': cold[-1]['imports']['by_package'][:10],
+    }
+
+    print(f"Commit {commit}\n")
+    print_summary("Frío", entry['cold'])
+    if entry['warm']:
+        print()
+        print_summary("Caliente", entry['warm'])
+    print("\nImports más caros (arranque en frío):")
+    for row in entry['imports']:
+        print(f"  {row['name']:<32} {row['ms']:9.1f} ms")
+
+    previous = previous_entry(args.history, commit)
+    if previous:
+        print(f"\nPrimer frame frente a {previous['commit']}:")
+        print_delta("frío", entry['cold'], previous['cold'])
+        print_delta("caliente", entry['warm'], previous.get('warm'))
+
+    if not args.no_save:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        print(f"\nGuardado en {os.path.relpath(args.history, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,144 @@
+import itertools
 import sqlite3
 import os
 import sys
+import threading
+import time
+from collections import namedtuple
 from contextlib import contextmanager
+from operator import itemgetter
+from urllib.request import pathname2url
+from src.database.query_stats import QueryStats
 from src.utils.logger import logger
 
 
-class DBManager:
+class _ReadQueries:
+    """
+    Consultas de lectura comunes a DBManager y a ReadOnlyDB. Cada clase
+    indica con _read_connection() qué conexión del hilo actual se usa.
+    """
+
+    # Formatos de fila de iter_query/query_page: dict (como query), tupla o
+    # namedtuple (sin crear un dict por fila)
+    ROW_DICT = 'dict'
+    ROW_TUPLE = 'tuple'
+    ROW_NAMEDTUPLE = 'namedtuple'
+
+    def _read_connection(self):
+        raise NotImplementedError
+
+    @contextmanager
+    def _timed(self, conn, sql, params=()):
+        """Mide la sentencia y la anota en self.stats (QueryStats)."""
+        stats = self.stats
+        if not stats.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.record(sql, time.perf_counter() - start, conn, params)
+
+    def query(self, sql, params=()) -> list:
+        """SELECT múltiple → list[dict]"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        try:
+            with self._timed(conn, sql, params):
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error en query: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def query_one(self, sql, params=()):
+        """SELECT una fila → dict | None"""
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        try:
+            with self._timed(conn, sql, params):
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error en query_one: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def iter_query(self, sql, params=(), batch_size=500, row_mode=ROW_DICT):
+        """
+        SELECT en streaming: generador que lee con fetchmany(batch_size) sin
+        cargar el resultado completo en memoria. row_mode elige el tipo de
+        fila (ROW_DICT, ROW_TUPLE o ROW_NAMEDTUPLE).
+        """
+        conn = self._read_connection()
+        cursor = conn.cursor()
+        if row_mode != self.ROW_DICT:
+            cursor.row_factory = None
+        try:
+            # Solo se mide la ejecución: el resto depende de quién consume
+            with self._timed(conn, sql, params):
+                cursor.execute(sql, params)
+            make_row = dict
+            if row_mode == self.ROW_TUPLE:
+                make_row = None
+            elif row_mode == self.ROW_NAMEDTUPLE:
+                Row = namedtuple('Row', [col[0] for col in cursor.description], rename=True)
+                make_row = Row._make
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if make_row is None:
+                    yield from rows
+                else:
+                    yield from map(make_row, rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error en iter_query: {e}")
+        finally:
+            cursor.close()
+
+    def query_page(self, sql, params=(), after_id=None, limit=100, descending=False,
+                   row_mode=ROW_DICT) -> list:
+        """
+        Paginación por clave (keyset) sobre la columna 'id' del resultado de
+        sql (una SELECT sin ORDER BY ni LIMIT): devuelve hasta 'limit' filas
+        con id posterior a after_id en el orden pedido. Para la página
+        siguiente se pasa el id de la última fila; a diferencia de OFFSET, el
+        coste no crece con el número de páginas ya leídas.
+        """
+        page_sql = f"SELECT * FROM ({sql})"
+        params = tuple(params)
+        if after_id is not None:
+            page_sql += f" WHERE id {'<' if descending else '>'} ?"
+            params += (after_id,)
+        page_sql += f" ORDER BY id {'DESC' if descending else 'ASC'} LIMIT ?"
+        params += (limit,)
+        return list(self.iter_query(page_sql, params, batch_size=limit, row_mode=row_mode))
+
+
+class DBManager(_ReadQueries):
+    """
+    Acceso a SQLite con una conexión por hilo. sqlite3 no permite compartir
+    una conexión entre hilos, así que cada hilo (UI, workers de importación,
+    informes...) abre la suya la primera vez que consulta; con WAL los
+    lectores no bloquean al hilo que escribe. reader() da además una
+    conexión de solo lectura para informes y paneles.
+    """
     _instance = None
 
+    # Sentencias preparadas que guarda cada conexión (sqlite3 usa 128)
+    STATEMENT_CACHE_SIZE = 512
+    # Espera máxima (s) si otro hilo tiene la base de datos bloqueada
+    BUSY_TIMEOUT = 10.0
+
+    _memory_ids = itertools.count(1)
+
     def __new__(cls, db_file='gestor3d.db'):
         if db_file != 'gestor3d.db':
             # Non-default path: new instance (for tests)
@@ -23,7 +154,15 @@ class DBManager:
         if getattr(self, '_initialized', False):
             return
         self._initialized = True
-        self._in_transaction = False
+        # Estado por hilo: conexión, conexión de solo lectura y transacción
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool = []
+        # Cambia en disconnect(): las conexiones de otros hilos quedan inválidas
+        self._generation = 0
+        self._reader = None
+        # Tiempos de todas las sentencias (panel de diagnóstico)
+        self.stats = QueryStats()
 
         if db_file == 'gestor3d.db':
             app_data_dir = self._get_user_data_dir()
@@ -37,7 +176,11 @@ class DBManager:
         else:
             self.db_file = db_file
 
-        self.connection = None
+        # ':memory:' sería una base de datos distinta por conexión; se usa una
+        # en memoria con caché compartida, común a todos los hilos
+        self._memory_uri = None
+        if self.db_file == ':memory:':
+            self._memory_uri = f"file:formexa-mem-{next(self._memory_ids)}?mode=memory&cache=shared"
         logger.info(f"Base de datos configurada en: {self.db_file}")
 
     @staticmethod
@@ -55,63 +198,147 @@ class DBManager:
             os.makedirs(app_data_dir, exist_ok=True)
         return app_data_dir
 
+    # --- Conexiones por hilo ---
+
+    def _thread_value(self, name, default=None):
+        generation, value = getattr(self._local, name, (None, default))
+        return value if generation == self._generation else default
+
+    def _set_thread_value(self, name, value):
+        setattr(self._local, name, (self._generation, value))
+
+    @property
+    def connection(self):
+        """Conexión de lectura/escritura del hilo actual (None si no hay)."""
+        return self._thread_value('connection')
+
+    @connection.setter
+    def connection(self, value):
+        self._set_thread_value('connection', value)
+
+    @property
+    def _in_transaction(self):
+        return self._thread_value('tx_depth', 0) > 0
+
+    def _open(self, readonly=False):
+        if self._memory_uri:
+            target, uri = self._memory_uri, True
+        elif readonly:
+            target, uri = f"file:{pathname2url(os.path.abspath(self.db_file))}?mode=ro", True
+        else:
+            target, uri = self.db_file, False
+        # check_same_thread=False solo para que disconnect() pueda cerrar las
+        # conexiones de otros hilos: cada una se usa únicamente en el suyo
+        conn = sqlite3.connect(target, uri=uri, timeout=self.BUSY_TIMEOUT,
+                               cached_statements=self.STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+            if self._memory_uri:
+                # Con caché compartida no hay WAL: sin esto, una transacción
+                # abierta en otra conexión bloquearía las lecturas
+                conn.execute("PRAGMA read_uncommitted = ON")
+        else:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        with self._pool_lock:
+            self._pool.append(conn)
+        return conn
+
+    def _close(self, conn):
+        with self._pool_lock:
+            if conn in self._pool:
+                self._pool.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error cerrando conexión SQLite: {e}")
+
     def connect(self):
+        """(Re)abre la conexión de lectura/escritura del hilo actual."""
         try:
-            self.connection = sqlite3.connect(self.db_file)
-            self.connection.row_factory = sqlite3.Row
-            self.connection.execute("PRAGMA foreign_keys = ON")
-            self.connection.execute("PRAGMA journal_mode = WAL")
-            self.connection.execute("PRAGMA synchronous = NORMAL")
-            return True
+            conn = self._open()
         except sqlite3.Error as e:
             logger.error(f"Error al conectar a SQLite: {e}")
             return False
+        # La nueva se abre antes de cerrar la anterior: con ':memory:' cerrar
+        # la última conexión borraría la base de datos
+        previous = self.connection
+        self.connection = conn
+        self._set_thread_value('tx_depth', 0)
+        if previous is not None:
+            self._close(previous)
+        return True
 
     def disconnect(self):
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Cierra las conexiones de todos los hilos."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+            self._generation += 1
+        for conn in pool:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error cerrando conexión SQLite: {e}")
+
+    def release_thread_connections(self):
+        """
+        Cierra las conexiones del hilo actual. Lo llaman los workers al
+        terminar para no dejar conexiones abiertas de hilos ya finalizados.
+        """
+        for name in ('connection', 'reader'):
+            conn = self._thread_value(name)
+            if conn is not None:
+                self._set_thread_value(name, None)
+                self._close(conn)
+
+    def pool_size(self):
+        """Número de conexiones abiertas (todas las de todos los hilos)."""
+        with self._pool_lock:
+            return len(self._pool)
 
     def _ensure_connected(self):
         if not self.connection:
             if not self.connect():
                 raise Exception("No se pudo conectar a la base de datos")
 
-    def query(self, sql, params=()) -> list:
-        """SELECT múltiple → list[dict]"""
+    def _read_connection(self):
         self._ensure_connected()
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
-        except sqlite3.Error as e:
-            logger.error(f"Error en query: {e}")
-            return []
-        finally:
-            cursor.close()
+        return self.connection
 
-    def query_one(self, sql, params=()):
-        """SELECT una fila → dict | None"""
-        self._ensure_connected()
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(sql, params)
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            logger.error(f"Error en query_one: {e}")
-            return None
-        finally:
-            cursor.close()
+    def reader(self):
+        """
+        Acceso de solo lectura (query, query_one, iter_query, query_page) con
+        su propia conexión por hilo, para informes y paneles que leen desde
+        un worker mientras la UI escribe.
+        """
+        if self._reader is None:
+            self._reader = ReadOnlyDB(self)
+        return self._reader
+
+    def _reader_connection(self):
+        conn = self._thread_value('reader')
+        if conn is None:
+            try:
+                conn = self._open(readonly=True)
+            except sqlite3.Error as e:
+                logger.error(f"Error al abrir la conexión de solo lectura: {e}")
+                raise Exception("No se pudo conectar a la base de datos") from e
+            self._set_thread_value('reader', conn)
+        return conn
 
     def execute(self, sql, params=()) -> int:
         """INSERT/UPDATE/DELETE → lastrowid or rowcount"""
         self._ensure_connected()
-        cursor = self.connection.cursor()
+        conn = self.connection
+        cursor = conn.cursor()
         try:
-            cursor.execute(sql, params)
+            with self._timed(conn, sql, params):
+                cursor.execute(sql, params)
             if not self._in_transaction:
-                self.connection.commit()
+                self._commit(conn)
             return cursor.lastrowid or cursor.rowcount
         except sqlite3.Error as e:
             raise e
@@ -120,28 +347,77 @@ class DBManager:
 
     def executemany(self, sql, seq_of_params):
         self._ensure_connected()
-        cursor = self.connection.cursor()
+        conn = self.connection
+        cursor = conn.cursor()
+        # Los parámetros de la primera fila sirven para el EXPLAIN si es lenta
+        first = seq_of_params[0] if isinstance(seq_of_params, (list, tuple)) and seq_of_params else ()
         try:
-            cursor.executemany(sql, seq_of_params)
+            with self._timed(conn, sql, first):
+                cursor.executemany(sql, seq_of_params)
             if not self._in_transaction:
-                self.connection.commit()
+                self._commit(conn)
         except sqlite3.Error as e:
             raise e
         finally:
             cursor.close()
 
+    def _commit(self, conn):
+        # El COMMIT (fsync) se mide aparte: en las estadísticas aparece como 'COMMIT'
+        with self._timed(conn, "COMMIT"):
+            conn.commit()
+
     @contextmanager
     def transaction(self):
+        """
+        Transacción del hilo actual. Se puede anidar: la más externa hace
+        BEGIN IMMEDIATE/COMMIT y cada nivel interior es un SAVEPOINT, así que
+        un error dentro deshace solo ese nivel (la excepción sigue subiendo).
+        """
         self._ensure_connected()
-        self._in_transaction = True
+        conn = self.connection
+        depth = self._thread_value('tx_depth', 0)
+        savepoint = f"sp_{depth}"
+        if depth == 0:
+            if not conn.in_transaction:
+                # IMMEDIATE: se toma el bloqueo de escritura al empezar y no al
+                # primer INSERT, para no fallar si otro hilo escribe a la vez
+                conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        self._set_thread_value('tx_depth', depth + 1)
         try:
-            yield self.connection
-            self.connection.commit()
+            yield conn
+            if depth == 0:
+                self._commit(conn)
+            else:
+                conn.execute(f"RELEASE {savepoint}")
         except Exception:
-            self.connection.rollback()
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
             raise
         finally:
-            self._in_transaction = False
+            self._set_thread_value('tx_depth', depth)
+
+    @contextmanager
+    def unit_of_work(self, flush_size=None):
+        """
+        Agrupa escrituras en una sola transacción:
+
+            with db.unit_of_work() as uow:
+                uow.add("UPDATE ...", params)
+
+        Las sentencias se encolan y se ejecutan con executemany (las
+        consecutivas con el mismo SQL van juntas) al llenarse la cola o al
+        salir; solo se confirma una vez, al final. Si hay una excepción no se
+        guarda nada. Dentro de otra transacción, es un SAVEPOINT más.
+        """
+        uow = UnitOfWork(self, flush_size or UnitOfWork.FLUSH_SIZE)
+        with self.transaction():
+            yield uow
+            uow.flush()
 
     def init_db(self, schema_file):
         try:
@@ -161,3 +437,47 @@ class DBManager:
         except FileNotFoundError:
             logger.error(f"Archivo no encontrado: {schema_file}")
             return False
+
+
+class UnitOfWork:
+    """Cola de escrituras de DBManager.unit_of_work()."""
+
+    FLUSH_SIZE = 1000
+
+    def __init__(self, db_manager, flush_size=FLUSH_SIZE):
+        self.db = db_manager
+        self.flush_size = flush_size
+        self.statements = 0
+        self._pending = []
+
+    def add(self, sql, params=()):
+        self._pending.append((sql, tuple(params)))
+        if len(self._pending) >= self.flush_size:
+            self.flush()
+
+    def add_many(self, sql, seq_of_params):
+        for params in seq_of_params:
+            self.add(sql, params)
+
+    def flush(self):
+        """Ejecuta lo pendiente dentro de la transacción (sin confirmar)."""
+        pending, self._pending = self._pending, []
+        for sql, group in itertools.groupby(pending, key=itemgetter(0)):
+            self.db.executemany(sql, [params for _, params in group])
+        self.statements += len(pending)
+
+
+class ReadOnlyDB(_ReadQueries):
+    """
+    Vista de solo lectura de un DBManager (ver DBManager.reader()). Usa una
+    conexión aparte por hilo con query_only, así que un INSERT/UPDATE
+    ejecutado por error falla en vez de escribir.
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self.db_file = db_manager.db_file
+        self.stats = db_manager.stats
+
+    def _read_connection(self):
+        return self.db._reader_connection()
@@ -1,5 +1,53 @@
 from src.utils.logger import logger
 
+
+def _add_column(table, column, definition):
+    """
+    ALTER TABLE ADD COLUMN idempotente: las BD nuevas ya traen la columna
+    desde schema.sql y SQLite no admite ADD COLUMN IF NOT EXISTS.
+    """
+    def apply(db_manager):
+        columns = {row['name'] for row in db_manager.query(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            db_manager.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return apply
+
+
+# Índices FTS5: sin acentos ni mayúsculas y con índice de prefijos de 2 y 3
+# caracteres para las búsquedas mientras se escribe
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+def _fts_index(table, columns):
+    """
+    Tabla FTS5 de contenido externo sobre 'table' y los triggers que la
+    mantienen sincronizada. Solo se reindexa al cambiar las columnas de texto.
+    """
+    cols = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+    fts = f"{table}_fts"
+    delete_old = (f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content = '{table}', content_rowid = 'id', {FTS_OPTIONS}
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            {insert_new}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            {delete_old}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            {delete_old}
+            {insert_new}
+        END""",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
 MIGRATIONS = {
     1: [
         """CREATE TABLE IF NOT EXISTS user_tokens (
@@ -48,6 +96,122 @@ MIGRATIONS = {
         "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)",
         "CREATE INDEX IF NOT EXISTS idx_customers_user ON customers(user_id)",
     ],
+    3: [
+        """CREATE TABLE IF NOT EXISTS gcode_cache (
+            file_path TEXT NOT NULL,
+            options TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            fingerprint TEXT NOT NULL,
+            data TEXT,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (file_path, options)
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_gcode_cache_last_used ON gcode_cache(last_used)",
+    ],
+    4: [
+        # Resultados del análisis de malla (MeshAnalyzer)
+        _add_column("models", "volume_cm3", "REAL"),
+        _add_column("models", "surface_area_cm2", "REAL"),
+        _add_column("models", "bbox_x_mm", "REAL"),
+        _add_column("models", "bbox_y_mm", "REAL"),
+        _add_column("models", "bbox_z_mm", "REAL"),
+        _add_column("models", "is_watertight", "INTEGER"),
+        _add_column("models", "analyzed_at", "TIMESTAMP"),
+    ],
+    5: [
+        # Almacén de modelos direccionado por contenido (BlobStore)
+        """CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        _add_column("models", "blob_hash", "TEXT"),
+        "CREATE INDEX IF NOT EXISTS idx_models_blob ON models(blob_hash)",
+    ],
+    6: [
+        # Diario de importaciones masivas (LibraryImporter): permite reanudar
+        """CREATE TABLE IF NOT EXISTS library_import_journal (
+            source TEXT NOT NULL,
+            entry TEXT NOT NULL,
+            blob_hash TEXT NOT NULL,
+            imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, entry)
+        )""",
+    ],
+    7: [
+        # Búsqueda de texto completo (SearchManager)
+        *_fts_index("models", ("name", "description")),
+        *_fts_index("projects", ("name", "description")),
+        *_fts_index("customers", ("name", "email", "phone", "address", "notes")),
+        # Los pedidos se buscan por el nombre del cliente y del proyecto:
+        # tabla FTS propia (rowid = id del pedido) con los nombres copiados
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5(
+            customer, project, status, {FTS_OPTIONS}
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS orders_fts_ai AFTER INSERT ON orders BEGIN
+            INSERT INTO orders_fts(rowid, customer, project, status)
+            SELECT new.id, (SELECT name FROM customers WHERE id = new.customer_id),
+                   (SELECT name FROM projects WHERE id = new.project_id), new.status;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_fts_ad AFTER DELETE ON orders BEGIN
+            DELETE FROM orders_fts WHERE rowid = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_fts_au
+           AFTER UPDATE OF customer_id, project_id, status ON orders BEGIN
+            DELETE FROM orders_fts WHERE rowid = old.id;
+            INSERT INTO orders_fts(rowid, customer, project, status)
+            SELECT new.id, (SELECT name FROM customers WHERE id = new.customer_id),
+                   (SELECT name FROM projects WHERE id = new.project_id), new.status;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_fts_customer_au AFTER UPDATE OF name ON customers BEGIN
+            UPDATE orders_fts SET customer = new.name
+            WHERE rowid IN (SELECT id FROM orders WHERE customer_id = new.id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS orders_fts_project_au AFTER UPDATE OF name ON projects BEGIN
+            UPDATE orders_fts SET project = new.name
+            WHERE rowid IN (SELECT id FROM orders WHERE project_id = new.id);
+        END""",
+        "DELETE FROM orders_fts",
+        """INSERT INTO orders_fts(rowid, customer, project, status)
+           SELECT o.id, c.name, p.name, o.status FROM orders o
+           LEFT JOIN customers c ON c.id = o.customer_id
+           LEFT JOIN projects p ON p.id = o.project_id""",
+    ],
+    8: [
+        # Orden por defecto de las tablas paginadas (pedidos y clientes)
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_created ON orders(user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_customers_user_name ON customers(user_id, name COLLATE NOCASE)",
+    ],
+    9: [
+        # Paginación por id de los pedidos de un usuario (get_all_orders_paged)
+        "CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)",
+    ],
+    10: [
+        # Agregados del inventario (InventoryManager.grams_by_material/
+        # grams_by_color/low_stock_filaments): índices de expresión que
+        # cubren la consulta, sin leer la tabla ni ordenar aparte
+        """CREATE INDEX IF NOT EXISTS idx_filaments_user_material
+           ON filaments(user_id, UPPER(TRIM(material_type)), weight_current)""",
+        """CREATE INDEX IF NOT EXISTS idx_filaments_user_color
+           ON filaments(user_id, LOWER(TRIM(color)), weight_current)""",
+        """CREATE INDEX IF NOT EXISTS idx_filaments_user_stock
+           ON filaments(user_id, (weight_current * 100.0 / weight_initial))
+           WHERE weight_initial > 0""",
+    ],
+    11: [
+        # mtime del blob al guardarlo: BlobStore.put comprueba tamaño y mtime
+        # antes de reutilizarlo (un enlace duro cambia si se edita el original)
+        _add_column("blobs", "mtime", "REAL"),
+    ],
+    12: [
+        # Tamaño y mtime de cada entrada importada: LibraryImporter vuelve a
+        # importar las que cambiaron desde entonces
+        _add_column("library_import_journal", "size", "INTEGER"),
+        _add_column("library_import_journal", "mtime", "REAL"),
+    ],
 }
 
 
@@ -58,11 +222,20 @@ def run_migrations(db_manager):
     current = db_manager.query_one("SELECT MAX(version) as v FROM schema_version")
     current_version = current['v'] if current and current['v'] is not None else 0
 
-    for version, statements in sorted(MIGRATIONS.items()):
-        if version > current_version:
+    pending = [(v, s) for v, s in sorted(MIGRATIONS.items()) if v > current_version]
+    if not pending:
+        return
+    # Todas las versiones pendientes en una sola transacción (un único
+    # COMMIT); cada versión es un SAVEPOINT dentro de ella. Si una falla no
+    # se aplica ninguna y la BD queda en la versión anterior.
+    with db_manager.transaction():
+        for version, statements in pending:
             with db_manager.transaction():
                 for stmt in statements:
-                    db_manager.execute(stmt)
+                    if callable(stmt):
+                        stmt(db_manager)
+                    else:
+                        db_manager.execute(stmt)
                 db_manager.execute(
                     "INSERT INTO schema_version (version) VALUES (?)", (version,)
                 )
@@ -0,0 +1,155 @@
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from src.utils.logger import logger, slow_query_logger
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+# Sentencias que admiten EXPLAIN QUERY PLAN
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """
+    Forma canónica de una sentencia para agrupar estadísticas: espacios
+    colapsados, literales como '?' y listas IN (?, ?, ...) como IN (?...).
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(?...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class _Entry:
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class QueryStats:
+    """
+    Tiempos de las sentencias de un DBManager agrupados por SQL normalizado:
+    número de ejecuciones, total, máximo y percentiles p50/p95/p99 (sobre las
+    últimas WINDOW ejecuciones de cada sentencia).
+
+    Las que superan slow_ms se escriben en logs/slow_queries.log con su
+    EXPLAIN QUERY PLAN y se guardan las últimas en memoria para el panel de
+    diagnóstico de Configuración.
+    """
+
+    WINDOW = 1024
+    SLOW_MS = 50.0
+    SLOW_HISTORY = 50
+
+    def __init__(self, slow_ms=SLOW_MS):
+        self.enabled = True
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._slow = deque(maxlen=self.SLOW_HISTORY)
+        self._started = time.time()
+
+    def record(self, sql, seconds, connection=None, params=()):
+        """Anota una ejecución; si es lenta, la registra con su plan."""
+        key = normalize_sql(sql)
+        ms = seconds * 1000.0
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.WINDOW)
+            entry.count += 1
+            entry.total += ms
+            entry.samples.append(ms)
+            if ms > entry.max:
+                entry.max = ms
+        if ms >= self.slow_ms:
+            self._log_slow(sql, key, ms, connection, params)
+
+    def _log_slow(self, sql, key, ms, connection, params):
+        plan = self.explain(connection, sql, params) if connection is not None else []
+        record = {'sql': key, 'ms': round(ms, 2), 'plan': plan, 'at': time.time()}
+        with self._lock:
+            self._slow.append(record)
+        slow_query_logger.warning(
+            f"{ms:.1f} ms: {key}" + ''.join(f"\n    {line}" for line in plan)
+        )
+
+    @staticmethod
+    def explain(connection, sql, params=()):
+        """Líneas de EXPLAIN QUERY PLAN ([] si la sentencia no lo admite)."""
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return []
+        try:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except Exception as e:
+            logger.debug(f"EXPLAIN QUERY PLAN falló: {e}")
+            return []
+        # Columnas: id, parent, notused, detail. Se sangra según el nivel
+        depth = {0: -1}
+        lines = []
+        for row in rows:
+            level = depth.get(row[1], -1) + 1
+            depth[row[0]] = level
+            lines.append('  ' * level + str(row[3]))
+        return lines
+
+    def snapshot(self, limit=None):
+        """
+        Estadísticas por sentencia, de mayor a menor tiempo total:
+        [{'sql', 'count', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}]
+        """
+        with self._lock:
+            items = [(key, e.count, e.total, e.max, sorted(e.samples))
+                     for key, e in self._entries.items()]
+        result = []
+        for key, count, total, max_ms, samples in items:
+            result.append({
+                'sql': key,
+                'count': count,
+                'total_ms': round(total, 3),
+                'mean_ms': round(total / count, 3),
+                'p50_ms': round(_percentile(samples, 0.50), 3),
+                'p95_ms': round(_percentile(samples, 0.95), 3),
+                'p99_ms': round(_percentile(samples, 0.99), 3),
+                'max_ms': round(max_ms, 3),
+            })
+        result.sort(key=lambda row: row['total_ms'], reverse=True)
+        return result[:limit] if limit else result
+
+    def summary(self):
+        """Totales: {'statements', 'executions', 'total_ms', 'slow', 'since'}."""
+        with self._lock:
+            return {
+                'statements': len(self._entries),
+                'executions': sum(e.count for e in self._entries.values()),
+                'total_ms': round(sum(e.total for e in self._entries.values()), 3),
+                'slow': len(self._slow),
+                'since': self._started,
+            }
+
+    def slow_queries(self):
+        """Últimas sentencias lentas, de la más reciente a la más antigua."""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._slow.clear()
+            self._started = time.time()
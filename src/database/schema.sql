@@ -36,9 +36,38 @@ CREATE TABLE IF NOT EXISTS models (
     thumbnail_path TEXT,
     added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     user_id INTEGER,
+    volume_cm3 REAL,
+    surface_area_cm2 REAL,
+    bbox_x_mm REAL,
+    bbox_y_mm REAL,
+    bbox_z_mm REAL,
+    is_watertight INTEGER,
+    analyzed_at TIMESTAMP,
+    blob_hash TEXT,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Tabla de Blobs (archivos de modelos direccionados por contenido)
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL,
+    refcount INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Diario de importaciones masivas de modelos (para reanudar)
+CREATE TABLE IF NOT EXISTS library_import_journal (
+    source TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    blob_hash TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, entry)
+);
+
 -- Tabla de tokens de sesión persistente
 CREATE TABLE IF NOT EXISTS user_tokens (
     token TEXT PRIMARY KEY,
@@ -100,8 +129,26 @@ CREATE TABLE IF NOT EXISTS orders (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Caché de metadatos de G-code (clave: ruta + opciones de análisis)
+CREATE TABLE IF NOT EXISTS gcode_cache (
+    file_path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_mtime REAL NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (file_path, options)
+);
+
+-- Los índices de búsqueda FTS5 (models_fts, projects_fts, customers_fts,
+-- orders_fts) y sus triggers se crean en la migración 7 (migrations.py)
+
 -- Índices
 CREATE INDEX IF NOT EXISTS idx_filaments_user ON filaments(user_id);
+CREATE INDEX IF NOT EXISTS idx_filaments_user_material ON filaments(user_id, UPPER(TRIM(material_type)), weight_current);
+CREATE INDEX IF NOT EXISTS idx_filaments_user_color ON filaments(user_id, LOWER(TRIM(color)), weight_current);
+CREATE INDEX IF NOT EXISTS idx_filaments_user_stock ON filaments(user_id, (weight_current * 100.0 / weight_initial)) WHERE weight_initial > 0;
 CREATE INDEX IF NOT EXISTS idx_models_user ON models(user_id);
 CREATE INDEX IF NOT EXISTS idx_projects_user ON projects(user_id);
 CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status);
@@ -110,3 +157,7 @@ CREATE INDEX IF NOT EXISTS idx_user_tokens_user ON user_tokens(user_id);
 CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_id);
 CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
 CREATE INDEX IF NOT EXISTS idx_customers_user ON customers(user_id);
+CREATE INDEX IF NOT EXISTS idx_orders_user_created ON orders(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id);
+CREATE INDEX IF NOT EXISTS idx_customers_user_name ON customers(user_id, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_gcode_cache_last_used ON gcode_cache(last_used);
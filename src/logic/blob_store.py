@@ -0,0 +1,163 @@
+import hashlib
+import os
+import shutil
+import threading
+
+from src.database.db_manager import DBManager
+from src.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl FICLONE de Linux (reflink en btrfs/XFS)
+_FICLONE = 0x40049409
+
+
+def hash_file(file_path, chunk_size=1024 * 1024, progress=None):
+    """Hash BLAKE2b (256 bits) del contenido, leído por bloques."""
+    digest = hashlib.blake2b(digest_size=32)
+    total = os.path.getsize(file_path)
+    done = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            done += len(chunk)
+            if progress:
+                progress('hash', done, total)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    Almacén de archivos direccionado por contenido: cada archivo se guarda una
+    sola vez en root/ab/cd/<hash><ext> y la tabla 'blobs' lleva la cuenta de
+    cuántos registros lo usan. Importar un duplicado solo suma una referencia.
+
+    Los blobs se crean con un nombre temporal y se renombran al terminar, y
+    la tabla guarda su tamaño y mtime: put no reutiliza un blob que ya no
+    coincide con lo guardado, lo vuelve a crear desde el archivo nuevo.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    # Un enlace duro comparte el inodo con el archivo del usuario: si lo edita
+    # después, el blob (y todos los modelos que lo usan) cambia con él. Por
+    # eso es opcional (store.USE_HARDLINKS = True) y por defecto se usa
+    # reflink o copia.
+    USE_HARDLINKS = False
+
+    def __init__(self, root, db_manager=None):
+        self.root = root
+        self.db = db_manager or DBManager()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, digest, ext=""):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest + ext.lower())
+
+    def get(self, digest):
+        return self.db.query_one("SELECT * FROM blobs WHERE hash = ?", (digest,))
+
+    def put(self, file_path, progress=None, digest=None):
+        """
+        Añade el archivo al almacén (o una referencia si ya estaba) y devuelve
+        (hash, ruta del blob, nuevo). progress(fase, hechos, total) recibe el
+        avance del hash ('hash') y de la copia ('copy') en bytes.
+        """
+        if digest is None:
+            digest = hash_file(file_path, self.CHUNK_SIZE, progress)
+        row = self.get(digest)
+        if row and self._is_intact(row):
+            self.db.execute("UPDATE blobs SET refcount = refcount + 1 WHERE hash = ?", (digest,))
+            return digest, row['path'], False
+        if row and os.path.exists(row['path']):
+            logger.warning(f"El blob {row['path']} cambió desde que se guardó; se vuelve a crear")
+
+        # Un blob dañado se rehace en su ruta: los modelos que lo usan apuntan a ella
+        dest = row['path'] if row else self.path_for(digest, os.path.splitext(file_path)[1])
+        if row or not os.path.exists(dest):
+            self.materialize(file_path, dest, progress)
+        stat = os.stat(dest)
+        self.db.execute(
+            """INSERT INTO blobs (hash, path, size, mtime, refcount) VALUES (?, ?, ?, ?, 1)
+               ON CONFLICT(hash) DO UPDATE SET path = excluded.path, size = excluded.size,
+                   mtime = excluded.mtime, refcount = refcount + 1""",
+            (digest, dest, stat.st_size, stat.st_mtime)
+        )
+        return digest, dest, True
+
+    @staticmethod
+    def _is_intact(row):
+        """El blob existe y conserva el tamaño y el mtime con que se guardó."""
+        try:
+            stat = os.stat(row['path'])
+        except OSError:
+            return False
+        if stat.st_size != row['size']:
+            return False
+        # Blobs anteriores a la columna mtime: solo se compara el tamaño
+        return row['mtime'] is None or stat.st_mtime == row['mtime']
+
+    def release(self, digest):
+        """Quita una referencia; al llegar a cero borra el blob. Devuelve True si se borró."""
+        row = self.get(digest)
+        if not row:
+            return False
+        if row['refcount'] > 1:
+            self.db.execute("UPDATE blobs SET refcount = refcount - 1 WHERE hash = ?", (digest,))
+            return False
+        self.db.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+        try:
+            os.remove(row['path'])
+        except OSError as e:
+            logger.warning(f"No se pudo borrar el blob {row['path']}: {e}")
+        return True
+
+    def materialize(self, src, dest, progress=None):
+        """
+        Crea dest con el contenido de src: reflink si el sistema de archivos lo
+        permite, si no enlace duro (solo con USE_HARDLINKS) y si no copia por
+        bloques.
+        """
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not self._reflink(src, tmp) and not self._hardlink(src, tmp):
+                self._chunked_copy(src, tmp, progress)
+            os.replace(tmp, dest)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @staticmethod
+    def _reflink(src, dest):
+        if fcntl is None:
+            return False
+        try:
+            with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            if os.path.exists(dest):
+                os.remove(dest)
+            return False
+
+    def _hardlink(self, src, dest):
+        if not self.USE_HARDLINKS:
+            return False
+        try:
+            os.link(src, dest)
+            return True
+        except OSError:  # otro volumen, FAT32, permisos...
+            return False
+
+    def _chunked_copy(self, src, dest, progress=None):
+        total = os.path.getsize(src)
+        done = 0
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(self.CHUNK_SIZE), b''):
+                fdst.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress('copy', done, total)
+        shutil.copystat(src, dest)
@@ -0,0 +1,49 @@
+import threading
+
+from src.utils.logger import logger
+
+# Temas de cambio que publican los managers tras escribir
+INVENTORY = 'inventory'
+PROJECTS = 'projects'
+MODELS = 'models'
+ORDERS = 'orders'
+
+
+class ChangeBus:
+    """
+    Bus de eventos de cambio de datos (publicar/suscribir, sin Qt). Los
+    managers publican publish(tema, user_id) después de cada escritura y los
+    suscriptores (p. ej. DashboardService) invalidan lo que dependa de ese
+    tema. user_id=None significa "puede afectar a cualquier usuario".
+
+    Los callbacks se llaman en el hilo que publica: un suscriptor que toque
+    la interfaz debe reenviar el aviso al hilo de Qt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """callback(tema, user_id)."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, topic, user_id=None):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(topic, user_id)
+            except Exception as e:
+                logger.error(f"Error en suscriptor de cambios ({topic}): {e}")
+
+
+# Instancia global que usan los managers
+change_bus = ChangeBus()
@@ -1,9 +1,14 @@
 import sqlite3
 from src.database.db_manager import DBManager
+from src.logic.search_manager import SearchManager
 
 
 class CustomerManager:
 
+    # Columnas por las que se puede ordenar la tabla paginada
+    SORT_COLUMNS = {'id': 'id', 'name': 'name', 'email': 'email', 'phone': 'phone',
+                    'address': 'address', 'created_at': 'created_at'}
+
     def __init__(self):
         self.db = DBManager()
 
@@ -26,6 +31,37 @@ class CustomerManager:
             (user_id,)
         )
 
+    def get_all_customers_paged(self, user_id, after_id=None, limit=100) -> list:
+        """Clientes por orden de alta, por páginas (keyset por id)."""
+        return self.db.query_page(
+            "SELECT * FROM customers WHERE user_id = ?", (user_id,), after_id, limit
+        )
+
+    def _page_filter(self, user_id, search):
+        where, params = "user_id = ?", [user_id]
+        match = SearchManager.build_match_query(search)
+        if match:
+            where += " AND id IN (SELECT rowid FROM customers_fts WHERE customers_fts MATCH ?)"
+            params.append(match)
+        return where, params
+
+    def count_customers(self, user_id, search=None) -> int:
+        where, params = self._page_filter(user_id, search)
+        return self.db.query_one(f"SELECT COUNT(*) as n FROM customers WHERE {where}", tuple(params))['n']
+
+    def get_customers_page(self, user_id, offset=0, limit=200, sort='name',
+                           descending=False, search=None) -> list:
+        """Una página de clientes ordenada en SQL; search usa el índice FTS."""
+        where, params = self._page_filter(user_id, search)
+        direction = "DESC" if descending else "ASC"
+        order_by = self.SORT_COLUMNS.get(sort, 'name')
+        return self.db.query(
+            f"""SELECT * FROM customers WHERE {where}
+               ORDER BY {order_by} COLLATE NOCASE {direction}, id {direction}
+               LIMIT ? OFFSET ?""",
+            (*params, limit, offset)
+        )
+
     def get_customer_by_id(self, customer_id):
         return self.db.query_one(
             "SELECT * FROM customers WHERE id = ?", (customer_id,)
@@ -0,0 +1,190 @@
+import threading
+from collections import namedtuple
+
+from src.database.db_manager import DBManager
+from src.logic.change_events import change_bus, INVENTORY, MODELS, ORDERS, PROJECTS
+from src.logic.inventory_manager import InventoryManager
+from src.logic.library_manager import LibraryManager
+from src.logic.order_manager import OrderManager
+from src.logic.project_manager import ProjectManager
+
+# Piezas del snapshot (tuplas inmutables)
+Slice = namedtuple('Slice', ['label', 'grams'])
+LowStock = namedtuple('LowStock', ['name', 'current', 'percentage'])
+ProjectCost = namedtuple('ProjectCost', ['name', 'filament_cost', 'energy_cost', 'total_cost'])
+RecentModel = namedtuple('RecentModel', ['id', 'name', 'thumbnail_path'])
+ProjectStats = namedtuple('ProjectStats', ['total_projects', 'completed', 'pending',
+                                           'in_progress', 'total_spent', 'total_hours'])
+RevenueStats = namedtuple('RevenueStats', ['total_orders', 'revenue', 'pending_revenue',
+                                           'delivered', 'cancelled'])
+
+DashboardSnapshot = namedtuple('DashboardSnapshot', [
+    'user_id',
+    'materials',       # (Slice, ...) gramos por material
+    'colors',          # (Slice, ...) gramos por color
+    'low_stock',       # (LowStock, ...) hasta LOW_STOCK_LIMIT
+    'project_costs',   # (ProjectCost, ...) los COST_PROJECTS más recientes con coste
+    'project_stats',   # ProjectStats | None
+    'recent_models',   # (RecentModel, ...) hasta RECENT_MODELS
+    'revenue',         # RevenueStats | None
+])
+
+
+class DashboardService:
+    """
+    Datos del panel de inicio calculados una vez por usuario y guardados.
+
+    Cada sección del snapshot depende de un tema del bus de cambios
+    (SECTION_TOPICS). Cuando un manager publica un cambio solo se invalidan
+    las secciones de ese tema; las demás se reutilizan sin consultar la BD.
+    Los snapshots son inmutables, así que se pueden comparar sección a
+    sección para redibujar solo lo que cambió.
+    """
+
+    SECTION_TOPICS = {
+        'materials': INVENTORY,
+        'colors': INVENTORY,
+        'low_stock': INVENTORY,
+        'project_costs': PROJECTS,
+        'project_stats': PROJECTS,
+        'recent_models': MODELS,
+        'revenue': ORDERS,
+    }
+
+    LOW_STOCK_PCT = 20
+    LOW_STOCK_LIMIT = 3
+    COST_PROJECTS = 8
+    RECENT_MODELS = 5
+
+    def __init__(self, db_manager=None, bus=change_bus):
+        self.db = db_manager or DBManager()
+        # El panel solo lee: los managers usan la conexión de solo lectura
+        reader = self.db.reader()
+        self.inventory = InventoryManager(reader)
+        self.library = LibraryManager(reader)
+        self.projects = ProjectManager(reader)
+        self.orders = OrderManager(reader)
+
+        self._lock = threading.Lock()
+        self._sections = {}    # user_id -> {sección: valor}
+        self._snapshots = {}   # user_id -> DashboardSnapshot
+        self._generation = 0   # cambia con cada invalidación
+        self.bus = bus
+        bus.subscribe(self.on_change)
+
+    def close(self):
+        self.bus.unsubscribe(self.on_change)
+
+    # --- Invalidación ---
+
+    def on_change(self, topic, user_id=None):
+        """Suscriptor del bus: invalida las secciones del tema (de un usuario o de todos)."""
+        names = [name for name, section_topic in self.SECTION_TOPICS.items() if section_topic == topic]
+        if not names:
+            return
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                users = list(self._sections)
+            else:
+                # Los snapshots de invitado/sin sesión leen datos de todos
+                users = [user_id] + [u for u in self._sections if not self._registered(u)]
+            for user in users:
+                sections = self._sections.get(user)
+                if sections is None:
+                    continue
+                for name in names:
+                    sections.pop(name, None)
+                self._snapshots.pop(user, None)
+
+    def invalidate(self, user_id=None):
+        """Descarta todo lo calculado (de un usuario o de todos)."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._sections.clear()
+                self._snapshots.clear()
+            else:
+                self._sections.pop(user_id, None)
+                self._snapshots.pop(user_id, None)
+
+    # --- Snapshot ---
+
+    def snapshot(self, user_id):
+        """DashboardSnapshot del usuario; solo consulta las secciones invalidadas."""
+        with self._lock:
+            cached = self._snapshots.get(user_id)
+            if cached is not None:
+                return cached
+            sections = dict(self._sections.get(user_id, {}))
+            generation = self._generation
+
+        computed = {name: getattr(self, f"_load_{name}")(user_id)
+                    for name in self.SECTION_TOPICS if name not in sections}
+        sections.update(computed)
+        snapshot = DashboardSnapshot(user_id=user_id, **sections)
+
+        with self._lock:
+            # Si llegó un cambio mientras se consultaba, lo calculado puede
+            # estar desfasado: se devuelve pero no se guarda
+            if generation == self._generation:
+                self._sections.setdefault(user_id, {}).update(computed)
+                self._snapshots[user_id] = snapshot
+        return snapshot
+
+    @staticmethod
+    def _registered(user_id):
+        # Invitado (-1) o sin sesión: sin proyectos ni pedidos propios
+        return bool(user_id) and user_id != -1
+
+    def _load_materials(self, user_id):
+        return tuple(Slice(row['material'], row['grams'] or 0.0)
+                     for row in self.inventory.grams_by_material(user_id))
+
+    def _load_colors(self, user_id):
+        return tuple(Slice(row['color'], row['grams'] or 0.0)
+                     for row in self.inventory.grams_by_color(user_id))
+
+    def _load_low_stock(self, user_id):
+        return tuple(
+            LowStock(f"{f['brand']} {f['material_type']} {f['color']}",
+                     f['weight_current'], f['percentage'])
+            for f in self.inventory.low_stock_filaments(
+                user_id, threshold_pct=self.LOW_STOCK_PCT, limit=self.LOW_STOCK_LIMIT)
+        )
+
+    def _load_project_costs(self, user_id):
+        if not self._registered(user_id):
+            return ()
+        rows = self.projects.get_recent_project_costs(user_id, self.COST_PROJECTS)
+        return tuple(ProjectCost(r['name'], r['filament_cost'] or 0, r['energy_cost'] or 0,
+                                 r['total_cost']) for r in rows)
+
+    def _load_project_stats(self, user_id):
+        if not self._registered(user_id):
+            return None
+        row = self.projects.get_project_stats(user_id)
+        return ProjectStats(**row) if row else None
+
+    def _load_recent_models(self, user_id):
+        rows = self.library.get_all_models_paged(
+            user_id if self._registered(user_id) else None, limit=self.RECENT_MODELS
+        )
+        return tuple(RecentModel(r['id'], r['name'], r.get('thumbnail_path')) for r in rows)
+
+    def _load_revenue(self, user_id):
+        if not self._registered(user_id):
+            return None
+        row = self.orders.get_revenue_stats(user_id)
+        return RevenueStats(**row) if row else None
+
+
+_default_service = None
+
+
+def get_dashboard_service():
+    """DashboardService compartido de la aplicación (sobre el DBManager por defecto)."""
+    global _default_service
+    if _default_service is None:
+        _default_service = DashboardService()
+    return _default_service
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import time
+
+from src.database.db_manager import DBManager
+from src.utils.logger import logger
+
+
+class GcodeCache:
+    """
+    Caché persistente (tabla gcode_cache) de los metadatos extraídos de G-code.
+
+    Cada entrada se identifica por ruta y opciones de análisis, y se valida
+    con tamaño, fecha de modificación y un hash de los primeros y últimos
+    64 KB del archivo. Las entradas menos usadas se eliminan al superar
+    MAX_ENTRIES (LRU).
+    """
+
+    MAX_ENTRIES = 500
+    FINGERPRINT_BYTES = 64 * 1024
+
+    def __init__(self, db_manager=None):
+        self.db = db_manager or DBManager()
+
+    @classmethod
+    def fingerprint(cls, file_path, file_size=None):
+        """Hash rápido de cabecera y pie del archivo (no lee el contenido intermedio)."""
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(file_size).encode())
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(cls.FINGERPRINT_BYTES))
+            if file_size > cls.FINGERPRINT_BYTES:
+                f.seek(max(cls.FINGERPRINT_BYTES, file_size - cls.FINGERPRINT_BYTES))
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def get(self, file_path, options=""):
+        """
+        Devuelve (encontrado, datos). 'datos' puede ser None si el archivo ya
+        se analizó sin resultado; 'encontrado' es False si hay que analizarlo.
+        """
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+            row = self.db.query_one(
+                """SELECT file_size, file_mtime, fingerprint, data FROM gcode_cache
+                   WHERE file_path = ? AND options = ?""",
+                (path, options)
+            )
+            if not row or row['file_size'] != stat.st_size or row['file_mtime'] != stat.st_mtime:
+                return False, None
+            if row['fingerprint'] != self.fingerprint(path, stat.st_size):
+                return False, None
+            self.db.execute(
+                "UPDATE gcode_cache SET last_used = ? WHERE file_path = ? AND options = ?",
+                (time.time(), path, options)
+            )
+            return True, json.loads(row['data']) if row['data'] else None
+        except Exception as e:
+            logger.warning(f"Error leyendo caché de G-code: {e}")
+            return False, None
+
+    def put(self, file_path, data, options=""):
+        """Guarda el resultado del análisis y aplica el límite de entradas."""
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+            self.db.execute(
+                """INSERT OR REPLACE INTO gcode_cache
+                   (file_path, options, file_size, file_mtime, fingerprint, data, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (path, options, stat.st_size, stat.st_mtime,
+                 self.fingerprint(path, stat.st_size),
+                 json.dumps(data) if data else None, time.time())
+            )
+            self.evict()
+        except Exception as e:
+            logger.warning(f"Error guardando caché de G-code: {e}")
+
+    def evict(self, max_entries=None):
+        """Elimina las entradas usadas hace más tiempo por encima del límite."""
+        limit = self.MAX_ENTRIES if max_entries is None else max_entries
+        self.db.execute(
+            """DELETE FROM gcode_cache WHERE rowid IN (
+                   SELECT rowid FROM gcode_cache
+                   ORDER BY last_used DESC LIMIT -1 OFFSET ?
+               )""",
+            (limit,)
+        )
+
+    def clear(self):
+        self.db.execute("DELETE FROM gcode_cache")
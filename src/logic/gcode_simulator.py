@@ -0,0 +1,520 @@
+import math
+import mmap
+import os
+
+import numpy as np
+
+from src.utils.logger import logger
+
+# Letras de parámetro que interesan al simulador (orden = columna en la tabla)
+_PARAM_LETTERS = 'XYZEFIJPSRT'
+_COL = {letter: i for i, letter in enumerate(_PARAM_LETTERS)}
+# Columna de cada letra (en mayúscula) o -1 si no interesa
+_COL_OF_BYTE = np.full(256, -1, dtype=np.int64)
+_COL_OF_BYTE[[ord(letter) for letter in _PARAM_LETTERS]] = np.arange(len(_PARAM_LETTERS))
+
+# Comandos reconocidos, codificados como letra * 1000 + número
+_G, _M, _T = ord('G') * 1000, ord('M') * 1000, ord('T') * 1000
+_MOVE_CODES = (_G + 0, _G + 1, _G + 2, _G + 3)
+_KNOWN_CODES = _MOVE_CODES + (
+    _G + 4, _G + 28, _G + 90, _G + 91, _G + 92,
+    _M + 82, _M + 83, _M + 201, _M + 203, _M + 204,
+)
+_KNOWN_SORTED = np.array(sorted(_KNOWN_CODES), dtype=np.int64)
+
+# Límites por defecto de Marlin si el archivo no define M201/M203/M204.
+# Columnas: vmax X,Y,Z,E (mm/s) | amax X,Y,Z,E (mm/s²) | acel. impresión, retracción, desplazamiento
+_DEFAULT_LIMITS = (500.0, 500.0, 12.0, 120.0,
+                   3000.0, 3000.0, 100.0, 10000.0,
+                   1500.0, 1500.0, 1500.0)
+# Qué parámetro de qué comando fija cada columna de límites
+_LIMIT_SOURCES = (
+    (_M + 203, 'X'), (_M + 203, 'Y'), (_M + 203, 'Z'), (_M + 203, 'E'),
+    (_M + 201, 'X'), (_M + 201, 'Y'), (_M + 201, 'Z'), (_M + 201, 'E'),
+    (_M + 204, 'P'), (_M + 204, 'R'), (_M + 204, 'T'),
+)
+_DEFAULT_FEEDRATE = 1500.0  # mm/min
+
+_NEWLINE, _SEMICOLON, _DOT, _MINUS, _PLUS = ord('\n'), ord(';'), ord('.'), ord('-'), ord('+')
+_OPEN_PAREN, _CLOSE_PAREN = ord('('), ord(')')
+
+# Clase de cada byte para el tokenizador: número (dígito . - +), letra u otro
+_OTHER, _NUMERIC, _LETTER = 0, 1, 2
+_CHAR_CLASS = np.zeros(256, dtype=np.uint8)
+_CHAR_CLASS[ord('0'):ord('9') + 1] = _NUMERIC
+_CHAR_CLASS[[_DOT, _MINUS, _PLUS]] = _NUMERIC
+_CHAR_CLASS[ord('A'):ord('Z') + 1] = _LETTER
+_CHAR_CLASS[ord('a'):ord('z') + 1] = _LETTER
+_UPPER = np.arange(256, dtype=np.uint8)
+_UPPER[ord('a'):ord('z') + 1] -= 32
+# Los números más largos se truncan (ningún slicer escribe más de ~12 cifras)
+_MAX_NUMBER_LEN = 18
+_POW10 = 10.0 ** np.arange(_MAX_NUMBER_LEN)
+
+
+class GcodeSimulator:
+    """
+    Intérprete de G-code que reconstruye la trayectoria para estimar tiempo de
+    impresión y filamento por extrusor (T0..Tn) cuando el archivo no trae
+    comentarios de metadatos del slicer.
+
+    Todo el trabajo es vectorizado con NumPy sobre bloques del archivo: los
+    bytes se tokenizan en palabras (letra + número), el estado modal
+    (G90/G91, M82/M83, G92, herramienta, avance, M201/M203/M204) se propaga
+    con acumulados y la cinemática usa un perfil trapezoidal por segmento.
+    """
+
+    # Velocidad mínima permitida en una esquina (equivalente al jerk de Marlin)
+    JUNCTION_JERK = 8.0
+    # Tamaño de bloque al recorrer el archivo; se corta siempre en fin de línea.
+    # Con 1 MB los arrays intermedios caben mejor en caché que con bloques mayores
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, filament_diameter=1.75, filament_density=1.24):
+        self.filament_diameter = filament_diameter
+        self.filament_density = filament_density
+
+    def simulate_file(self, file_path):
+        """
+        Simula un archivo G-code completo con memoria constante (mmap por bloques).
+
+        Returns:
+            dict: Mismas claves que SlicerParser.parse_file más
+                  'filament_lengths_m' y 'filament_weights_g' por extrusor.
+                  None si no hay movimientos o el archivo no se pudo leer.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._simulate_chunks(self._iter_chunks(mm))
+        except OSError as e:
+            logger.error(f"Error simulando G-code: {e}")
+            return None
+
+    def simulate_text(self, text):
+        """Simula G-code ya cargado en memoria (str o bytes). Ver simulate_file."""
+        if isinstance(text, str):
+            text = text.encode('utf-8', errors='ignore')
+        return self._simulate_chunks(self._iter_chunks(text))
+
+    def _iter_chunks(self, buffer):
+        """Divide el buffer en bloques de ~CHUNK_SIZE que terminan en '\\n'."""
+        size = len(buffer)
+        start = 0
+        while start < size:
+            end = min(size, start + self.CHUNK_SIZE)
+            if end < size:
+                newline = buffer.rfind(b'\n', start, end)
+                if newline == -1:
+                    newline = buffer.find(b'\n', end)
+                end = size if newline == -1 else newline + 1
+            yield np.frombuffer(buffer[start:end], dtype=np.uint8)
+            start = end
+
+    def _simulate_chunks(self, chunks):
+        state = {
+            'pos': np.zeros(4),                 # X, Y, Z, E
+            'relative_xyz': 0,
+            'relative_e': 0,
+            'tool': 0,
+            'feed': _DEFAULT_FEEDRATE,
+            'limits': np.array(_DEFAULT_LIMITS),
+        }
+        extruded = np.zeros(1)
+        time_s = 0.0
+        dwell_s = 0.0
+        move_count = 0
+        # El último movimiento de cada bloque se difiere al siguiente para que
+        # su velocidad de salida tenga en cuenta la unión con el próximo.
+        pending = None
+        pending_v_in = 0.0
+
+        for chunk in chunks:
+            moves, chunk_dwell = self._chunk_moves(chunk, state)
+            dwell_s += chunk_dwell
+            if moves is None:
+                continue
+            move_count += len(moves['dist'])
+
+            per_tool = np.bincount(moves['tool'], weights=moves['de'])
+            if len(per_tool) > len(extruded):
+                extruded = np.pad(extruded, (0, len(per_tool) - len(extruded)))
+            extruded[:len(per_tool)] += per_tool
+
+            if pending is not None:
+                moves = {k: np.concatenate((pending[k], moves[k])) for k in moves}
+            times, v_in = self._segment_times(moves, pending_v_in)
+            if times is None:
+                continue
+            time_s += float(times[:-1].sum())
+            pending = {k: v[-1:] for k, v in moves.items()}
+            pending_v_in = float(v_in[-1])
+
+        if not move_count:
+            return None
+        if pending is not None:
+            times, _ = self._segment_times(pending, pending_v_in)
+            if times is not None:
+                time_s += float(times.sum())
+
+        tool_count = max(len(extruded), state['tool'] + 1)
+        extruded = np.pad(extruded, (0, tool_count - len(extruded)))
+        lengths_m = [max(0.0, float(mm)) / 1000.0 for mm in extruded]
+        weights_g = [self._weight_from_length(length) for length in lengths_m]
+
+        total_s = time_s + dwell_s
+        if not math.isfinite(total_s):
+            logger.warning(f"Tiempo simulado no finito ({total_s}); se descarta")
+            total_s = 0.0
+
+        return {
+            'print_time_seconds': int(round(total_s)),
+            'filament_length_m': sum(lengths_m),
+            'filament_weight_g': sum(weights_g),
+            'filament_lengths_m': lengths_m,
+            'filament_weights_g': weights_g,
+            'slicer_name': 'Simulación G-code',
+        }
+
+    def _weight_from_length(self, length_m):
+        radius_cm = (self.filament_diameter / 10) / 2
+        return math.pi * (radius_cm ** 2) * (length_m * 100) * self.filament_density
+
+    @staticmethod
+    def _tokenize(buf):
+        """
+        Extrae las palabras G-code de un bloque de bytes.
+
+        Solo la detección de rachas numéricas recorre el bloque entero; el
+        resto trabaja sobre las posiciones de las rachas, saltos de línea y
+        comentarios. Los números se leen dígito a dígito en paralelo para
+        todas las palabras a la vez (esquema de Horner).
+
+        Returns:
+            tuple: (línea, letra en mayúscula, valor) como arrays paralelos,
+                   en orden de aparición. Se ignoran los comentarios (';' y
+                   '(...)') y las letras pegadas a otras letras (macros tipo
+                   Klipper).
+        """
+        empty = np.empty(0, np.int64), np.empty(0, np.uint8), np.empty(0)
+        # Comparaciones en vez de una tabla: indexar por byte es ~5 veces más lento
+        numeric = (buf - np.uint8(48) < 10) | (buf == _DOT) | (buf == _MINUS) | (buf == _PLUS)
+        edges = np.flatnonzero(numeric[1:] != numeric[:-1]) + 1
+        if numeric[0]:
+            edges = np.concatenate(([0], edges))
+        if len(edges) % 2:
+            edges = np.append(edges, len(buf))
+        starts = edges[0::2]
+        lengths = edges[1::2] - starts
+
+        # La racha debe ir tras una letra, y la letra a principio de línea,
+        # tras un separador o tras otro número (formato compacto "G1X10Y5")
+        letter_pos = starts - 1
+        valid = letter_pos >= 0
+        valid[valid] = _CHAR_CLASS[buf[letter_pos[valid]]] == _LETTER
+        before = letter_pos - 1
+        check = valid & (before >= 0)
+        valid[check] = _CHAR_CLASS[buf[before[check]]] != _LETTER
+        starts, lengths, letter_pos = starts[valid], lengths[valid], letter_pos[valid]
+        if not len(starts):
+            return empty
+
+        newlines = np.flatnonzero(buf == _NEWLINE)
+        code = GcodeSimulator._outside_comments(buf, letter_pos, newlines)
+        if not code.all():
+            starts, lengths, letter_pos = starts[code], lengths[code], letter_pos[code]
+            if not len(starts):
+                return empty
+
+        # Línea de cada palabra: se marca la primera palabra tras cada salto
+        # (hay menos saltos que palabras, así que se buscan ellos)
+        first_after = np.searchsorted(letter_pos, newlines)
+        line = np.cumsum(np.bincount(first_after, minlength=len(starts) + 1)[:len(starts)])
+
+        mantissa = np.zeros(len(starts), dtype=np.int64)
+        decimals = np.zeros(len(starts), dtype=np.int64)
+        after_dot = np.zeros(len(starts), dtype=bool)
+        for j in range(min(int(lengths.max()), _MAX_NUMBER_LEN)):
+            active = j < lengths
+            char = buf.take(starts + j, mode='clip')
+            digit = char - np.uint8(48)  # fuera de 0-9 desborda a >= 10
+            is_digit = active & (digit < 10)
+            mantissa = np.where(is_digit, mantissa * 10 + digit, mantissa)
+            decimals += is_digit & after_dot
+            after_dot |= active & (char == _DOT)
+        value = mantissa / _POW10[decimals]
+        negative = buf[starts] == _MINUS
+        value[negative] = -value[negative]
+
+        return line, _UPPER[buf[letter_pos]], value
+
+    @staticmethod
+    def _outside_comments(buf, positions, newlines):
+        """
+        Máscara de las posiciones (ordenadas) que no caen en un comentario:
+        de ';' a fin de línea o de '(' al primer ')' o fin de línea. Un ';'
+        dentro de un paréntesis no abre comentario.
+        """
+        semicolons = np.flatnonzero(buf == _SEMICOLON)
+        opens = np.flatnonzero(buf == _OPEN_PAREN)
+        if not len(semicolons) and not len(opens):
+            return np.ones(len(positions), dtype=bool)
+        line_end = np.append(newlines, len(buf))
+        starts, ends = semicolons, line_end[np.searchsorted(newlines, semicolons)]
+        if len(opens):
+            closes = np.append(np.flatnonzero(buf == _CLOSE_PAREN), len(buf))
+            paren_end = np.minimum(closes[np.searchsorted(closes, opens)],
+                                   line_end[np.searchsorted(newlines, opens)])
+            kept = ~GcodeSimulator._covered(opens, paren_end, semicolons)
+            starts = np.concatenate((semicolons[kept], opens))
+            ends = np.concatenate((ends[kept], paren_end))
+        return ~GcodeSimulator._covered(starts, ends, positions)
+
+    @staticmethod
+    def _covered(starts, ends, positions):
+        """Posiciones (ordenadas) dentro de algún intervalo [inicio, fin]."""
+        # Hay pocos comentarios y muchas palabras: se buscan los extremos de
+        # cada intervalo entre las posiciones y se marcan los tramos
+        first = np.searchsorted(positions, starts)
+        past = np.searchsorted(positions, ends, side='right')
+        depth = np.bincount(first, minlength=len(positions) + 1) - \
+            np.bincount(past, minlength=len(positions) + 1)
+        return np.cumsum(depth[:len(positions)]) > 0
+
+    @staticmethod
+    def _forward_fill(values, is_set, initial):
+        """Propaga el último valor fijado (is_set) hacia delante; 'initial' antes del primero."""
+        idx = np.where(is_set, np.arange(len(values)), -1)
+        np.maximum.accumulate(idx, out=idx)
+        return np.where(idx >= 0, values[np.maximum(idx, 0)], initial)
+
+    def _chunk_moves(self, buf, state):
+        """
+        Convierte un bloque en arrays de movimientos aplicando el estado modal
+        heredado del bloque anterior. Actualiza 'state' para el siguiente.
+
+        Returns:
+            tuple: (dict de arrays de movimientos o None, segundos de pausa G4)
+        """
+        w_line, w_letter, w_value = self._tokenize(buf)
+        if not len(w_line):
+            return None, 0.0
+        keep = w_letter != ord('N')  # números de línea
+        w_line, w_letter, w_value = w_line[keep], w_letter[keep], w_value[keep]
+        if not len(w_line):
+            return None, 0.0
+
+        # Primera palabra de cada línea = comando
+        first = np.empty(len(w_line), dtype=bool)
+        first[0] = True
+        first[1:] = w_line[1:] != w_line[:-1]
+        cmd_word = np.flatnonzero(first)
+        cmd_letter = w_letter[cmd_word].astype(np.int64)
+        cmd_value = w_value[cmd_word]
+        cmd_code = cmd_letter * 1000 + cmd_value.astype(np.int64)
+
+        # Comandos conocidos por búsqueda en la lista ordenada (más barato que np.isin)
+        known = np.searchsorted(_KNOWN_SORTED, cmd_code)
+        is_tool = cmd_letter == ord('T')
+        relevant = (_KNOWN_SORTED[np.minimum(known, len(_KNOWN_SORTED) - 1)] == cmd_code) | is_tool
+        if not relevant.any():
+            return None, 0.0
+        ev_word = cmd_word[relevant]
+        ev_code = cmd_code[relevant]
+        ev_tool = is_tool[relevant]
+        ev_tool_value = cmd_value[relevant]
+        n_ev = len(ev_word)
+
+        # Tabla de parámetros por evento (NaN = ausente). Cada palabra hereda
+        # el comando de su línea (la última primera palabra anterior)
+        event_of_cmd = np.full(len(cmd_word), -1, dtype=np.int64)
+        event_of_cmd[relevant] = np.arange(n_ev)
+        p_event = event_of_cmd[np.cumsum(first) - 1]
+        p_col = _COL_OF_BYTE[w_letter]
+        hit = ~first & (p_event >= 0) & (p_col >= 0)
+        params = np.full((n_ev, len(_PARAM_LETTERS)), np.nan)
+        params[p_event[hit], p_col[hit]] = w_value[hit]
+        present = ~np.isnan(params)
+
+        is_move = (ev_code >= _G) & (ev_code <= _G + 3)  # G0-G3
+        code_is = {c: ev_code == c for c in _KNOWN_CODES}
+
+        # Modos absoluto/relativo
+        xyz_set = code_is[_G + 90] | code_is[_G + 91]
+        relative_xyz = self._forward_fill(code_is[_G + 91].astype(np.int64), xyz_set, state['relative_xyz'])
+        e_set = xyz_set | code_is[_M + 82] | code_is[_M + 83]
+        e_value = (code_is[_G + 91] | code_is[_M + 83]).astype(np.int64)
+        relative_e = self._forward_fill(e_value, e_set, state['relative_e'])
+
+        # Herramienta y avance
+        tool = self._forward_fill(ev_tool_value.astype(np.int64), ev_tool, state['tool'])
+        # F0 (o negativo) no es un avance válido: se mantiene el anterior
+        feed_set = is_move & present[:, _COL['F']] & (params[:, _COL['F']] > 0)
+        feed = self._forward_fill(params[:, _COL['F']], feed_set, state['feed'])
+
+        # Límites de la máquina: una fila por cada M201/M203/M204 con las
+        # columnas que fija (el resto NaN) y relleno hacia delante por columna
+        limit_events = np.flatnonzero(code_is[_M + 201] | code_is[_M + 203] | code_is[_M + 204])
+        limit_params = params[limit_events]
+        limit_codes = ev_code[limit_events]
+        limit_values = np.full((len(limit_events), len(_LIMIT_SOURCES)), np.nan)
+        for i, (source, letter) in enumerate(_LIMIT_SOURCES):
+            value = limit_params[:, _COL[letter]]
+            limit_values[:, i] = np.where((limit_codes == source) & (value > 0), value, np.nan)
+        # M204 S fija impresión y desplazamiento si no vienen P/T explícitos
+        speed = limit_params[:, _COL['S']]
+        for i, letter in ((8, 'P'), (10, 'T')):
+            use_s = (limit_codes == _M + 204) & (speed > 0) & ~(limit_params[:, _COL[letter]] > 0)
+            limit_values[use_s, i] = speed[use_s]
+        limit_set = ~np.isnan(limit_values)
+        last_set = np.where(limit_set, np.arange(len(limit_events))[:, None], -1)
+        np.maximum.accumulate(last_set, axis=0, out=last_set)
+        limit_rows = np.where(last_set >= 0,
+                              np.take_along_axis(limit_values, np.maximum(last_set, 0), axis=0),
+                              state['limits'])
+        limit_table = np.vstack((state['limits'], limit_rows))
+        is_limit = np.zeros(n_ev, dtype=np.int64)
+        is_limit[limit_events] = 1
+        limit_idx = np.cumsum(is_limit)
+
+        # Posiciones: anclas absolutas (movimiento absoluto, G92, G28) más la
+        # suma de incrementos relativos desde la última ancla. Las cuatro
+        # columnas (X, Y, Z, E) se resuelven a la vez.
+        axis_cols = [_COL[a] for a in 'XYZE']
+        value = params[:, axis_cols]
+        has = present[:, axis_cols]
+        relative = np.empty((n_ev, 4), dtype=bool)
+        relative[:, :3] = (relative_xyz == 1)[:, None]
+        relative[:, 3] = relative_e == 1
+        move_has = is_move[:, None] & has
+        g92 = code_is[_G + 92]
+        g92_all = g92 & ~has.any(axis=1)
+        anchor = (move_has & ~relative) | (g92[:, None] & has) | g92_all[:, None]
+        anchor_value = np.where(has, value, 0.0)
+        g28_all = code_is[_G + 28] & ~has[:, :3].any(axis=1)
+        g28 = code_is[_G + 28][:, None] & (has | g28_all[:, None])
+        g28[:, 3] = False
+        anchor |= g28
+        anchor_value[g28] = 0.0
+        cumulative = np.cumsum(np.where(move_has & relative, value, 0.0), axis=0)
+        last = np.where(anchor, np.arange(n_ev)[:, None], -1)
+        np.maximum.accumulate(last, axis=0, out=last)
+        base = np.take_along_axis(anchor_value - cumulative, np.maximum(last, 0), axis=0)
+        positions = cumulative + np.where(last >= 0, base, state['pos'])
+
+        deltas = np.diff(positions, axis=0, prepend=state['pos'][None, :])
+
+        g4 = code_is[_G + 4]
+        dwell = float(np.nansum(params[g4, _COL['P']]) / 1000.0 + np.nansum(params[g4, _COL['S']]))
+
+        state['pos'] = positions[-1].copy()
+        state['relative_xyz'] = int(relative_xyz[-1])
+        state['relative_e'] = int(relative_e[-1])
+        state['tool'] = int(tool[-1])
+        state['feed'] = float(feed[-1])
+        state['limits'] = limit_table[-1]
+
+        moving = is_move & (deltas != 0).any(axis=1)
+        if not moving.any():
+            return None, dwell
+
+        d = deltas[moving]
+        dist = np.sqrt((d[:, :3] ** 2).sum(axis=1))
+
+        # Arcos G2/G3 con centro I/J: se sustituye la cuerda por la longitud del arco
+        arc = (code_is[_G + 2] | code_is[_G + 3])[moving] & (
+            present[moving][:, _COL['I']] | present[moving][:, _COL['J']]
+        )
+        if arc.any():
+            i = np.nan_to_num(params[moving][arc, _COL['I']])
+            j = np.nan_to_num(params[moving][arc, _COL['J']])
+            clockwise = code_is[_G + 2][moving][arc]
+            radius = np.hypot(i, j)
+            start = np.arctan2(-j, -i)
+            end = np.arctan2(d[arc, 1] - j, d[arc, 0] - i)
+            sweep = np.where(clockwise, start - end, end - start)
+            sweep = np.where(sweep <= 0, sweep + 2 * np.pi, sweep)
+            dist[arc] = np.hypot(radius * sweep, d[arc, 2])
+
+        moves = {
+            'dx': d[:, 0], 'dy': d[:, 1], 'dz': d[:, 2], 'de': d[:, 3],
+            'dist': dist,
+            'feed': feed[moving] / 60.0,
+            'tool': tool[moving],
+            'limits': limit_table[limit_idx[moving]],
+        }
+        return moves, dwell
+
+    def _segment_times(self, moves, v_start=0.0):
+        """
+        Tiempo de cada segmento con un perfil trapezoidal. La velocidad de
+        unión entre segmentos depende del ángulo entre ellos: continua en
+        línea recta, limitada a JUNCTION_JERK en esquinas de 90° o más.
+
+        Returns:
+            tuple: (tiempos por segmento, velocidad de entrada de cada uno),
+                   o (None, None) si no hay desplazamiento real.
+        """
+        lim = moves['limits']
+        dist = moves['dist']
+        de_abs = np.abs(moves['de'])
+        retract_only = dist == 0
+        length = np.where(retract_only, de_abs, dist)
+
+        keep = length > 0
+        if not keep.any():
+            return None, None
+        length = length[keep]
+        retract_only = retract_only[keep]
+        lim = lim[keep]
+        feed = moves['feed'][keep]
+        axes = np.column_stack([
+            np.abs(moves['dx'][keep]), np.abs(moves['dy'][keep]),
+            np.abs(moves['dz'][keep]), de_abs[keep],
+        ])
+
+        # Cada eje limita la velocidad/aceleración del movimiento en proporción
+        # a su peso en el desplazamiento total.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = axes / length[:, None]
+            axis_v = np.where(fraction > 0, lim[:, 0:4] / fraction, np.inf).min(axis=1)
+            axis_a = np.where(fraction > 0, lim[:, 4:8] / fraction, np.inf).min(axis=1)
+        # Aceleración base según el tipo: retracción pura, impresión o desplazamiento
+        extruding = moves['de'][keep] > 0
+        base_accel = np.where(retract_only, lim[:, 9], np.where(extruding, lim[:, 8], lim[:, 10]))
+        v = np.minimum(feed, axis_v)
+        a = np.minimum(base_accel, axis_a)
+
+        # Velocidades de unión: coseno entre direcciones XYZ consecutivas
+        direction = np.column_stack([
+            moves['dx'][keep], moves['dy'][keep], moves['dz'][keep]
+        ])
+        norm = np.linalg.norm(direction, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            direction = np.where(norm[:, None] > 0, direction / norm[:, None], 0.0)
+        cos = np.einsum('ij,ij->i', direction[:-1], direction[1:])
+        v_pair = np.minimum(v[:-1], v[1:])
+        junction = np.maximum(v_pair * np.clip(cos, 0.0, 1.0),
+                              np.minimum(v_pair, self.JUNCTION_JERK))
+        v_in = np.concatenate(([min(v_start, v[0])], junction))
+        v_out = np.concatenate((junction, [0.0]))
+
+        # Perfil trapezoidal (o triangular si no alcanza la velocidad crucero)
+        d_acc = (v ** 2 - v_in ** 2) / (2 * a)
+        d_dec = (v ** 2 - v_out ** 2) / (2 * a)
+        cruise = length - d_acc - d_dec
+        t_trapezoid = (v - v_in) / a + (v - v_out) / a + np.maximum(cruise, 0.0) / v
+
+        v_peak = np.sqrt((2 * a * length + v_in ** 2 + v_out ** 2) / 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_triangle = np.where(
+                v_peak >= np.maximum(v_in, v_out),
+                (v_peak - v_in) / a + (v_peak - v_out) / a,
+                2 * length / (v_in + v_out),  # solo acelera o frena: velocidad media
+            )
+        times = np.where(cruise >= 0, t_trapezoid, t_triangle)
+        # Un límite de máquina a 0 (M203 X0, M201 X0...) deja v o a en 0: ese
+        # segmento no suma tiempo en vez de dar inf/NaN
+        return np.where(np.isfinite(times), times, 0.0), v_in
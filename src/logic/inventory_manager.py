@@ -1,27 +1,56 @@
 from src.database.db_manager import DBManager
+from src.logic.change_events import change_bus, INVENTORY
 
 
 class InventoryManager:
+    # Columnas por las que se puede ordenar la tabla paginada
+    SORT_COLUMNS = {'id': 'id', 'brand': 'brand', 'material_type': 'material_type',
+                    'color': 'color', 'weight_current': 'weight_current', 'price': 'price'}
+
     def __init__(self, db_manager=None):
         self.db = db_manager or DBManager()
 
+    _INSERT_SQL = """INSERT INTO filaments
+                   (brand, material_type, color, weight_initial, weight_current,
+                    price, diameter, density, user_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
     def add_filament(self, brand, material_type, color, weight_initial, price,
                      user_id=None, diameter=1.75, density=1.24):
         if weight_initial < 0 or price < 0:
             return False, "El peso y el precio no pueden ser negativos."
         try:
             self.db.execute(
-                """INSERT INTO filaments
-                   (brand, material_type, color, weight_initial, weight_current,
-                    price, diameter, density, user_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                self._INSERT_SQL,
                 (brand, material_type, color, weight_initial, weight_initial,
                  price, diameter, density, user_id)
             )
+            change_bus.publish(INVENTORY, user_id)
             return True, "Filamento añadido correctamente."
         except Exception:
             return False, "Error al añadir filamento."
 
+    def add_filaments(self, filaments, user_id=None):
+        """
+        Alta masiva. filaments: dicts con brand, material_type, color,
+        weight_initial, price y opcionalmente diameter y density. Todo el
+        lote se guarda en una transacción (o no se guarda nada).
+        """
+        rows = []
+        for f in filaments:
+            if f['weight_initial'] < 0 or f['price'] < 0:
+                return False, "El peso y el precio no pueden ser negativos."
+            rows.append((f['brand'], f['material_type'], f['color'], f['weight_initial'],
+                         f['weight_initial'], f['price'], f.get('diameter', 1.75),
+                         f.get('density', 1.24), user_id))
+        try:
+            with self.db.unit_of_work() as uow:
+                uow.add_many(self._INSERT_SQL, rows)
+            change_bus.publish(INVENTORY, user_id)
+            return True, f"{len(rows)} filamentos añadidos."
+        except Exception:
+            return False, "Error al añadir filamentos."
+
     def get_all_filaments(self, user_id=None):
         if user_id is not None:
             return self.db.query(
@@ -30,17 +59,137 @@ class InventoryManager:
             )
         return self.db.query("SELECT * FROM filaments ORDER BY id DESC")
 
+    def get_all_filaments_paged(self, user_id=None, after_id=None, limit=100):
+        """Como get_all_filaments, por páginas (keyset por id)."""
+        if user_id is not None:
+            return self.db.query_page("SELECT * FROM filaments WHERE user_id = ?", (user_id,),
+                                      after_id, limit, descending=True)
+        return self.db.query_page("SELECT * FROM filaments", (), after_id, limit, descending=True)
+
+    def _page_filter(self, user_id, search):
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        for word in (search or "").split():
+            clauses.append("(brand LIKE ? OR material_type LIKE ? OR color LIKE ?)")
+            params.extend([f"%{word}%"] * 3)
+        return " AND ".join(clauses) or "1", params
+
+    def count_filaments(self, user_id=None, search=None):
+        where, params = self._page_filter(user_id, search)
+        return self.db.query_one(f"SELECT COUNT(*) as n FROM filaments WHERE {where}", tuple(params))['n']
+
+    def get_filaments_page(self, user_id=None, offset=0, limit=200, sort='id',
+                           descending=True, search=None):
+        """Una página de filamentos ordenada en SQL, filtrada por marca/tipo/color."""
+        where, params = self._page_filter(user_id, search)
+        direction = "DESC" if descending else "ASC"
+        order_by = self.SORT_COLUMNS.get(sort, 'id')
+        return self.db.query(
+            f"""SELECT * FROM filaments WHERE {where}
+               ORDER BY {order_by} {direction}, id {direction}
+               LIMIT ? OFFSET ?""",
+            (*params, limit, offset)
+        )
+
     def update_filament_weight(self, filament_id, new_weight):
         self.db.execute(
             "UPDATE filaments SET weight_current = ? WHERE id = ?",
             (new_weight, filament_id)
         )
+        change_bus.publish(INVENTORY)
+        return True
+
+    def consume_filaments(self, usage):
+        """
+        Descuenta el filamento gastado, {id del filamento: gramos}, sin bajar
+        de 0. Todos los descuentos en una transacción.
+        """
+        with self.db.unit_of_work() as uow:
+            uow.add_many(
+                "UPDATE filaments SET weight_current = MAX(0, weight_current - ?) WHERE id = ?",
+                [(grams, filament_id) for filament_id, grams in usage.items() if grams > 0]
+            )
+        change_bus.publish(INVENTORY)
         return True
 
     def delete_filament(self, filament_id):
         self.db.execute("DELETE FROM filaments WHERE id = ?", (filament_id,))
+        change_bus.publish(INVENTORY)
         return True
 
+    def delete_filaments(self, filament_ids):
+        with self.db.unit_of_work() as uow:
+            uow.add_many("DELETE FROM filaments WHERE id = ?", [(fid,) for fid in filament_ids])
+        change_bus.publish(INVENTORY)
+        return True
+
+    # --- Agregados para el panel de inicio ---
+
+    @staticmethod
+    def _user_filter(user_id):
+        return ("user_id = ?", (user_id,)) if user_id is not None else ("1", ())
+
+    def grams_by_material(self, user_id=None):
+        """
+        Gramos en stock por tipo de material (en mayúsculas y sin espacios),
+        de mayor a menor: [{'material', 'grams'}].
+        """
+        where, params = self._user_filter(user_id)
+        rows = self.db.query(
+            f"""SELECT UPPER(TRIM(material_type)) AS material, SUM(weight_current) AS grams
+               FROM filaments WHERE {where}
+               GROUP BY UPPER(TRIM(material_type))""",
+            params
+        )
+        # UPPER de SQLite solo convierte ASCII: se termina de agrupar aquí,
+        # igual que en grams_by_color, para que "Poliéster" y "POLIÉSTER" coincidan
+        totals = {}
+        for row in rows:
+            name = row['material'].upper()
+            totals[name] = totals.get(name, 0.0) + (row['grams'] or 0.0)
+        return [{'material': name, 'grams': grams}
+                for name, grams in sorted(totals.items(), key=lambda x: x[1], reverse=True)]
+
+    def grams_by_color(self, user_id=None):
+        """
+        Gramos en stock por color normalizado ("  rojo" y "Rojo" cuentan como
+        "Rojo"; sin color, "Desconocido"), de mayor a menor: [{'color', 'grams'}].
+        """
+        where, params = self._user_filter(user_id)
+        rows = self.db.query(
+            f"""SELECT LOWER(TRIM(color)) AS color, SUM(weight_current) AS grams
+               FROM filaments WHERE {where}
+               GROUP BY LOWER(TRIM(color))""",
+            params
+        )
+        # LOWER de SQLite solo convierte ASCII: se termina de agrupar aquí
+        # (pocas filas) con title() para que "AZUL MARÍA" y "azul maría" coincidan
+        totals = {}
+        for row in rows:
+            name = row['color'].title() if row['color'] else "Desconocido"
+            totals[name] = totals.get(name, 0.0) + (row['grams'] or 0.0)
+        return [{'color': name, 'grams': grams}
+                for name, grams in sorted(totals.items(), key=lambda x: x[1], reverse=True)]
+
+    def low_stock_filaments(self, user_id=None, threshold_pct=20, limit=3):
+        """
+        Filamentos con menos del threshold_pct % de su peso inicial, del más
+        al menos agotado, con 'percentage' calculado (hasta 'limit').
+        """
+        where, params = self._user_filter(user_id)
+        return self.db.query(
+            f"""SELECT id, brand, material_type, color, weight_initial, weight_current,
+                      weight_current * 100.0 / weight_initial AS percentage
+               FROM filaments
+               WHERE {where} AND weight_initial > 0
+                 AND weight_current * 100.0 / weight_initial < ?
+               ORDER BY weight_current * 100.0 / weight_initial, id
+               LIMIT ?""",
+            (*params, threshold_pct, limit)
+        )
+
     def get_filament_by_id(self, filament_id):
         return self.db.query_one(
             "SELECT * FROM filaments WHERE id = ?", (filament_id,)
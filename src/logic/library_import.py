@@ -0,0 +1,255 @@
+import hashlib
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.logic.blob_store import BlobStore, hash_file
+from src.logic.change_events import change_bus, MODELS
+from src.utils.logger import logger
+
+MODEL_EXTENSIONS = ('.stl', '.3mf', '.obj')
+
+
+class LibraryImporter:
+    """
+    Importación masiva de modelos desde una carpeta (recursiva) o un ZIP.
+
+    El hash y la copia al BlobStore se hacen en un pool de hilos (E/S); las
+    filas de cada lote se guardan en una sola transacción con executemany en
+    el hilo que llama, con su conexión del pool de DBManager. La tabla
+    library_import_journal registra cada entrada importada con su tamaño y
+    mtime, así que repetir la importación tras una interrupción continúa
+    donde se quedó. Se vuelven a importar las entradas que cambiaron y las
+    cuyo modelo ya no existe.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, library_manager, max_workers=None):
+        self.library = library_manager
+        self.store = library_manager.store
+        self.db = library_manager.db
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self._local = threading.local()
+        # ZipFile abiertos por los hilos del pool; se cierran al terminar
+        self._zipfiles = []
+        self._zipfiles_lock = threading.Lock()
+
+    @staticmethod
+    def collect_entries(source):
+        """Entradas de modelos de una carpeta (rutas relativas) o de un ZIP (nombres)."""
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as zf:
+                return sorted(
+                    info.filename for info in zf.infolist()
+                    if not info.is_dir() and info.filename.lower().endswith(MODEL_EXTENSIONS)
+                )
+        entries = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if name.lower().endswith(MODEL_EXTENSIONS):
+                    entries.append(os.path.relpath(os.path.join(root, name), source))
+        return sorted(entries)
+
+    @staticmethod
+    def entry_stats(source, entries):
+        """{entrada: (tamaño, mtime)} de las entradas de una carpeta o un ZIP."""
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as zf:
+                infos = [zf.getinfo(entry) for entry in entries]
+            return {info.filename: (info.file_size, time.mktime(info.date_time + (0, 0, -1)))
+                    for info in infos}
+        stats = {}
+        for entry in entries:
+            try:
+                stat = os.stat(os.path.join(source, entry))
+                stats[entry] = (stat.st_size, stat.st_mtime)
+            except OSError:  # enlace roto: falla al importarlo, no aquí
+                stats[entry] = (None, None)
+        return stats
+
+    def _journaled(self, source, stats):
+        """
+        Entradas del diario que siguen importadas: su modelo existe y tienen el
+        mismo tamaño y mtime. Las filas anteriores a esas columnas solo
+        comprueban el modelo.
+        """
+        rows = self.db.query(
+            """SELECT j.entry, j.size, j.mtime FROM library_import_journal j
+               WHERE j.source = ?
+                 AND EXISTS (SELECT 1 FROM models m WHERE m.blob_hash = j.blob_hash)""",
+            (source,)
+        )
+        return {
+            row['entry'] for row in rows
+            if row['entry'] in stats
+            and (row['size'] is None or (row['size'], row['mtime']) == stats[row['entry']])
+        }
+
+    def import_source(self, source, user_id=None, progress=None, should_stop=None):
+        """
+        Importa todos los modelos de 'source'. progress(hechos, total, entrada)
+        se llama al terminar cada archivo; should_stop() permite interrumpir
+        (lo ya guardado queda registrado y se salta al reanudar).
+
+        Devuelve {'total', 'imported', 'duplicates', 'resumed', 'failed', 'interrupted'}.
+        """
+        source = os.path.abspath(source)
+        is_zip = zipfile.is_zipfile(source)
+        entries = self.collect_entries(source)
+        stats = self.entry_stats(source, entries)
+        done_entries = self._journaled(source, stats)
+        pending = [e for e in entries if e not in done_entries]
+        summary = {
+            'total': len(entries), 'imported': 0, 'duplicates': 0,
+            'resumed': len(entries) - len(pending), 'failed': 0, 'interrupted': False,
+        }
+        done = summary['resumed']
+        task = self._store_zip_entry if is_zip else self._store_file
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for start in range(0, len(pending), self.BATCH_SIZE):
+                    if should_stop and should_stop():
+                        summary['interrupted'] = True
+                        break
+                    batch = pending[start:start + self.BATCH_SIZE]
+                    futures = {pool.submit(task, source, entry): entry for entry in batch}
+                    stored = []
+                    for future in as_completed(futures):
+                        entry = futures[future]
+                        try:
+                            stored.append((entry,) + future.result())
+                        except Exception as e:
+                            logger.warning(f"Error importando {entry}: {e}")
+                            summary['failed'] += 1
+                        done += 1
+                        if progress:
+                            progress(done, len(entries), entry)
+                        if should_stop and should_stop():
+                            # Se guarda lo ya copiado; lo pendiente se reanuda después
+                            summary['interrupted'] = True
+                            for pending_future in futures:
+                                pending_future.cancel()
+                            break
+                    imported, duplicates = self._commit_batch(source, stored, user_id,
+                                                              stats, task)
+                    summary['imported'] += imported
+                    summary['duplicates'] += duplicates
+                    if summary['interrupted']:
+                        break
+        finally:
+            self._close_zipfiles()
+        return summary
+
+    def _close_zipfiles(self):
+        with self._zipfiles_lock:
+            zipfiles, self._zipfiles = self._zipfiles, []
+        for zf in zipfiles:
+            zf.close()
+        self._local = threading.local()
+
+    def _store_file(self, source, entry, dest=None):
+        """
+        Hash y copia (enlace/reflink si se puede) de un archivo de la carpeta.
+        Con dest se escribe ahí aunque ya exista (para rehacer un blob dañado).
+        """
+        path = os.path.join(source, entry)
+        digest = hash_file(path, self.store.CHUNK_SIZE)
+        rebuild = dest is not None
+        dest = dest or self.store.path_for(digest, os.path.splitext(entry)[1])
+        if rebuild or not os.path.exists(dest):
+            self.store.materialize(path, dest)
+        stat = os.stat(dest)
+        return digest, dest, stat.st_size, stat.st_mtime
+
+    def _store_zip_entry(self, source, entry, dest=None):
+        """Extrae una entrada del ZIP calculando el hash en la misma pasada."""
+        zf = getattr(self._local, 'zipfile', None)
+        if zf is None or zf.filename != source:
+            # Un ZipFile por hilo: no se comparten lecturas entre hilos
+            zf = self._local.zipfile = zipfile.ZipFile(source)
+            with self._zipfiles_lock:
+                self._zipfiles.append(zf)
+        ext = os.path.splitext(entry)[1]
+        tmp = os.path.join(self.store.root, f"import.{threading.get_ident()}.tmp")
+        digest = hashlib.blake2b(digest_size=32)
+        with zf.open(entry) as fsrc, open(tmp, 'wb') as fdst:
+            for chunk in iter(lambda: fsrc.read(self.store.CHUNK_SIZE), b''):
+                digest.update(chunk)
+                fdst.write(chunk)
+        digest = digest.hexdigest()
+        rebuild = dest is not None
+        dest = dest or self.store.path_for(digest, ext)
+        if os.path.exists(dest) and not rebuild:
+            os.remove(tmp)
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp, dest)
+        stat = os.stat(dest)
+        return digest, dest, stat.st_size, stat.st_mtime
+
+    def _commit_batch(self, source, stored, user_id, stats, task):
+        """
+        Guarda blobs, modelos y diario de un lote en una única transacción.
+        Los blobs ya registrados que no pasan la comprobación de BlobStore.put
+        (tamaño y mtime) se vuelven a crear en su ruta desde la entrada.
+        """
+        if not stored:
+            return 0, 0
+        digests = sorted({digest for _, digest, _, _, _ in stored})
+        placeholders = ','.join('?' * len(digests))
+        known = {
+            row['hash']: row for row in self.db.query(
+                f"SELECT * FROM blobs WHERE hash IN ({placeholders})", tuple(digests)
+            )
+        }
+        stale = {digest: row for digest, row in known.items() if not BlobStore._is_intact(row)}
+        refreshed = []
+        for entry, digest, _, _, _ in stored:
+            row = stale.pop(digest, None)
+            if row is not None:
+                logger.warning(f"El blob {row['path']} cambió desde que se guardó; se vuelve a crear")
+                _, dest, size, mtime = task(source, entry, dest=row['path'])
+                refreshed.append((size, mtime, digest))
+        seen = set(known)
+        duplicates = 0
+        for _, digest, _, _, _ in stored:
+            if digest in seen:
+                duplicates += 1
+            seen.add(digest)
+
+        with self.db.transaction():
+            # Si el blob ya existía se conserva su ruta y se suma la referencia
+            self.db.executemany(
+                """INSERT INTO blobs (hash, path, size, mtime, refcount) VALUES (?, ?, ?, ?, 1)
+                   ON CONFLICT(hash) DO UPDATE SET refcount = refcount + 1""",
+                [(digest, dest, size, mtime) for _, digest, dest, size, mtime in stored]
+            )
+            self.db.executemany("UPDATE blobs SET size = ?, mtime = ? WHERE hash = ?", refreshed)
+            self.db.executemany(
+                """INSERT INTO models (name, description, file_path, thumbnail_path, user_id, blob_hash)
+                   SELECT ?, '', path, '', ?, hash FROM blobs WHERE hash = ?""",
+                [(os.path.basename(entry), user_id, digest) for entry, digest, _, _, _ in stored]
+            )
+            self.db.executemany(
+                """INSERT OR REPLACE INTO library_import_journal (source, entry, blob_hash, size, mtime)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(source, entry, digest) + stats[entry] for entry, digest, _, _, _ in stored]
+            )
+        change_bus.publish(MODELS, user_id)
+
+        # Un mismo contenido con otra extensión deja una copia sin registrar
+        registered = {
+            row['path'] for row in self.db.query(
+                f"SELECT path FROM blobs WHERE hash IN ({placeholders})", tuple(digests)
+            )
+        }
+        for dest in {dest for _, _, dest, _, _ in stored} - registered:
+            try:
+                os.remove(dest)
+            except OSError:
+                pass
+        return len(stored), duplicates
@@ -1,7 +1,10 @@
 import os
-import shutil
 
 from src.database.db_manager import DBManager
+from src.logic.blob_store import BlobStore
+from src.logic.change_events import change_bus, MODELS
+from src.logic.mesh_lod import MeshLODCache
+from src.utils.logger import logger
 
 
 class LibraryManager:
@@ -11,23 +14,65 @@ class LibraryManager:
         self.library_path = os.path.join(app_data_dir, 'models')
         if not os.path.exists(self.library_path):
             os.makedirs(self.library_path)
+        # Los archivos se guardan por contenido: models/ab/cd/<hash>.stl
+        self.store = BlobStore(self.library_path, self.db)
 
-    def add_model(self, file_path, name, description="", user_id=None):
+    def add_model(self, file_path, name, description="", user_id=None, progress=None,
+                  build_lod=None):
+        """
+        Añade un modelo a la biblioteca. Si el mismo contenido ya está
+        guardado solo se añade una referencia (sin copiar ni regenerar cachés).
+        progress(fase, hechos, total) informa del hash y la copia en bytes.
+
+        La caché LOD de un archivo nuevo se genera después de guardar la fila:
+        build_lod(ruta) permite delegarla (la interfaz la lanza en el pool de
+        hilos); sin él se genera aquí mismo.
+        """
         if not os.path.exists(file_path):
             return False, "El archivo no existe."
-        dest_path = os.path.join(self.library_path, os.path.basename(file_path))
         try:
-            shutil.copy2(file_path, dest_path)
+            digest, dest_path, is_new = self.store.put(file_path, progress)
         except Exception as e:
             return False, f"Error al copiar archivo: {e}"
         try:
             self.db.execute(
-                "INSERT INTO models (name, description, file_path, thumbnail_path, user_id) VALUES (?, ?, ?, ?, ?)",
-                (name, description, dest_path, "", user_id)
+                """INSERT INTO models (name, description, file_path, thumbnail_path, user_id, blob_hash)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (name, description, dest_path, "", user_id, digest)
             )
-            return True, "Modelo añadido correctamente."
         except Exception as e:
+            self._release_blob(digest)
             return False, f"Error al guardar en base de datos: {e}"
+        change_bus.publish(MODELS, user_id)
+        if is_new:
+            (build_lod or self.build_lod_cache)(dest_path)
+        return True, "Modelo añadido correctamente."
+
+    def _release_blob(self, digest):
+        """Quita una referencia al blob y, si era la última, también su caché LOD."""
+        row = self.store.get(digest)
+        if row and self.store.release(digest):
+            MeshLODCache.remove(row['path'])
+
+    @staticmethod
+    def build_lod_cache(file_path):
+        """
+        Genera los niveles de detalle del visor junto al modelo. Si falla, el
+        modelo se añade igual: el visor carga el archivo original.
+        """
+        try:
+            MeshLODCache.build(file_path)
+            return True
+        except Exception as e:
+            logger.warning(f"No se pudo generar la caché LOD de {file_path}: {e}")
+            return False
+
+    def set_thumbnail(self, model_id, thumbnail_path):
+        self.db.execute(
+            "UPDATE models SET thumbnail_path = ? WHERE id = ?",
+            (thumbnail_path or "", model_id)
+        )
+        change_bus.publish(MODELS)
 
     def get_all_models(self, user_id=None):
         if user_id is not None:
@@ -37,17 +82,30 @@ class LibraryManager:
             )
         return self.db.query("SELECT * FROM models ORDER BY added_date DESC")
 
+    def get_all_models_paged(self, user_id=None, after_id=None, limit=100):
+        """Modelos del más reciente al más antiguo por páginas (keyset por id)."""
+        if user_id is not None:
+            return self.db.query_page("SELECT * FROM models WHERE user_id = ?", (user_id,),
+                                      after_id, limit, descending=True)
+        return self.db.query_page("SELECT * FROM models", (), after_id, limit, descending=True)
+
     def delete_model(self, model_id):
         result = self.db.query_one(
-            "SELECT file_path FROM models WHERE id = ?", (model_id,)
+            "SELECT file_path, blob_hash FROM models WHERE id = ?", (model_id,)
         )
         if result:
-            file_path = result['file_path']
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
             self.db.execute("DELETE FROM models WHERE id = ?", (model_id,))
+            change_bus.publish(MODELS)
+            if result['blob_hash']:
+                self._release_blob(result['blob_hash'])
+            else:
+                # Modelos anteriores al almacén por contenido
+                file_path = result['file_path']
+                if os.path.exists(file_path):
+                    try:
+                        os.remove(file_path)
+                    except OSError:
+                        pass
+                MeshLODCache.remove(file_path)
             return True
         return False
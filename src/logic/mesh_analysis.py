@@ -0,0 +1,142 @@
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.database.db_manager import DBManager
+from src.utils.logger import logger
+
+DEFAULT_DENSITY = 1.24     # g/cm³ (PLA)
+DEFAULT_DIAMETER = 1.75    # mm
+
+
+def analyze_arrays(vertices, faces):
+    """
+    Volumen, área, caja envolvente y estanqueidad de una malla triangular
+    (unidades del archivo: mm). Todo vectorizado sobre los arrays de triángulos.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    v0, v1, v2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+
+    cross = np.cross(v1 - v0, v2 - v0)
+    area_mm2 = 0.5 * np.linalg.norm(cross, axis=1).sum()
+    # Suma de los volúmenes con signo de los tetraedros (origen, triángulo)
+    volume_mm3 = abs(np.einsum('ij,ij->i', v0, cross).sum()) / 6.0
+
+    # Estanca si cada arista la comparten exactamente dos caras
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    edge_keys = edges[:, 0] * len(vertices) + edges[:, 1]
+    _, counts = np.unique(edge_keys, return_counts=True)
+    watertight = bool(len(counts)) and bool((counts == 2).all())
+
+    vmin, vmax = vertices.min(axis=0), vertices.max(axis=0)
+    size = vmax - vmin
+    return {
+        'volume_cm3': volume_mm3 / 1000.0,
+        'surface_area_cm2': area_mm2 / 100.0,
+        'bbox_x_mm': float(size[0]),
+        'bbox_y_mm': float(size[1]),
+        'bbox_z_mm': float(size[2]),
+        'is_watertight': watertight,
+    }
+
+
+def analyze_file(file_path):
+    """Analiza un archivo de malla (STL/3MF/OBJ) completo."""
+    from src.logic.mesh_lod import load_mesh
+    mesh = load_mesh(file_path)
+    return analyze_arrays(mesh.vertices, mesh.faces)
+
+
+def estimate_filament(volume_cm3, surface_area_cm2, density=DEFAULT_DENSITY,
+                      diameter=DEFAULT_DIAMETER, infill=0.20, perimeters=2,
+                      line_width=0.4):
+    """
+    Estima el filamento de una pieza: una carcasa de 'perimeters' líneas
+    (área × grosor de pared, sin superar el volumen) más el interior al
+    porcentaje de relleno. Devuelve {'grams', 'length_m', 'material_cm3'}.
+    """
+    volume_cm3 = max(0.0, volume_cm3 or 0.0)
+    wall_cm = perimeters * line_width / 10.0
+    shell_cm3 = min(volume_cm3, (surface_area_cm2 or 0.0) * wall_cm)
+    material_cm3 = shell_cm3 + (volume_cm3 - shell_cm3) * infill
+
+    radius_cm = (diameter / 10.0) / 2
+    length_m = material_cm3 / (math.pi * radius_cm ** 2) / 100.0
+    return {
+        'grams': material_cm3 * density,
+        'length_m': length_m,
+        'material_cm3': material_cm3,
+    }
+
+
+def _analyze_in_worker(file_path):
+    """Punto de entrada de los procesos de MeshAnalyzer.analyze_batch."""
+    return analyze_file(file_path)
+
+
+class MeshAnalyzer:
+    """Análisis de modelos de la biblioteca, guardado en columnas de 'models'."""
+
+    def __init__(self, db_manager=None):
+        self.db = db_manager or DBManager()
+
+    @staticmethod
+    def analyze_batch(models, max_workers=None):
+        """
+        Analiza [(id, ruta)] en un pool de procesos. Generador de
+        (id, resultado) en orden de finalización; resultado es None si falla.
+        """
+        models = list(models)
+        if not models:
+            return
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {pool.submit(_analyze_in_worker, path): model_id for model_id, path in models}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    logger.warning(f"Error analizando el modelo {futures[future]}: {e}")
+                    yield futures[future], None
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def save_analysis(self, model_id, analysis):
+        self.db.execute(
+            """UPDATE models SET volume_cm3 = ?, surface_area_cm2 = ?, bbox_x_mm = ?,
+                   bbox_y_mm = ?, bbox_z_mm = ?, is_watertight = ?, analyzed_at = CURRENT_TIMESTAMP
+               WHERE id = ?""",
+            (analysis['volume_cm3'], analysis['surface_area_cm2'], analysis['bbox_x_mm'],
+             analysis['bbox_y_mm'], analysis['bbox_z_mm'], int(analysis['is_watertight']), model_id)
+        )
+
+    def get_models_pending_analysis(self, user_id=None):
+        sql = "SELECT id, file_path FROM models WHERE analyzed_at IS NULL"
+        params = ()
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params = (user_id,)
+        return [(row['id'], row['file_path']) for row in self.db.query(sql, params)]
+
+    def estimate_for_model(self, model_id, filament_id=None, infill=0.20, perimeters=2):
+        """
+        Estimación de filamento de un modelo ya analizado con la densidad y el
+        diámetro del filamento indicado (o PLA 1.75 mm). None si no hay análisis.
+        """
+        model = self.db.query_one(
+            "SELECT volume_cm3, surface_area_cm2 FROM models WHERE id = ?", (model_id,)
+        )
+        if not model or model['volume_cm3'] is None:
+            return None
+        density, diameter = DEFAULT_DENSITY, DEFAULT_DIAMETER
+        if filament_id:
+            filament = self.db.query_one(
+                "SELECT density, diameter FROM filaments WHERE id = ?", (filament_id,)
+            )
+            if filament:
+                density = filament['density'] or DEFAULT_DENSITY
+                diameter = filament['diameter'] or DEFAULT_DIAMETER
+        return estimate_filament(model['volume_cm3'], model['surface_area_cm2'],
+                                 density, diameter, infill, perimeters)
@@ -0,0 +1,223 @@
+import os
+import struct
+import threading
+import zipfile
+
+import numpy as np
+
+from src.utils.logger import logger
+
+# Niveles de detalle por número máximo de caras (None = malla completa)
+LOD_LEVELS = (5000, 50000, None)
+LOD_SUFFIX = '.lod.npz'
+LOD_FORMAT_VERSION = 1
+
+
+class MeshLoadCancelled(Exception):
+    """La carga se ha descartado porque se pidió otro modelo."""
+
+
+def load_mesh(file_path):
+    """Carga un modelo con trimesh (de una escena, la primera geometría)."""
+    import trimesh
+    mesh = trimesh.load(file_path)
+    if isinstance(mesh, trimesh.Scene):
+        if len(mesh.geometry) == 0:
+            raise ValueError("El archivo no contiene geometría")
+        mesh = list(mesh.geometry.values())[0]
+    return mesh
+
+
+def _cluster_vertices(vertices, faces, grid):
+    """Simplificación por agrupación de vértices en una rejilla de grid³ celdas."""
+    vmin = vertices.min(axis=0)
+    extent = np.maximum(vertices.max(axis=0) - vmin, 1e-9)
+    cells = np.minimum((vertices - vmin) / extent * grid, grid - 1).astype(np.int64)
+    keys = (cells[:, 0] * grid + cells[:, 1]) * grid + cells[:, 2]
+    _, cluster, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    # Cada vértice nuevo es el centroide de su celda
+    new_vertices = np.zeros((len(counts), 3))
+    np.add.at(new_vertices, cluster, vertices)
+    new_vertices /= counts[:, None]
+
+    new_faces = cluster[faces]
+    keep = ((new_faces[:, 0] != new_faces[:, 1]) &
+            (new_faces[:, 1] != new_faces[:, 2]) &
+            (new_faces[:, 0] != new_faces[:, 2]))
+    new_faces = new_faces[keep]
+    if len(new_faces):
+        new_faces = np.unique(new_faces, axis=0)
+    return new_vertices, new_faces
+
+
+def decimate_arrays(vertices, faces, max_faces):
+    """
+    Reduce la malla a max_faces caras como máximo. Se usa cuando trimesh no
+    tiene disponible la decimación cuádrica (requiere fast_simplification).
+    """
+    if len(faces) <= max_faces:
+        return vertices, faces
+    # Las caras de una superficie crecen con el cuadrado de la resolución
+    grid = max(4, int(np.sqrt(max_faces / 4)))
+    while grid >= 4:
+        new_vertices, new_faces = _cluster_vertices(vertices, faces, grid)
+        if len(new_faces) <= max_faces:
+            return new_vertices, new_faces
+        grid = int(grid * 0.8)
+    # Último recurso: muestreo uniforme de caras
+    step = int(np.ceil(len(faces) / max_faces))
+    return vertices, faces[::step]
+
+
+def simplify_mesh(mesh, max_faces):
+    """Decimación cuádrica de trimesh si está disponible; si no, por rejilla."""
+    if max_faces is not None and len(mesh.faces) > max_faces:
+        try:
+            mesh = mesh.simplify_quadric_decimation(face_count=max_faces)
+        except Exception:
+            pass
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    if max_faces is None:
+        return vertices, faces
+    return decimate_arrays(vertices, faces, max_faces)
+
+
+def compute_vertex_normals(vertices, faces):
+    """Normales por vértice ponderadas por el área de las caras (float32)."""
+    tris = vertices[faces]
+    face_normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    flat = faces.ravel()
+    normals = np.empty((len(vertices), 3), dtype=np.float32)
+    for axis in range(3):
+        weights = np.repeat(face_normals[:, axis], 3)
+        normals[:, axis] = np.bincount(flat, weights=weights, minlength=len(vertices))
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    return normals / lengths[:, None]
+
+
+def _memmap_npz_member(path, zf, name):
+    """
+    Proyecta en memoria un array de un .npz sin comprimir (np.savez): se
+    localiza el inicio del .npy dentro del zip y se abre con np.memmap.
+    """
+    info = zf.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        with zf.open(info) as f:
+            return np.lib.format.read_array(f)
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if not shape or 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+class MeshLODCache:
+    """
+    Caché de niveles de detalle de un modelo, en un .npz sin comprimir junto
+    al archivo original (modelo.stl -> modelo.stl.lod.npz).
+
+    Para cada nivel guarda vértices (float32), caras (uint32) y normales
+    (float32), además de la caja envolvente. Los arrays se abren con mmap:
+    abrir un nivel no copia datos hasta que se leen.
+    """
+
+    def __init__(self, path, face_counts, bbox):
+        self.path = path
+        self.face_counts = face_counts
+        self.bbox = bbox
+
+    @staticmethod
+    def path_for(model_path):
+        return model_path + LOD_SUFFIX
+
+    @classmethod
+    def build(cls, model_path, levels=LOD_LEVELS, is_cancelled=None, mesh=None):
+        """
+        Genera la caché de un modelo y la devuelve abierta. Los niveles que no
+        reducen la malla se omiten; el último nivel es siempre la malla completa.
+        mesh: la malla de trimesh si quien llama ya la cargó.
+        """
+        if mesh is None:
+            mesh = load_mesh(model_path)
+        total_faces = len(mesh.faces)
+        stat = os.stat(model_path)
+
+        targets = [n for n in levels if n is not None and n < total_faces] + [None]
+        arrays = {}
+        face_counts = []
+        for index, max_faces in enumerate(targets):
+            if is_cancelled and is_cancelled():
+                raise MeshLoadCancelled()
+            vertices, faces = simplify_mesh(mesh, max_faces)
+            arrays[f'lod{index}_vertices'] = np.ascontiguousarray(vertices, dtype=np.float32)
+            arrays[f'lod{index}_faces'] = np.ascontiguousarray(faces, dtype=np.uint32)
+            arrays[f'lod{index}_normals'] = compute_vertex_normals(vertices, faces)
+            face_counts.append(len(faces))
+
+        bbox = np.asarray(mesh.bounds, dtype=np.float64)
+        arrays['face_counts'] = np.asarray(face_counts, dtype=np.int64)
+        arrays['bbox'] = bbox
+        arrays['source'] = np.asarray([stat.st_size, stat.st_mtime, LOD_FORMAT_VERSION], dtype=np.float64)
+
+        # Escritura atómica: nunca se deja una caché a medias. El temporal es
+        # propio de cada hilo (el visor y el alta pueden generarla a la vez)
+        path = cls.path_for(model_path)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return cls(path, face_counts, bbox)
+
+    @classmethod
+    def open(cls, model_path):
+        """Abre la caché si existe y corresponde al archivo actual; si no, None."""
+        path = cls.path_for(model_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                size, mtime, version = data['source']
+                face_counts = [int(n) for n in data['face_counts']]
+                bbox = data['bbox']
+            stat = os.stat(model_path)
+            if version != LOD_FORMAT_VERSION or size != stat.st_size or mtime != stat.st_mtime:
+                return None
+            return cls(path, face_counts, bbox)
+        except Exception as e:
+            logger.warning(f"Caché LOD no válida ({path}): {e}")
+            return None
+
+    @classmethod
+    def remove(cls, model_path):
+        try:
+            os.remove(cls.path_for(model_path))
+        except OSError:
+            pass
+
+    def levels_up_to(self, max_faces=None):
+        """Índices de los niveles a mostrar, de menor a mayor detalle."""
+        if max_faces is None:
+            return list(range(len(self.face_counts)))
+        indices = [i for i, n in enumerate(self.face_counts) if n <= max_faces]
+        return indices or [0]
+
+    def get_level(self, index):
+        """Devuelve (vertices, faces, normals) del nivel, proyectados en memoria."""
+        with zipfile.ZipFile(self.path) as zf:
+            return tuple(
+                _memmap_npz_member(self.path, zf, f'lod{index}_{name}')
+                for name in ('vertices', 'faces', 'normals')
+            )
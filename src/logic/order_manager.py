@@ -1,40 +1,103 @@
 import sqlite3
 from datetime import datetime
 from src.database.db_manager import DBManager
+from src.logic.change_events import change_bus, ORDERS
+from src.logic.search_manager import SearchManager
 
 
 class OrderManager:
 
     STATUSES = ['Presupuesto', 'Aceptado', 'En Producción', 'Entregado', 'Cancelado']
 
-    def __init__(self):
-        self.db = DBManager()
+    # Columnas por las que se puede ordenar la tabla paginada
+    SORT_COLUMNS = {
+        'id': 'o.id', 'customer_name': 'c.name', 'project_name': 'p.name',
+        'status': 'o.status', 'quantity': 'o.quantity', 'unit_price': 'o.unit_price',
+        'total_price': 'o.total_price', 'created_at': 'o.created_at',
+    }
+
+    def __init__(self, db_manager=None):
+        self.db = db_manager or DBManager()
+
+    _INSERT_SQL = """INSERT INTO orders
+                   (user_id, customer_id, project_id, status, unit_price, total_price,
+                    quantity, delivery_date)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
 
     def create_order(self, user_id, customer_id, unit_price, quantity=1,
-                     project_id=None, delivery_date=None) -> tuple:
+                     project_id=None, delivery_date=None, status='Presupuesto') -> tuple:
         try:
             total_price = round(unit_price * quantity, 2)
             self.db.execute(
-                """INSERT INTO orders
-                   (user_id, customer_id, project_id, unit_price, total_price,
-                    quantity, delivery_date)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (user_id, customer_id, project_id, unit_price, total_price,
+                self._INSERT_SQL,
+                (user_id, customer_id, project_id, status, unit_price, total_price,
                  quantity, delivery_date)
             )
+            change_bus.publish(ORDERS, user_id)
             return True, "Pedido creado correctamente"
         except sqlite3.Error as e:
             return False, f"Error al crear pedido: {e}"
 
+    def create_orders(self, user_id, orders) -> tuple:
+        """
+        Alta masiva. orders: dicts con customer_id y unit_price y
+        opcionalmente quantity, project_id, delivery_date y status. Una sola
+        transacción: si un pedido falla no se crea ninguno.
+        """
+        rows = []
+        for o in orders:
+            quantity = o.get('quantity', 1)
+            rows.append((user_id, o['customer_id'], o.get('project_id'),
+                         o.get('status', 'Presupuesto'), o['unit_price'],
+                         round(o['unit_price'] * quantity, 2), quantity, o.get('delivery_date')))
+        try:
+            with self.db.unit_of_work() as uow:
+                uow.add_many(self._INSERT_SQL, rows)
+            change_bus.publish(ORDERS, user_id)
+            return True, f"{len(rows)} pedidos creados"
+        except sqlite3.Error as e:
+            return False, f"Error al crear pedidos: {e}"
+
+    _LIST_SQL = """SELECT o.*, c.name as customer_name, p.name as project_name
+               FROM orders o
+               JOIN customers c ON o.customer_id = c.id
+               LEFT JOIN projects p ON o.project_id = p.id
+               WHERE o.user_id = ?"""
+
     def get_all_orders(self, user_id) -> list:
+        return self.db.query(self._LIST_SQL + " ORDER BY o.created_at DESC", (user_id,))
+
+    def get_all_orders_paged(self, user_id, after_id=None, limit=100) -> list:
+        """Pedidos del más reciente al más antiguo por páginas (keyset por id)."""
+        return self.db.query_page(self._LIST_SQL, (user_id,), after_id, limit, descending=True)
+
+    def _page_filter(self, user_id, search):
+        where, params = "o.user_id = ?", [user_id]
+        match = SearchManager.build_match_query(search)
+        if match:
+            where += " AND o.id IN (SELECT rowid FROM orders_fts WHERE orders_fts MATCH ?)"
+            params.append(match)
+        return where, params
+
+    def count_orders(self, user_id, search=None) -> int:
+        where, params = self._page_filter(user_id, search)
+        return self.db.query_one(f"SELECT COUNT(*) as n FROM orders o WHERE {where}", tuple(params))['n']
+
+    def get_orders_page(self, user_id, offset=0, limit=200, sort='created_at',
+                        descending=True, search=None) -> list:
+        """Una página de pedidos ordenada en SQL; search usa el índice FTS."""
+        where, params = self._page_filter(user_id, search)
+        direction = "DESC" if descending else "ASC"
+        order_by = self.SORT_COLUMNS.get(sort, 'o.created_at')
         return self.db.query(
-            """SELECT o.*, c.name as customer_name, p.name as project_name
+            f"""SELECT o.*, c.name as customer_name, p.name as project_name
                FROM orders o
                JOIN customers c ON o.customer_id = c.id
                LEFT JOIN projects p ON o.project_id = p.id
-               WHERE o.user_id = ?
-               ORDER BY o.created_at DESC""",
-            (user_id,)
+               WHERE {where}
+               ORDER BY {order_by} {direction}, o.id {direction}
+               LIMIT ? OFFSET ?""",
+            (*params, limit, offset)
         )
 
     def get_order_by_id(self, order_id):
@@ -59,6 +122,7 @@ class OrderManager:
                 f"UPDATE orders SET {', '.join(fields)} WHERE id = ?",
                 (*values, order_id)
             )
+            change_bus.publish(ORDERS)
             return True, "Pedido actualizado"
         except sqlite3.Error as e:
             return False, f"Error al actualizar: {e}"
@@ -69,13 +133,40 @@ class OrderManager:
                 "UPDATE orders SET status = 'Entregado', delivered_at = ? WHERE id = ?",
                 (datetime.now().isoformat(), order_id)
             )
+            change_bus.publish(ORDERS)
             return True, "Pedido marcado como entregado"
         except sqlite3.Error as e:
             return False, f"Error: {e}"
 
+    def update_orders_status(self, order_ids, status) -> tuple:
+        """Cambia el estado de varios pedidos en una transacción."""
+        if status not in self.STATUSES:
+            return False, f"Estado no válido: {status}"
+        delivered_at = datetime.now().isoformat() if status == 'Entregado' else None
+        try:
+            with self.db.unit_of_work() as uow:
+                uow.add_many(
+                    "UPDATE orders SET status = ?, delivered_at = COALESCE(?, delivered_at) WHERE id = ?",
+                    [(status, delivered_at, order_id) for order_id in order_ids]
+                )
+            change_bus.publish(ORDERS)
+            return True, "Pedidos actualizados"
+        except sqlite3.Error as e:
+            return False, f"Error al actualizar: {e}"
+
+    def delete_orders(self, order_ids) -> tuple:
+        try:
+            with self.db.unit_of_work() as uow:
+                uow.add_many("DELETE FROM orders WHERE id = ?", [(order_id,) for order_id in order_ids])
+            change_bus.publish(ORDERS)
+            return True, "Pedidos eliminados"
+        except sqlite3.Error as e:
+            return False, f"Error al eliminar: {e}"
+
     def delete_order(self, order_id) -> tuple:
         try:
             self.db.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+            change_bus.publish(ORDERS)
             return True, "Pedido eliminado"
         except sqlite3.Error as e:
             return False, f"Error al eliminar: {e}"
@@ -1,11 +1,12 @@
 from datetime import datetime
 from src.database.db_manager import DBManager
+from src.logic.change_events import change_bus, INVENTORY, PROJECTS
 
 
 class ProjectManager:
 
-    def __init__(self):
-        self.db = DBManager()
+    def __init__(self, db_manager=None):
+        self.db = db_manager or DBManager()
 
     def create_project(self, user_id, name, description="", model_id=None,
                        filament_id=None, weight_grams=0, print_time_hours=0,
@@ -19,14 +20,12 @@ class ProjectManager:
                 (user_id, name, description, model_id, filament_id,
                  weight_grams, print_time_hours, status)
             )
+            change_bus.publish(PROJECTS, user_id)
             return True, "Proyecto creado exitosamente"
         except Exception as e:
             return False, f"Error al crear proyecto: {str(e)}"
 
-    def get_all_projects(self, user_id):
-        """Returns list[dict] ordered by created_at DESC."""
-        return self.db.query(
-            """SELECT p.id, p.name, p.description, p.status, p.weight_grams,
+    _LIST_SQL = """SELECT p.id, p.name, p.description, p.status, p.weight_grams,
                       p.print_time_hours, p.total_cost, p.filament_cost,
                       p.energy_cost, p.created_at, p.completed_at,
                       m.name as model_name, f.brand as filament_brand,
@@ -34,9 +33,23 @@ class ProjectManager:
                FROM projects p
                LEFT JOIN models m ON p.model_id = m.id
                LEFT JOIN filaments f ON p.filament_id = f.id
-               WHERE p.user_id = ?
-               ORDER BY p.created_at DESC""",
-            (user_id,)
+               WHERE p.user_id = ?"""
+
+    def get_all_projects(self, user_id):
+        """Returns list[dict] ordered by created_at DESC."""
+        return self.db.query(self._LIST_SQL + " ORDER BY p.created_at DESC", (user_id,))
+
+    def get_all_projects_paged(self, user_id, after_id=None, limit=100):
+        """Same rows as get_all_projects, newest first, one keyset page at a time."""
+        return self.db.query_page(self._LIST_SQL, (user_id,), after_id, limit, descending=True)
+
+    def get_recent_project_costs(self, user_id, limit=8):
+        """Newest projects with a cost (name and cost breakdown), for the home chart."""
+        return self.db.query(
+            """SELECT id, name, filament_cost, energy_cost, total_cost FROM projects
+               WHERE user_id = ? AND total_cost > 0
+               ORDER BY created_at DESC, id DESC LIMIT ?""",
+            (user_id, limit)
         )
 
     def get_project_by_id(self, project_id):
@@ -65,6 +78,7 @@ class ProjectManager:
                 f"UPDATE projects SET {', '.join(fields)} WHERE id = ?",
                 (*values, project_id)
             )
+            change_bus.publish(PROJECTS)
             return True, "Proyecto actualizado exitosamente"
         except Exception as e:
             return False, f"Error al actualizar proyecto: {str(e)}"
@@ -72,6 +86,7 @@ class ProjectManager:
     def delete_project(self, project_id):
         try:
             self.db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            change_bus.publish(PROJECTS)
             return True, "Proyecto eliminado exitosamente"
         except Exception as e:
             return False, f"Error al eliminar proyecto: {str(e)}"
@@ -102,6 +117,9 @@ class ProjectManager:
                     "UPDATE projects SET status = 'Completado', completed_at = ? WHERE id = ?",
                     (datetime.now().isoformat(), project_id)
                 )
+            change_bus.publish(PROJECTS, project['user_id'])
+            if project['filament_id'] and project['weight_grams']:
+                change_bus.publish(INVENTORY)
             return True, "Proyecto marcado como completado"
         except Exception as e:
             return False, f"Error: {str(e)}"
@@ -1,8 +1,3 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 from datetime import datetime
 import os
 
@@ -10,11 +5,22 @@ class ReportGenerator:
     """Generador de informes PDF para Formexa."""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        # reportlab se importa al generar el primer informe, no al abrir la app
+        self._styles = None
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            from reportlab.lib.styles import getSampleStyleSheet
+            self._styles = getSampleStyleSheet()
+            self._create_custom_styles()
+        return self._styles
     
     def _create_custom_styles(self):
         """Crea estilos personalizados para los informes."""
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle
+
         self.styles.add(ParagraphStyle(
             name='TitleCustom',
             parent=self.styles['Title'],
@@ -41,6 +47,11 @@ class ReportGenerator:
     
     def generate_cost_report(self, data, output_path):
         """Genera un informe detallado de costes de impresión."""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         elements = []
         
@@ -115,6 +126,11 @@ class ReportGenerator:
 
     def generate_quote_pdf(self, order, customer, project, output_path):
         """Genera un presupuesto/factura PDF para un pedido."""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         elements = []
 
@@ -194,6 +210,11 @@ class ReportGenerator:
 
     def generate_stats_report(self, user_name, stats, output_path):
         """Genera un informe de estadísticas de proyectos."""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         elements = []
         
@@ -0,0 +1,109 @@
+import re
+import sqlite3
+
+from src.database.db_manager import DBManager
+from src.utils.logger import logger
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchManager:
+    """
+    Búsqueda de texto completo sobre modelos, proyectos, clientes y pedidos
+    con los índices FTS5 de la migración 7 (mantenidos por triggers).
+
+    Cada palabra escrita se busca como prefijo ("pie" encuentra "pieza") y
+    todas deben aparecer. Los resultados se ordenan por bm25, dando más
+    peso al nombre que al resto de campos.
+    """
+
+    # tipo -> (tabla FTS, pesos bm25, SELECT con id/title/subtitle, columna de usuario)
+    TARGETS = {
+        'model': (
+            'models_fts', (10.0, 1.0),
+            "SELECT m.id, m.name AS title, m.description AS subtitle, {rank} AS rank "
+            "FROM models_fts JOIN models m ON m.id = models_fts.rowid",
+            'm.user_id',
+        ),
+        'project': (
+            'projects_fts', (10.0, 1.0),
+            "SELECT p.id, p.name AS title, p.status AS subtitle, {rank} AS rank "
+            "FROM projects_fts JOIN projects p ON p.id = projects_fts.rowid",
+            'p.user_id',
+        ),
+        'customer': (
+            'customers_fts', (10.0, 3.0, 3.0, 1.0, 1.0),
+            "SELECT c.id, c.name AS title, c.email AS subtitle, {rank} AS rank "
+            "FROM customers_fts JOIN customers c ON c.id = customers_fts.rowid",
+            'c.user_id',
+        ),
+        'order': (
+            'orders_fts', (5.0, 3.0, 1.0),
+            "SELECT o.id, 'Pedido #' || o.id AS title, "
+            "orders_fts.customer || ' · ' || o.status AS subtitle, {rank} AS rank "
+            "FROM orders_fts JOIN orders o ON o.id = orders_fts.rowid",
+            'o.user_id',
+        ),
+    }
+
+    def __init__(self, db_manager=None):
+        self.db = db_manager or DBManager()
+
+    @staticmethod
+    def build_match_query(text):
+        """
+        Convierte el texto del usuario en una consulta FTS5: cada palabra entre
+        comillas (sin sintaxis FTS) y con '*' para buscar por prefijo.
+        None si no hay nada que buscar.
+        """
+        tokens = _TOKEN_RE.findall(text or "")
+        if not tokens:
+            return None
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def _query(self, kind, match, user_id=None, limit=None, ranked=True):
+        fts, weights, select, user_column = self.TARGETS[kind]
+        # Calcular bm25 cuesta en proporción a las coincidencias: sin orden
+        # solo se recorre el índice
+        rank = f"bm25({fts}, {', '.join(str(w) for w in weights)})" if ranked else "0"
+        sql = select.format(rank=rank) + f" WHERE {fts} MATCH ?"
+        params = [match]
+        if user_id is not None:
+            sql += f" AND {user_column} = ?"
+            params.append(user_id)
+        if ranked:
+            sql += " ORDER BY rank"
+        sql += " LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        try:
+            return self.db.query(sql, tuple(params))
+        except sqlite3.Error as e:
+            logger.error(f"Error en la búsqueda ({kind}): {e}")
+            return []
+
+    def search_ids(self, kind, text, user_id=None, limit=None, ranked=True):
+        """
+        Ids de 'kind' que coinciden con el texto, del más al menos relevante
+        (con ranked=False, sin orden: para filtrar una lista ya cargada).
+        """
+        match = self.build_match_query(text)
+        if match is None:
+            return []
+        return [row['id'] for row in self._query(kind, match, user_id, limit, ranked)]
+
+    def search(self, text, user_id=None, kinds=None, limit=20):
+        """
+        Búsqueda global. Devuelve hasta 'limit' resultados
+        {'kind', 'id', 'title', 'subtitle', 'rank'} de todos los tipos,
+        ordenados por relevancia.
+        """
+        match = self.build_match_query(text)
+        if match is None:
+            return []
+        results = []
+        for kind in kinds or self.TARGETS:
+            for row in self._query(kind, match, user_id, limit):
+                row['kind'] = kind
+                results.append(row)
+        results.sort(key=lambda row: row['rank'])
+        return results[:limit]
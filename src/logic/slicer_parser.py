@@ -1,19 +1,190 @@
-import re
+import base64
+import glob
+import itertools
+import mmap
 import os
+import re
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.etree import ElementTree
 from src.utils.logger import logger
 
+GCODE_EXTENSIONS = ('.gcode', '.gco', '.bgcode', '.gcode.3mf')
+
+# G-code binario (libbgcode): cabecera "GCDE" + versión (u32) + tipo de checksum (u16)
+_BGCODE_MAGIC = b'GCDE'
+_BGCODE_BLOCK_GCODE = 1
+_BGCODE_BLOCK_THUMBNAIL = 5
+_BGCODE_METADATA_BLOCKS = (0, 2, 3, 4)  # archivo, slicer, impresora, impresión
+_BGCODE_COMPRESSION_NONE = 0
+_BGCODE_COMPRESSION_DEFLATE = 1
+_BGCODE_THUMBNAIL_PNG = 0
+_ZIP_MAGIC = b'PK\x03\x04'
+_PNG_MAGIC = b'\x89PNG'
+
+# PrusaSlicer/Orca/Cura (plugin): "; thumbnail begin 300x300 12345" ... "; thumbnail end"
+_GCODE_THUMBNAIL_RE = re.compile(
+    rb'; thumbnail(?:_PNG)? begin (?P<w>\d+)x(?P<h>\d+) \d+\r?\n(?P<data>.*?); thumbnail(?:_PNG)? end',
+    re.DOTALL
+)
+
+_LEADING_INT_RE = re.compile(r'\s*\d+')
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+_TIME_PART_RE = re.compile(r'(\d+)\s*([dhms])')
+_TIME_UNITS = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+
+
+def _parse_in_worker(file_path):
+    """
+    Punto de entrada de los procesos del pool (debe ser picklable). Los
+    errores se propagan para que el proceso principal no los guarde en caché.
+    """
+    return file_path, SlicerParser()._parse_uncached(file_path, False, True)
+
+
+class SlicerDialect:
+    """
+    Formato de comentarios de metadatos de un slicer.
+
+    'keys' asocia cada clave con la expresión (bytes) que la precede tras el
+    ';' del comentario; el valor es el resto de la línea. build() recibe
+    los valores encontrados como str y devuelve los datos o None si el
+    archivo no es de este slicer.
+    """
+    name = ''
+    keys = {}
+
+    def build(self, values, parser):
+        raise NotImplementedError
+
+
+class CuraDialect(SlicerDialect):
+    # ;TIME:6666
+    # ;Filament used: 1.23m (con varios extrusores: "1.23m, 0.45m")
+    # ;Filament weight: 3.45g (solo algunos plugins)
+    name = 'Cura'
+    keys = {
+        'time': rb'TIME:',
+        'length': rb'Filament used: ',
+        'weight': rb'Filament weight: ',
+    }
+
+    def build(self, values, parser):
+        data = {}
+        time_match = _LEADING_INT_RE.match(values.get('time', ''))
+        if time_match:
+            data['print_time_seconds'] = int(time_match.group(0))
+        lengths = parser._parse_number_list(values.get('length', ''))
+        if lengths:
+            data['filament_length_m'] = sum(lengths)
+            data['filament_lengths_m'] = lengths
+        weights = parser._parse_number_list(values.get('weight', ''))
+        if weights:
+            data['filament_weight_g'] = weights[0]
+        if 'print_time_seconds' not in data:
+            return None
+        data['slicer_name'] = self.name
+        return data
+
+
+class PrusaDialect(SlicerDialect):
+    # PrusaSlicer / SuperSlicer / OrcaSlicer / BambuStudio, al final del archivo:
+    # ; estimated printing time (normal mode) = 1h 23m 45s
+    # ; filament used [mm] = 1234.56, 78.9
+    # ; filament used [g] = 12.34, 0.5
+    name = 'PrusaSlicer/Derivados'
+    keys = {
+        'time': rb' estimated printing time(?: \(normal mode\))? = ',
+        'weight': rb' filament used \[g\] = ',
+        'length_mm': rb' filament used \[mm\] = ',
+    }
+
+    def build(self, values, parser):
+        if 'time' not in values:
+            return None
+        data = {
+            'print_time_seconds': parser._parse_time_str(values['time'].strip()),
+            'slicer_name': self.name,
+        }
+        weights = parser._parse_number_list(values.get('weight', ''))
+        if weights:
+            data['filament_weight_g'] = sum(weights)
+            data['filament_weights_g'] = weights
+        lengths = [mm / 1000.0 for mm in parser._parse_number_list(values.get('length_mm', ''))]
+        if lengths:
+            data['filament_length_m'] = sum(lengths)
+            data['filament_lengths_m'] = lengths
+        return data
+
+
 class SlicerParser:
     """
     Clase para analizar archivos G-code y extraer metadatos como tiempo de impresión y uso de filamento.
     Soporta Cura y PrusaSlicer (y derivados como OrcaSlicer/BambuStudio).
+
+    Si se le pasa una GcodeCache, los resultados se guardan en la base de datos
+    y solo se vuelve a analizar un archivo cuando cambia.
     """
-    
-    def parse_file(self, file_path):
+
+    # Tamaño de bloque del escaneo completo y solape entre bloques. El solape
+    # debe ser mayor que la línea de metadatos más larga para que una clave
+    # partida entre dos bloques se lea entera en el primero.
+    CHUNK_SIZE = 4 * 1024 * 1024
+    CHUNK_OVERLAP = 4096
+
+    # Registro de dialectos, por orden de prioridad. Todas sus claves se
+    # combinan en un único patrón compilado que se recorre una sola vez.
+    DIALECTS = [CuraDialect(), PrusaDialect()]
+    _matcher = None
+
+    @classmethod
+    def register_dialect(cls, dialect, index=None):
+        """
+        Añade un dialecto al registro (al final o en la posición 'index').
+        Nota: los procesos de parse_batch solo ven los dialectos registrados
+        al importar el módulo.
+        """
+        if index is None:
+            cls.DIALECTS.append(dialect)
+        else:
+            cls.DIALECTS.insert(index, dialect)
+        cls._matcher = None
+
+    @classmethod
+    def _get_matcher(cls):
+        """
+        Devuelve (patrón, {grupo: (dialecto, clave)}). Cada alternativa del
+        patrón captura el valor de una clave en un grupo con nombre propio.
+        El ';' literal inicial permite al motor de re saltar directamente
+        entre comentarios en lugar de probar cada posición.
+        """
+        if cls._matcher is None:
+            alternatives = []
+            groups = {}
+            for d_index, dialect in enumerate(cls.DIALECTS):
+                for key, prefix in dialect.keys.items():
+                    group = f"d{d_index}_{key}"
+                    groups[group] = (dialect, key)
+                    alternatives.append(prefix + b'(?P<' + group.encode() + rb'>[^\r\n]*)')
+            pattern = re.compile(rb';(?:' + b'|'.join(alternatives) + rb')')
+            cls._matcher = (pattern, groups)
+        return cls._matcher
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def parse_file(self, file_path, full_scan=False, simulate=True):
         """
         Analiza un archivo G-code y devuelve un diccionario con los metadatos encontrados.
         
         Args:
             file_path (str): Ruta al archivo G-code.
+            full_scan (bool): Si es True, recorre el archivo completo en bloques
+                              mapeados en memoria en lugar de leer solo cabecera y pie.
+            simulate (bool): Si no hay metadatos del slicer, estima tiempo y filamento
+                             interpretando los movimientos con GcodeSimulator.
             
         Returns:
             dict: Diccionario con claves 'print_time_seconds', 'filament_weight_g', 'filament_length_m', 'slicer_name'.
@@ -21,49 +192,253 @@ class SlicerParser:
         """
         if not os.path.exists(file_path):
             return None
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                # Leemos solo las primeras y últimas líneas para eficiencia, 
-                # ya que los metadatos suelen estar ahí.
-                # Pero algunos slicers ponen info al final.
-                # Para estar seguros leemos todo, pero los archivos pueden ser grandes.
-                # Estrategia: Leer primeras 500 líneas y últimas 500 líneas.
-                
-                content_head = ""
-                for _ in range(500):
-                    line = f.readline()
-                    if not line: break
-                    content_head += line
-                
-                # Ir al final para leer el footer
-                f.seek(0, 2) # End of file
-                file_size = f.tell()
-                
-                # Si el archivo es pequeño, ya lo leímos casi todo, pero si es grande leemos el final
-                content_tail = ""
-                if file_size > 10000: # Arbitrario
-                    seek_pos = max(0, file_size - 10000) # Leer últimos 10KB
-                    f.seek(seek_pos)
-                    content_tail = f.read()
-                
-                full_content_sample = content_head + "\n" + content_tail
-                
-                # Intentar detectar slicer y extraer datos
-                data = self._parse_cura(full_content_sample)
-                if not data:
-                    data = self._parse_prusa(full_content_sample)
-                
-                # Si tenemos longitud pero no peso, estimar peso (PLA 1.75mm por defecto)
-                if data and 'filament_length_m' in data and 'filament_weight_g' not in data:
-                    data['filament_weight_g'] = self._estimate_weight_from_length(data['filament_length_m'])
-                
+
+        options = self._cache_options(full_scan, simulate)
+        if self.cache:
+            found, data = self.cache.get(file_path, options)
+            if found:
                 return data
-                
+
+        try:
+            data = self._parse_uncached(file_path, full_scan, simulate)
         except Exception as e:
             logger.error(f"Error parsing G-code: {e}")
             return None
 
+        if self.cache:
+            self.cache.put(file_path, data, options)
+        return data
+
+    @staticmethod
+    def _cache_options(full_scan, simulate):
+        """Las opciones cambian el resultado, así que forman parte de la clave de caché."""
+        return f"full_scan={int(bool(full_scan))};simulate={int(bool(simulate))}"
+
+    def _parse_uncached(self, file_path, full_scan, simulate):
+        with open(file_path, 'rb') as f:
+            magic = f.read(4)
+        if magic == _BGCODE_MAGIC:
+            return self._parse_bgcode(file_path)
+        if magic == _ZIP_MAGIC:
+            return self._parse_3mf(file_path)
+
+        if full_scan:
+            data = self._build_data(self._scan_metadata(file_path))
+        else:
+            data = self._parse_sample(self._read_head_tail(file_path))
+            if not data:
+                # Algunos slicers escriben los metadatos en mitad del archivo
+                # o tras bloques de miniaturas grandes: escaneo completo.
+                data = self._build_data(self._scan_metadata(file_path))
+        if not data and simulate:
+            # Sin comentarios del slicer: reconstruir la trayectoria
+            data = self._simulate(file_path)
+
+        # Si tenemos longitud pero no peso, estimar peso (PLA 1.75mm por defecto)
+        if data and 'filament_length_m' in data and 'filament_weight_g' not in data:
+            data['filament_weight_g'] = self._estimate_weight_from_length(data['filament_length_m'])
+            if 'filament_lengths_m' in data:
+                data['filament_weights_g'] = [
+                    self._estimate_weight_from_length(length)
+                    for length in data['filament_lengths_m']
+                ]
+
+        return data
+
+    @staticmethod
+    def collect_gcode_files(source):
+        """
+        Resuelve una carpeta, un patrón glob o una lista de rutas en la lista
+        ordenada de archivos G-code que contiene.
+        """
+        if isinstance(source, (list, tuple)):
+            candidates = source
+        elif os.path.isdir(source):
+            candidates = [entry.path for entry in os.scandir(source) if entry.is_file()]
+        else:
+            candidates = glob.glob(source)
+        return sorted(
+            path for path in candidates
+            if path.lower().endswith(GCODE_EXTENSIONS) and os.path.isfile(path)
+        )
+
+    def parse_batch(self, source, max_workers=None, use_cache=True):
+        """
+        Analiza en paralelo (un proceso por núcleo) todos los G-code de una
+        carpeta o patrón glob.
+
+        Es un generador: devuelve tuplas (ruta, datos) a medida que cada archivo
+        termina, no en el orden de entrada. 'datos' es None si el archivo no se
+        pudo analizar. Con use_cache=False no se toca la caché: la usa quien
+        llama desde su hilo (split_cached y cache_batch_result).
+        """
+        files = self.collect_gcode_files(source)
+        if use_cache:
+            # Los archivos ya analizados se devuelven sin pasar por el pool
+            cached, files = self.split_cached(files)
+            yield from cached
+        if not files:
+            return
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_parse_in_worker, path): path for path in files}
+            for future in as_completed(futures):
+                try:
+                    path, data = future.result()
+                except Exception as e:
+                    logger.error(f"Error parsing G-code {futures[future]}: {e}")
+                    yield futures[future], None
+                    continue
+                if use_cache:
+                    self.cache_batch_result(path, data)
+                yield path, data
+
+    def split_cached(self, files):
+        """
+        Separa los archivos de un lote que ya están en la caché. Devuelve
+        ([(ruta, datos)], [rutas pendientes de analizar]).
+        """
+        if not self.cache:
+            return [], list(files)
+        options = self._cache_options(False, True)
+        cached, pending = [], []
+        for path in files:
+            found, data = self.cache.get(path, options)
+            if found:
+                cached.append((path, data))
+            else:
+                pending.append(path)
+        return cached, pending
+
+    def cache_batch_result(self, path, data):
+        """Guarda en la caché el resultado de un archivo analizado en lote."""
+        if self.cache:
+            self.cache.put(path, data, self._cache_options(False, True))
+
+    @staticmethod
+    def summarize_batch(results):
+        """
+        Agrega los resultados de parse_batch.
+
+        Returns:
+            dict: 'files', 'parsed', 'failed' (lista de rutas), totales de
+                  'print_time_seconds', 'filament_weight_g' y 'filament_length_m',
+                  y 'per_filament': {índice: {'filament_weight_g', 'filament_length_m'}}.
+        """
+        summary = {
+            'files': 0,
+            'parsed': 0,
+            'failed': [],
+            'print_time_seconds': 0,
+            'filament_weight_g': 0.0,
+            'filament_length_m': 0.0,
+            'per_filament': {},
+        }
+        for path, data in results:
+            summary['files'] += 1
+            if not data:
+                summary['failed'].append(path)
+                continue
+            summary['parsed'] += 1
+            summary['print_time_seconds'] += data.get('print_time_seconds', 0)
+            summary['filament_weight_g'] += data.get('filament_weight_g', 0.0)
+            summary['filament_length_m'] += data.get('filament_length_m', 0.0)
+
+            weights = data.get('filament_weights_g') or [data.get('filament_weight_g', 0.0)]
+            lengths = data.get('filament_lengths_m') or [data.get('filament_length_m', 0.0)]
+            for index in range(max(len(weights), len(lengths))):
+                totals = summary['per_filament'].setdefault(
+                    index, {'filament_weight_g': 0.0, 'filament_length_m': 0.0}
+                )
+                if index < len(weights):
+                    totals['filament_weight_g'] += weights[index]
+                if index < len(lengths):
+                    totals['filament_length_m'] += lengths[index]
+        return summary
+
+    def _simulate(self, file_path):
+        """Recurre a GcodeSimulator (requiere NumPy, que se importa bajo demanda)."""
+        try:
+            from src.logic.gcode_simulator import GcodeSimulator
+        except ImportError as e:
+            logger.warning(f"Simulación de G-code no disponible: {e}")
+            return None
+        return GcodeSimulator().simulate_file(file_path)
+
+    def _parse_sample(self, content):
+        """Extrae los metadatos de un fragmento de texto (str o bytes) en una pasada."""
+        if not content:
+            return None
+        if isinstance(content, str):
+            content = content.encode('utf-8', errors='ignore')
+        found = {}
+        pattern, _ = self._get_matcher()
+        for match in pattern.finditer(content):
+            found.setdefault(match.lastgroup, match.group(match.lastgroup))
+        return self._build_data(found)
+
+    def _build_data(self, found):
+        """Pasa los valores encontrados a cada dialecto por orden de prioridad."""
+        if not found:
+            return None
+        _, groups = self._get_matcher()
+        per_dialect = {}
+        for group, raw in found.items():
+            dialect, key = groups[group]
+            per_dialect.setdefault(id(dialect), {})[key] = raw.decode('utf-8', errors='ignore')
+        for dialect in self.DIALECTS:
+            values = per_dialect.get(id(dialect))
+            if values:
+                data = dialect.build(values, self)
+                if data:
+                    return data
+        return None
+
+    def _read_head_tail(self, file_path):
+        """Devuelve (en bytes) las primeras 500 líneas y los últimos 10 KB del archivo."""
+        with open(file_path, 'rb') as f:
+            content_head = b''.join(itertools.islice(f, 500))
+
+            # Ir al final para leer el footer
+            f.seek(0, 2) # End of file
+            file_size = f.tell()
+
+            # Si el archivo es pequeño, ya lo leímos casi todo, pero si es grande leemos el final
+            content_tail = b""
+            if file_size > 10000: # Arbitrario
+                seek_pos = max(0, file_size - 10000) # Leer últimos 10KB
+                f.seek(seek_pos)
+                content_tail = f.read()
+
+        return content_head + b"\n" + content_tail
+
+    def _scan_metadata(self, file_path):
+        """
+        Recorre el archivo completo con mmap en bloques de CHUNK_SIZE y devuelve
+        {grupo: valor} con la primera aparición de cada clave.
+
+        La memoria usada es constante: el sistema operativo pagina el mmap y
+        solo se conservan los valores encontrados.
+        """
+        found = {}
+        pattern, groups = self._get_matcher()
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size == 0:
+                return found
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, file_size, self.CHUNK_SIZE):
+                    chunk_end = start + self.CHUNK_SIZE
+                    endpos = min(file_size, chunk_end + self.CHUNK_OVERLAP)
+                    for match in pattern.finditer(mm, start, endpos):
+                        # Las coincidencias que empiezan en el solape pertenecen
+                        # al bloque siguiente.
+                        if match.start() >= chunk_end:
+                            break
+                        found.setdefault(match.lastgroup, match.group(match.lastgroup))
+                    if len(found) == len(groups):
+                        break
+        return found
+
     def _estimate_weight_from_length(self, length_m, diameter_mm=1.75, density_g_cm3=1.24):
         """
         Estima el peso en gramos basado en la longitud en metros.
@@ -75,93 +450,206 @@ class SlicerParser:
         volume_cm3 = math.pi * (radius_cm ** 2) * length_cm
         return volume_cm3 * density_g_cm3
 
-    def _parse_cura(self, content):
-        """Analiza formato de Cura."""
-        # Cura suele poner:
-        # ;TIME:6666
-        # ;Filament used: 1.23m
-        # ;Filament weight: 3.45g (A veces no está explícito en versiones viejas, pero sí la longitud)
-        
-        data = {}
-        
-        # Tiempo (segundos)
-        time_match = re.search(r';TIME:(\d+)', content)
-        if time_match:
-            data['print_time_seconds'] = int(time_match.group(1))
-            data['slicer_name'] = 'Cura'
-        
-        # Longitud filamento (metros)
-        len_match = re.search(r';Filament used: ([\d.]+)m', content)
-        if len_match:
-            data['filament_length_m'] = float(len_match.group(1))
-            data['slicer_name'] = 'Cura'
-
-        # Peso filamento (gramos) - A veces Cura pone ";Filament weight = 12.34g" o similar en plugins
-        # Pero estándar suele ser longitud. Podemos estimar peso si tenemos densidad (PLA ~1.24g/cm3) y diámetro (1.75mm).
-        # Por ahora extraemos si existe explícito.
-        weight_match = re.search(r';Filament weight: ([\d.]+)g', content)
-        if weight_match:
-            data['filament_weight_g'] = float(weight_match.group(1))
-        
-        if 'print_time_seconds' in data:
-            return data
-        return None
+    def extract_thumbnail(self, file_path):
+        """
+        Devuelve la miniatura PNG más grande que el slicer incrustó en el
+        archivo (bytes), o None. Soporta los comentarios '; thumbnail begin'
+        de G-code de texto, los bloques de miniatura de .bgcode y las imágenes
+        de Metadata/ en .gcode.3mf.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                magic = f.read(4)
+            if magic == _BGCODE_MAGIC:
+                thumbnails = [
+                    (width * height, payload)
+                    for _, params, payload in self._iter_bgcode_blocks(file_path, (_BGCODE_BLOCK_THUMBNAIL,))
+                    for fmt, width, height in [struct.unpack('<HHH', params)]
+                    if fmt == _BGCODE_THUMBNAIL_PNG
+                ]
+            elif magic == _ZIP_MAGIC:
+                thumbnails = self._zip_thumbnails(file_path)
+            else:
+                thumbnails = self._text_thumbnails(file_path)
+        except Exception as e:
+            logger.warning(f"No se pudo leer la miniatura de {file_path}: {e}")
+            return None
+        return max(thumbnails, key=lambda t: t[0])[1] if thumbnails else None
 
-    def _parse_prusa(self, content):
-        """Analiza formato de PrusaSlicer / SuperSlicer / OrcaSlicer / BambuStudio."""
-        # PrusaSlicer pone al final:
-        # ; estimated printing time = 1h 23m 45s
-        # ; filament used [mm] = 1234.56
-        # ; filament used [cm3] = 1.23
-        # ; filament used [g] = 12.34
-        # ; total filament cost = 1.23
-        
-        data = {}
-        
-        # Tiempo
-        # Formato: 1h 23m 45s o 23m 45s o 45s
-        time_match = re.search(r'; estimated printing time = (.*)', content)
-        if time_match:
-            time_str = time_match.group(1).strip()
-            data['print_time_seconds'] = self._parse_time_str(time_str)
-            data['slicer_name'] = 'PrusaSlicer/Derivados'
-            
-        # Peso
-        weight_match = re.search(r'; filament used \[g\] = ([\d.]+)', content)
-        if weight_match:
-            data['filament_weight_g'] = float(weight_match.group(1))
-            
-        # Longitud (mm) -> convertir a m
-        len_match = re.search(r'; filament used \[mm\] = ([\d.]+)', content)
-        if len_match:
-            data['filament_length_m'] = float(len_match.group(1)) / 1000.0
-            
-        if 'print_time_seconds' in data:
-            return data
+    @staticmethod
+    def _text_thumbnails(file_path):
+        """Miniaturas PNG en base64 entre '; thumbnail begin WxH N' y '; thumbnail end'."""
+        thumbnails = []
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return thumbnails
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in _GCODE_THUMBNAIL_RE.finditer(mm):
+                    encoded = b''.join(
+                        line.lstrip(b'; ').strip() for line in match.group('data').splitlines()
+                    )
+                    try:
+                        png = base64.b64decode(encoded)
+                    except ValueError:
+                        continue
+                    if png.startswith(_PNG_MAGIC):
+                        thumbnails.append((int(match.group('w')) * int(match.group('h')), png))
+        return thumbnails
+
+    @staticmethod
+    def _zip_thumbnails(file_path):
+        """Imágenes PNG de Metadata/ (placas y miniaturas) dentro de un 3MF."""
+        thumbnails = []
+        with zipfile.ZipFile(file_path) as zf:
+            for info in zf.infolist():
+                name = info.filename.lower()
+                if name.endswith('.png') and ('metadata/' in name or 'thumbnail' in name):
+                    thumbnails.append((info.file_size, zf.read(info)))
+        return thumbnails
+
+    @staticmethod
+    def _iter_bgcode_blocks(file_path, block_types):
+        """
+        Recorre los bloques de un G-code binario (.bgcode) de PrusaSlicer hasta
+        el primer bloque de G-code y devuelve (tipo, parámetros, datos) de los
+        tipos pedidos, ya descomprimidos. El resto se salta con seek.
+        """
+        with open(file_path, 'rb') as f:
+            header = f.read(10)
+            if len(header) < 10 or header[:4] != _BGCODE_MAGIC:
+                return
+            _, checksum_type = struct.unpack('<IH', header[4:])
+            checksum_size = 4 if checksum_type == 1 else 0
+
+            while True:
+                block = f.read(8)
+                if len(block) < 8:
+                    break
+                block_type, compression, uncompressed_size = struct.unpack('<HHI', block)
+                data_size = uncompressed_size
+                if compression != _BGCODE_COMPRESSION_NONE:
+                    data_size = struct.unpack('<I', f.read(4))[0]
+                if block_type == _BGCODE_BLOCK_GCODE:
+                    # Metadatos y miniaturas van siempre antes del primer bloque de G-code
+                    break
+                params_size = 6 if block_type == _BGCODE_BLOCK_THUMBNAIL else 2
+                if block_type not in block_types:
+                    f.seek(params_size + data_size + checksum_size, os.SEEK_CUR)
+                    continue
+
+                params = f.read(params_size)
+                payload = f.read(data_size)
+                f.seek(checksum_size, os.SEEK_CUR)
+                if compression == _BGCODE_COMPRESSION_DEFLATE:
+                    payload = zlib.decompress(payload)
+                elif compression != _BGCODE_COMPRESSION_NONE:
+                    continue  # heatshrink: no se usa para metadatos ni miniaturas en la práctica
+                yield block_type, params, payload
+
+    def _parse_bgcode(self, file_path):
+        """
+        Lee los bloques de metadatos de un G-code binario (.bgcode) de
+        PrusaSlicer. Los bloques de G-code y miniaturas se saltan con seek,
+        sin leerlos ni descomprimirlos.
+        """
+        metadata = {}
+        for _, _, payload in self._iter_bgcode_blocks(file_path, _BGCODE_METADATA_BLOCKS):
+            # Parámetros: codificación (0 = INI)
+            for line in payload.decode('utf-8', errors='ignore').splitlines():
+                key, sep, value = line.partition('=')
+                if sep:
+                    metadata.setdefault(key.strip(), value.strip())
+
+        time_str = (metadata.get('estimated printing time (normal mode)')
+                    or metadata.get('estimated printing time'))
+        if not time_str:
+            return None
+        data = {
+            'print_time_seconds': self._parse_time_str(time_str),
+            'slicer_name': metadata.get('Producer', 'PrusaSlicer (bgcode)'),
+        }
+        weights = self._parse_number_list(metadata.get('filament used [g]')
+                                          or metadata.get('total filament used [g]', ''))
+        if weights:
+            data['filament_weight_g'] = sum(weights)
+            data['filament_weights_g'] = weights
+        lengths = [mm / 1000.0 for mm in self._parse_number_list(metadata.get('filament used [mm]', ''))]
+        if lengths:
+            data['filament_length_m'] = sum(lengths)
+            data['filament_lengths_m'] = lengths
+        if metadata.get('filament_type'):
+            data['filament_types'] = [t.strip() for t in metadata['filament_type'].split(';')]
+        return data
+
+    def _parse_3mf(self, file_path):
+        """
+        Lee los metadatos de un proyecto 3MF laminado (.gcode.3mf de Bambu
+        Studio / OrcaSlicer) desde Metadata/slice_info.config. Solo se abren
+        los archivos de configuración; el G-code y las mallas del zip no se
+        descomprimen.
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            names = archive.namelist()
+            if 'Metadata/slice_info.config' in names:
+                return self._parse_slice_info(archive.read('Metadata/slice_info.config'))
+            # Otros slicers: comentarios estilo PrusaSlicer dentro de Metadata/*.config
+            for name in names:
+                if name.startswith('Metadata/') and name.endswith('.config'):
+                    data = self._parse_sample(archive.read(name).decode('utf-8', errors='ignore'))
+                    if data:
+                        return data
         return None
 
+    def _parse_slice_info(self, xml_bytes):
+        """Convierte slice_info.config en totales y un resumen por placa."""
+        root = ElementTree.fromstring(xml_bytes)
+        plates = []
+        per_filament = {}
+        for plate in root.iter('plate'):
+            meta = {m.get('key'): m.get('value') for m in plate.findall('metadata')}
+            filaments = []
+            for filament in plate.findall('filament'):
+                info = {
+                    'id': int(filament.get('id', len(filaments) + 1)),
+                    'type': filament.get('type', ''),
+                    'color': filament.get('color', ''),
+                    'filament_weight_g': float(filament.get('used_g') or 0),
+                    'filament_length_m': float(filament.get('used_m') or 0),
+                }
+                filaments.append(info)
+                totals = per_filament.setdefault(info['id'], [0.0, 0.0])
+                totals[0] += info['filament_weight_g']
+                totals[1] += info['filament_length_m']
+            plates.append({
+                'index': int(meta.get('index') or len(plates) + 1),
+                'print_time_seconds': int(float(meta.get('prediction') or 0)),
+                'filament_weight_g': float(meta.get('weight') or 0),
+                'filaments': filaments,
+            })
+        if not plates:
+            return None
+
+        data = {
+            'print_time_seconds': sum(p['print_time_seconds'] for p in plates),
+            'filament_weight_g': sum(p['filament_weight_g'] for p in plates),
+            'slicer_name': 'Bambu Studio/OrcaSlicer (3MF)',
+            'plates': plates,
+        }
+        if per_filament:
+            ids = sorted(per_filament)
+            data['filament_weights_g'] = [per_filament[i][0] for i in ids]
+            data['filament_lengths_m'] = [per_filament[i][1] for i in ids]
+            data['filament_length_m'] = sum(data['filament_lengths_m'])
+        return data
+
+    @staticmethod
+    def _parse_number_list(text):
+        """Convierte '12.34, 5.6' (con o sin unidades) en [12.34, 5.6]."""
+        return [float(n) for n in _NUMBER_RE.findall(text)]
+
     def _parse_time_str(self, time_str):
-        """Convierte string de tiempo tipo '1h 23m 45s' a segundos."""
-        total_seconds = 0
-        
-        # Días
-        d_match = re.search(r'(\d+)d', time_str)
-        if d_match:
-            total_seconds += int(d_match.group(1)) * 86400
-            
-        # Horas
-        h_match = re.search(r'(\d+)h', time_str)
-        if h_match:
-            total_seconds += int(h_match.group(1)) * 3600
-            
-        # Minutos
-        m_match = re.search(r'(\d+)m', time_str)
-        if m_match:
-            total_seconds += int(m_match.group(1)) * 60
-            
-        # Segundos
-        s_match = re.search(r'(\d+)s', time_str)
-        if s_match:
-            total_seconds += int(s_match.group(1))
-            
-        return total_seconds
+        """Convierte string de tiempo tipo '1d 1h 23m 45s' a segundos."""
+        seen = {}
+        for amount, unit in _TIME_PART_RE.findall(time_str):
+            seen.setdefault(unit, int(amount))
+        return sum(amount * _TIME_UNITS[unit] for unit, amount in seen.items())
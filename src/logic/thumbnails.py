@@ -0,0 +1,164 @@
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.database.db_manager import DBManager
+from src.utils.logger import logger
+
+THUMBNAIL_SIZE = 128
+MESH_EXTENSIONS = ('.stl', '.3mf', '.obj')
+THUMBNAIL_MAX_FACES = 4000
+
+
+def content_hash(file_path, chunk_size=1024 * 1024):
+    """Hash del contenido completo del archivo, leído por bloques."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_mesh_png(file_path, size=THUMBNAIL_SIZE):
+    """
+    Renderiza una vista isométrica del modelo a PNG (bytes) con el backend
+    Agg de matplotlib, sin pyplot ni Qt: se puede usar en cualquier hilo o
+    proceso.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from mpl_toolkits.mplot3d import art3d
+    from src.logic.mesh_lod import load_mesh, simplify_mesh
+
+    vertices, faces = simplify_mesh(load_mesh(file_path), THUMBNAIL_MAX_FACES)
+    tris = vertices[faces]
+
+    # Sombreado plano: luz desde la cámara aproximada
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    light = np.array([0.5, -0.5, 0.7]) / np.linalg.norm([0.5, -0.5, 0.7])
+    shade = 0.35 + 0.65 * np.abs(normals @ light / lengths)
+    colors = np.column_stack([shade * 0.81, shade * 0.81, shade * 0.81, np.ones_like(shade)])
+
+    figure = Figure(figsize=(size / 100, size / 100), dpi=100)
+    FigureCanvasAgg(figure)
+    ax = figure.add_axes([0, 0, 1, 1], projection='3d')
+    ax.set_axis_off()
+    collection = art3d.Poly3DCollection(tris, facecolors=colors, edgecolors='none')
+    ax.add_collection3d(collection)
+
+    vmin, vmax = vertices.min(axis=0), vertices.max(axis=0)
+    center = (vmin + vmax) / 2
+    radius = max(float((vmax - vmin).max()) / 2, 1e-6)
+    ax.set_xlim(center[0] - radius, center[0] + radius)
+    ax.set_ylim(center[1] - radius, center[1] + radius)
+    ax.set_zlim(center[2] - radius, center[2] + radius)
+    ax.view_init(elev=25, azim=45)
+    ax.set_box_aspect((1, 1, 1), zoom=1.5)
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', transparent=True)
+    return buffer.getvalue()
+
+
+def _embedded_3mf_png(file_path):
+    """Miniatura que los programas CAD/slicers guardan dentro del 3MF."""
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            pngs = [info for info in zf.infolist()
+                    if info.filename.lower().endswith('.png') and 'thumbnail' in info.filename.lower()]
+            if pngs:
+                return zf.read(max(pngs, key=lambda info: info.file_size))
+    except zipfile.BadZipFile:
+        pass
+    return None
+
+
+def thumbnail_png(file_path, size=THUMBNAIL_SIZE):
+    """Obtiene la miniatura de un modelo o G-code como PNG (bytes), o None."""
+    from src.logic.slicer_parser import GCODE_EXTENSIONS, SlicerParser
+
+    lower = file_path.lower()
+    if lower.endswith(GCODE_EXTENSIONS):
+        return SlicerParser().extract_thumbnail(file_path)
+    if lower.endswith('.3mf'):
+        png = _embedded_3mf_png(file_path)
+        if png:
+            return png
+    if lower.endswith(MESH_EXTENSIONS):
+        return render_mesh_png(file_path, size)
+    return None
+
+
+def _generate_in_worker(file_path, cache_dir, size):
+    """Punto de entrada de los procesos de ThumbnailCache.generate_batch."""
+    return file_path, ThumbnailCache(cache_dir, size).generate(file_path)
+
+
+class ThumbnailCache:
+    """
+    Miniaturas PNG en disco indexadas por el hash del contenido del archivo
+    (thumbnails/ab/abcdef..._128.png): un mismo modelo importado dos veces o
+    movido de carpeta reutiliza la miniatura.
+    """
+
+    def __init__(self, cache_dir=None, size=THUMBNAIL_SIZE):
+        if cache_dir is None:
+            cache_dir = os.path.join(DBManager._get_user_data_dir(), 'thumbnails')
+        self.cache_dir = cache_dir
+        self.size = size
+
+    def path_for_hash(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}_{self.size}.png")
+
+    def generate(self, file_path):
+        """
+        Devuelve la ruta de la miniatura del archivo, generándola si no está en
+        caché. None si el archivo no tiene miniatura posible. Lee y procesa
+        el archivo completo: no llamar desde el hilo de la interfaz.
+        """
+        try:
+            path = self.path_for_hash(content_hash(file_path))
+            if os.path.exists(path):
+                return path
+            png = thumbnail_png(file_path, self.size)
+            if not png:
+                return None
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            logger.warning(f"No se pudo generar la miniatura de {file_path}: {e}")
+            return None
+
+    def generate_batch(self, file_paths, max_workers=None):
+        """
+        Genera las miniaturas en paralelo (un proceso por núcleo). Es un
+        generador de (ruta, miniatura) en orden de finalización.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                pool.submit(_generate_in_worker, path, self.cache_dir, self.size): path
+                for path in file_paths
+            }
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Error generando miniatura de {futures[future]}: {e}")
+                    yield futures[future], None
+        finally:
+            # Si el consumidor deja de iterar, no se esperan las tareas pendientes
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 import os
 
@@ -5,6 +6,14 @@ __version__ = "1.0.0"
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Primero: el temporizador de arranque cuenta desde aquí y, si se pidió la
+# traza (--trace-startup o FORMEXA_TRACE_STARTUP), mide también los imports
+from src.utils.startup_timer import QUIT_FLAG, startup_timer, trace_request
+TRACE_OUTPUT = trace_request()
+if TRACE_OUTPUT is not None:
+    startup_timer.start_trace()
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from src.ui.main_window import MainWindow
 from src.logic.auth_manager import AuthManager
@@ -43,19 +52,53 @@ def _show_db_warning():
     msg.exec_()
 
 
+class FirstPaintWatcher(QObject):
+    """Llama a callback (una vez) tras el primer evento Paint del widget."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Después de que termine el pintado en curso
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
 def main():
+    startup_timer.checkpoint("imports")
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    startup_timer.checkpoint("QApplication")
 
     db_ok = bootstrap_db()
+    startup_timer.checkpoint("base de datos y migraciones")
     if not db_ok:
         _show_db_warning()
 
     auth = AuthManager()
+    startup_timer.checkpoint("AuthManager")
     win = MainWindow(auth)
+    startup_timer.checkpoint("MainWindow")
     win.show()
+    startup_timer.checkpoint("show")
+
+    # El informe sale cuando el bucle de eventos ha pintado la primera ventana
+    def first_frame():
+        startup_timer.checkpoint("primer frame")
+        phases = startup_timer.report()
+        if TRACE_OUTPUT is not None:
+            startup_timer.finish_trace(phases, TRACE_OUTPUT)
+        if QUIT_FLAG in sys.argv:
+            app.quit()
+    FirstPaintWatcher(win, first_frame)
     sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable congelado (PyInstaller)
+    multiprocessing.freeze_support()
     main()
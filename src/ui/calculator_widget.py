@@ -2,18 +2,54 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QFormLayout, QGroupBox, QSpinBox,
                              QGridLayout, QFrame, QFileDialog, QMessageBox)
 from src.ui.utils import MessageBoxHelper
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from src.database.db_manager import DBManager
 from src.logic.cost_calculator import CostCalculator
 from src.logic.report_generator import ReportGenerator
+from src.logic.gcode_cache import GcodeCache
 from src.logic.slicer_parser import SlicerParser
 
+
+class GcodeBatchWorker(QThread):
+    """
+    Analiza una lista de G-code en segundo plano con el pool de procesos. La
+    caché (en la BD) la consulta y actualiza el widget en el hilo de la
+    interfaz: el worker recibe los resultados ya cacheados y solo analiza
+    los archivos pendientes.
+    """
+    file_parsed = pyqtSignal(str, object)   # ruta, datos (o None)
+    batch_finished = pyqtSignal(dict)       # resumen agregado
+
+    def __init__(self, parser, files, cached=(), parent=None, db_manager=None):
+        super().__init__(parent)
+        self.parser = parser
+        self.files = list(files)
+        self.cached = list(cached)   # [(ruta, datos)]
+        self.db = db_manager or DBManager()
+
+    def run(self):
+        try:
+            results = []
+            for path, data in self.cached:
+                results.append((path, data))
+                self.file_parsed.emit(path, data)
+            if self.files:
+                for path, data in self.parser.parse_batch(self.files, use_cache=False):
+                    results.append((path, data))
+                    self.file_parsed.emit(path, data)
+            self.batch_finished.emit(self.parser.summarize_batch(results))
+        finally:
+            # Por si algo en el hilo llegó a abrir conexión del pool
+            self.db.release_thread_connections()
+
 class CalculatorWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.calculator = CostCalculator()
         self.report_generator = ReportGenerator()
-        self.slicer_parser = SlicerParser()
+        self.slicer_parser = SlicerParser(cache=GcodeCache())
         self.last_calculation = None
+        self.batch_worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -72,7 +108,17 @@ class CalculatorWidget(QWidget):
             }
         """)
         self.btn_import_gcode.clicked.connect(self.import_gcode)
-        pieza_layout.addWidget(self.btn_import_gcode, 0, 0, 1, 3) # Ocupa todo el ancho arriba
+
+        # Botón Importar carpeta (lote de G-code)
+        self.btn_import_batch = QPushButton("Importar carpeta de G-code")
+        self.btn_import_batch.setCursor(Qt.PointingHandCursor)
+        self.btn_import_batch.setStyleSheet(self.btn_import_gcode.styleSheet())
+        self.btn_import_batch.clicked.connect(self.import_gcode_folder)
+
+        import_box = QHBoxLayout()
+        import_box.addWidget(self.btn_import_gcode)
+        import_box.addWidget(self.btn_import_batch)
+        pieza_layout.addLayout(import_box, 0, 0, 1, 3) # Ocupa todo el ancho arriba
 
         # Tiempo (H/Min)
         time_widget = QWidget()
@@ -237,7 +283,7 @@ class CalculatorWidget(QWidget):
     def import_gcode(self):
         """Abre diálogo para importar G-code y rellena los campos."""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Importar G-code", "", "G-code Files (*.gcode *.gco);;All Files (*)"
+            self, "Importar G-code", "", "G-code Files (*.gcode *.gco *.bgcode *.3mf);;All Files (*)"
         )
         
         if not file_path:
@@ -268,6 +314,69 @@ class CalculatorWidget(QWidget):
                                  f"Tiempo: {int(hours)}h {int(minutes)}m\n"
                                  f"Peso: {data.get('filament_weight_g', 0):.2f}g")
 
+    def import_gcode_folder(self):
+        """Importa todos los G-code de una carpeta y rellena los campos con los totales."""
+        if self.batch_worker and self.batch_worker.isRunning():
+            return
+
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta de G-code")
+        if not folder:
+            return
+
+        files = self.slicer_parser.collect_gcode_files(folder)
+        self._batch_total = len(files)
+        if not self._batch_total:
+            MessageBoxHelper.show_warning(self, "Error de Importación",
+                                        "La carpeta no contiene archivos .gcode, .gco, .bgcode ni .gcode.3mf.")
+            return
+
+        self._batch_done = 0
+        self.btn_import_batch.setEnabled(False)
+        self.btn_import_batch.setText(f"Analizando... 0/{self._batch_total}")
+
+        cached, pending = self.slicer_parser.split_cached(files)
+        self._batch_pending = set(pending)
+        self.batch_worker = GcodeBatchWorker(self.slicer_parser, pending, cached, self,
+                                            db_manager=self.slicer_parser.cache.db)
+        self.batch_worker.file_parsed.connect(self._on_batch_file_parsed)
+        self.batch_worker.batch_finished.connect(self._on_batch_finished)
+        self.batch_worker.start()
+
+    def _on_batch_file_parsed(self, path, data):
+        if path in self._batch_pending:
+            self.slicer_parser.cache_batch_result(path, data)
+        self._batch_done += 1
+        self.btn_import_batch.setText(f"Analizando... {self._batch_done}/{self._batch_total}")
+
+    def _on_batch_finished(self, summary):
+        self.btn_import_batch.setEnabled(True)
+        self.btn_import_batch.setText("Importar carpeta de G-code")
+
+        if not summary['parsed']:
+            MessageBoxHelper.show_warning(self, "Error de Importación",
+                                        "No se encontraron metadatos válidos en ningún archivo de la carpeta.")
+            return
+
+        total_seconds = summary['print_time_seconds']
+        hours = total_seconds // 3600
+        minutes = (total_seconds % 3600) // 60
+        self.input_hours.setValue(min(int(hours), self.input_hours.maximum()))
+        self.input_minutes.setValue(int(minutes))
+        self.input_weight.setText(f"{summary['filament_weight_g']:.2f}")
+
+        lines = [
+            f"Archivos analizados: {summary['parsed']}/{summary['files']}",
+            f"Tiempo total: {int(hours)}h {int(minutes)}m",
+            f"Peso total: {summary['filament_weight_g']:.2f}g "
+            f"({summary['filament_length_m']:.2f}m)",
+        ]
+        for index, totals in sorted(summary['per_filament'].items()):
+            lines.append(f"  Filamento {index + 1}: {totals['filament_weight_g']:.2f}g "
+                         f"/ {totals['filament_length_m']:.2f}m")
+        if summary['failed']:
+            lines.append(f"Sin metadatos: {len(summary['failed'])} archivo(s)")
+        MessageBoxHelper.show_info(self, "Importación Exitosa", "\n".join(lines))
+
     def calculate(self):
         try:
             # Obtener valores del formulario
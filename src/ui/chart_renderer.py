@@ -0,0 +1,219 @@
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+from src.utils.logger import logger
+
+# Figuras Agg reutilizadas por hilo y función de dibujo
+_figures = threading.local()
+
+
+def render_chart(draw, data, width, height, dpr=1.0):
+    """
+    Dibuja draw(figure, data) con Agg y devuelve un QImage de width x height
+    píxeles lógicos. La figura de cada (hilo, draw) se reutiliza entre
+    renderizados; solo se cambia de tamaño y se limpia.
+
+    matplotlib se importa aquí: la primera vez lo carga el hilo de render y
+    no el arranque de la aplicación.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figures = getattr(_figures, 'by_draw', None)
+    if figures is None:
+        figures = _figures.by_draw = {}
+    figure = figures.get(draw)
+    if figure is None:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        figures[draw] = figure
+
+    dpi = 100 * dpr
+    figure.set_dpi(dpi)
+    figure.set_size_inches(width * dpr / dpi, height * dpr / dpi)
+    draw(figure, data)
+    figure.canvas.draw()
+
+    buffer = figure.canvas.buffer_rgba()
+    rows, cols = buffer.shape[:2]
+    # copy(): el QImage no debe apuntar al buffer de la figura reutilizada
+    image = QImage(buffer, cols, rows, cols * 4, QImage.Format_RGBA8888).copy()
+    image.setDevicePixelRatio(dpr)
+    return image
+
+
+class ChartRenderSignals(QObject):
+    rendered = pyqtSignal(object, object)  # clave, QImage
+    failed = pyqtSignal(object, str)
+
+
+class ChartRenderTask(QRunnable):
+    def __init__(self, key, draw, data, width, height, dpr):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.draw = draw
+        self.data = data
+        self.width = width
+        self.height = height
+        self.dpr = dpr
+        self.signals = ChartRenderSignals()
+
+    def run(self):
+        try:
+            image = render_chart(self.draw, self.data, self.width, self.height, self.dpr)
+        except Exception as e:
+            self.signals.failed.emit(self.key, str(e))
+        else:
+            self.signals.rendered.emit(self.key, image)
+
+
+class ChartRenderer(QObject):
+    """
+    Renderiza gráficos matplotlib fuera del hilo de la interfaz y guarda las
+    imágenes por (función, datos, tamaño). Los datos deben ser hashables
+    (las tuplas del DashboardSnapshot lo son): volver a pedir un gráfico con
+    los mismos datos y tamaño no vuelve a dibujar nada.
+
+    El pool tiene un único hilo: matplotlib no está pensado para dibujar
+    varias figuras a la vez y así las figuras se reutilizan sin bloqueos.
+    """
+    rendered = pyqtSignal(object, object)  # clave, QImage
+
+    CACHE_SIZE = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._cache = OrderedDict()
+        self._pending = {}  # clave -> tarea en cola o ejecutándose
+
+    @staticmethod
+    def make_key(draw, data, width, height, dpr):
+        # Los datos forman parte de la clave: el dict los indexa por su hash
+        return (draw.__name__, data, width, height, dpr)
+
+    def cached(self, key):
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+        return image
+
+    def request(self, draw, data, width, height, dpr=1.0):
+        """
+        Devuelve (clave, imagen). Si la imagen no está en caché es None y se
+        emitirá rendered(clave, imagen) cuando el hilo termine de dibujarla.
+        """
+        key = self.make_key(draw, data, width, height, dpr)
+        image = self.cached(key)
+        if image is None and key not in self._pending:
+            task = ChartRenderTask(key, draw, data, width, height, dpr)
+            task.signals.rendered.connect(self._on_rendered)
+            task.signals.failed.connect(self._on_failed)
+            self._pending[key] = task
+            self.thread_pool.start(task)
+        return key, image
+
+    def _on_rendered(self, key, image):
+        self._pending.pop(key, None)
+        self._cache[key] = image
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self.rendered.emit(key, image)
+
+    def _on_failed(self, key, message):
+        self._pending.pop(key, None)
+        logger.error(f"Error al renderizar el gráfico {key[0]}: {message}")
+
+    def clear(self):
+        self._cache.clear()
+
+    def wait(self, msecs=-1):
+        """Espera a que terminen los renderizados en curso (tests y cierre)."""
+        return self.thread_pool.waitForDone(msecs)
+
+
+_default_renderer = None
+
+
+def get_chart_renderer():
+    """ChartRenderer compartido: la caché sobrevive a las vistas que lo usan."""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = ChartRenderer()
+    return _default_renderer
+
+
+class ChartView(QWidget):
+    """
+    Muestra un gráfico renderizado por ChartRenderer. Al cambiar los datos o
+    el tamaño pide la imagen nueva y, mientras llega, sigue pintando la
+    anterior escalada (o el color de fondo si aún no hay ninguna).
+    """
+
+    RESIZE_DELAY_MS = 80
+
+    def __init__(self, draw, data=(), background='#1e1e1e', renderer=None, parent=None):
+        super().__init__(parent)
+        self.draw = draw
+        self.data = data
+        self.background = QColor(background)
+        self.renderer = renderer or get_chart_renderer()
+        self.renderer.rendered.connect(self._on_rendered)
+        self.image = None
+        self._key = None
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        # Al redimensionar se espera a que el tamaño se estabilice
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self.update_chart)
+
+    def set_data(self, data):
+        if data == self.data and self.image is not None:
+            return
+        self.data = data
+        self.update_chart()
+
+    def update_chart(self):
+        # Hasta que se muestra el tamaño no es el definitivo
+        if not self.isVisible() or self.width() <= 0 or self.height() <= 0:
+            return
+        self._key, image = self.renderer.request(
+            self.draw, self.data, self.width(), self.height(), self.devicePixelRatioF()
+        )
+        if image is not None:
+            self._show(image)
+
+    def _on_rendered(self, key, image):
+        if key == self._key:
+            self._show(image)
+
+    def _show(self, image):
+        self.image = image
+        self.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_chart()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.image is None:
+            self.update_chart()
+        else:
+            self._resize_timer.start(self.RESIZE_DELAY_MS)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.image is None:
+            painter.fillRect(self.rect(), self.background)
+        else:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(self.rect(), self.image)
+        painter.end()
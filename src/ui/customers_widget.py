@@ -1,12 +1,16 @@
+from functools import partial
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QTableView, QHeaderView, QLineEdit,
     QGroupBox, QFormLayout, QMessageBox, QDialog, QDialogButtonBox,
     QTextEdit
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from src.logic.customer_manager import CustomerManager
 from src.ui.utils import MessageBoxHelper
+from src.ui.table_models import (Column, PagedTableModel, SqlSortFilterProxyModel,
+                                 ActionButtonDelegate)
 
 
 class CustomersWidget(QWidget):
@@ -32,53 +36,68 @@ class CustomersWidget(QWidget):
         btn_add.setObjectName("btn_success")
         btn_add.setCursor(Qt.PointingHandCursor)
         btn_add.clicked.connect(self.open_add_dialog)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar cliente...")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(
+            lambda: self.proxy.set_search_text(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(self.search_timer.start)
+
         btn_row = QHBoxLayout()
-        btn_row.addStretch()
+        btn_row.addWidget(self.search_input, 1)
         btn_row.addWidget(btn_add)
         layout.addLayout(btn_row)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Nombre", "Email", "Teléfono", "Dirección", "Acciones"])
+        self.model = PagedTableModel(
+            [
+                Column("ID", 'id'),
+                Column("Nombre", 'name'),
+                Column("Email", 'email'),
+                Column("Teléfono", 'phone'),
+                Column("Dirección", 'address'),
+                Column("Acciones", None),
+            ],
+            partial(self.manager.get_customers_page, self.user_id),
+            partial(self.manager.count_customers, self.user_id),
+            sort='name', parent=self
+        )
+        self.proxy = SqlSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.proxy.sort)
         self.table.verticalHeader().setVisible(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setDefaultSectionSize(40)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+
+        self.actions_delegate = ActionButtonDelegate([
+            ('edit', "Editar", "#007BFF"),
+            ('delete', "Eliminar", "#dc3545"),
+        ], self.table)
+        self.actions_delegate.action_triggered.connect(self.on_action)
+        self.table.setItemDelegateForColumn(5, self.actions_delegate)
         layout.addWidget(self.table)
 
         self.setLayout(layout)
 
     def load_table(self):
-        self.table.setRowCount(0)
-        customers = self.manager.get_all_customers(self.user_id)
-        for r, c in enumerate(customers):
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(str(c['id'])))
-            self.table.setItem(r, 1, QTableWidgetItem(c['name']))
-            self.table.setItem(r, 2, QTableWidgetItem(c.get('email') or ''))
-            self.table.setItem(r, 3, QTableWidgetItem(c.get('phone') or ''))
-            self.table.setItem(r, 4, QTableWidgetItem(c.get('address') or ''))
-
-            btn_row = QWidget()
-            btn_layout = QHBoxLayout(btn_row)
-            btn_layout.setContentsMargins(4, 2, 4, 2)
-            btn_layout.setSpacing(6)
-
-            btn_edit = QPushButton("Editar")
-            btn_edit.setObjectName("btn_primary_sm")
-            btn_edit.setCursor(Qt.PointingHandCursor)
-            btn_edit.clicked.connect(lambda checked, cid=c['id']: self.open_edit_dialog(cid))
-
-            btn_del = QPushButton("Eliminar")
-            btn_del.setObjectName("btn_danger_sm")
-            btn_del.setCursor(Qt.PointingHandCursor)
-            btn_del.clicked.connect(lambda checked, cid=c['id'], cname=c['name']: self.delete_customer(cid, cname))
-
-            btn_layout.addWidget(btn_edit)
-            btn_layout.addWidget(btn_del)
-            btn_layout.addStretch()
-            self.table.setCellWidget(r, 5, btn_row)
-            self.table.setRowHeight(r, 40)
+        self.model.reload()
+
+    def on_action(self, action, customer_id):
+        if action == 'edit':
+            self.open_edit_dialog(customer_id)
+        elif action == 'delete':
+            customer = self.manager.get_customer_by_id(customer_id)
+            if customer:
+                self.delete_customer(customer_id, customer['name'])
 
     def open_add_dialog(self):
         dialog = _CustomerDialog(self, self.user_id, manager=self.manager)
@@ -0,0 +1,204 @@
+"""
+Gráficos del panel de inicio. Cada función dibuja una figura completa a
+partir de una sección del DashboardSnapshot y no toca Qt, así que se puede
+ejecutar en el hilo de ChartRenderer.
+"""
+
+# Paleta por material. Fríos: PLA, PETG; cálidos: ABS, ASA, TPU, NYLON, PC
+MATERIAL_PALETTE = {
+    'PLA': '#0288d1',   # Azul Claro
+    'PLA+': '#039be5',  # Azul Intenso
+    'PETG': '#0097a7',  # Cyan / Teal
+
+    'ABS': '#d32f2f',   # Rojo
+    'ASA': '#f57c00',   # Naranja
+    'TPU': '#fbc02d',   # Amarillo
+    'NYLON': '#5d4037', # Marrón
+    'PC': '#616161',    # Gris Oscuro
+
+    'OTROS': '#9e9e9e'  # Gris Medio
+}
+DEFAULT_COLORS = ['#78909c', '#546e7a', '#455a64', '#37474f']  # Fallback
+
+COLOR_NAMES = {
+    'negro': '#212121', 'black': '#212121',
+    'blanco': '#f5f5f5', 'white': '#f5f5f5',
+    'grs': '#9e9e9e', 'grey': '#9e9e9e', 'gris': '#9e9e9e', 'silver': '#c0c0c0', 'plateado': '#c0c0c0',
+    'rojo': '#d32f2f', 'red': '#d32f2f',
+    'azul': '#1976d2', 'blue': '#1976d2',
+    'verde': '#388e3c', 'green': '#388e3c',
+    'amarillo': '#fbc02d', 'yellow': '#fbc02d',
+    'naranja': '#f57c00', 'orange': '#f57c00',
+    'morado': '#7b1fa2', 'purple': '#7b1fa2', 'violeta': '#7b1fa2',
+    'rosa': '#e91e63', 'pink': '#e91e63',
+    'marrón': '#795548', 'brown': '#795548', 'marron': '#795548',
+    'transparente': '#e0f7fa', 'transparent': '#e0f7fa', 'natural': '#fff9c4',
+    'oro': '#ffd700', 'gold': '#ffd700', 'dorado': '#ffd700',
+    'cobre': '#bcaaa4', 'copper': '#bcaaa4',
+    'bronce': '#cd7f32', 'bronze': '#cd7f32'
+}
+
+
+def hex_for_color_name(color_name):
+    """Convierte nombres de colores comunes a HEX realistas para filamentos."""
+    if not color_name:
+        return "#808080" # Gris por defecto
+
+    c = color_name.lower().strip()
+    for key in COLOR_NAMES:
+        if key in c:
+            return COLOR_NAMES[key]
+
+    return "#b0bec5" # Gris azulado por defecto si no encuentra
+
+
+def _group_small(slices, other_label):
+    """
+    Agrupa en other_label las porciones < 5% del total y ordena de mayor a
+    menor. Devuelve (total, labels, sizes).
+    """
+    data_map = {s.label: s.grams for s in slices}
+    total_weight = sum(data_map.values())
+    threshold = 0.05 * total_weight
+
+    final_data = {}
+    other_weight = 0.0
+    for label, w in data_map.items():
+        if w >= threshold:
+            final_data[label] = w
+        else:
+            other_weight += w
+    if other_weight > 0:
+        final_data[other_label] = other_weight
+
+    sorted_items = sorted(final_data.items(), key=lambda x: x[1], reverse=True)
+    return total_weight, [item[0] for item in sorted_items], [item[1] for item in sorted_items]
+
+
+def _draw_donut(ax, total_weight, labels, sizes, colors, legend_fontsize):
+    # Sentido horario desde las 12 (counterclock=False, startangle=90)
+    wedges, _ = ax.pie(
+        sizes,
+        labels=None,
+        colors=colors,
+        startangle=90,
+        counterclock=False,
+        wedgeprops=dict(width=0.35, edgecolor='#1e1e1e', linewidth=2) # Anillo no muy grueso
+    )
+
+    # Texto Central (Total)
+    ax.text(0.0, 0.0, f"{total_weight/1000:.1f} kg\nTotal",
+            ha='center', va='center', fontsize=14, fontweight='bold', color='#e0e0e0')
+
+    # Leyenda inferior centrada: "Etiqueta (XX%)"
+    legend_labels = [f"{lab} ({(siz / total_weight) * 100:.1f}%)" for lab, siz in zip(labels, sizes)]
+    ax.legend(
+        wedges,
+        legend_labels,
+        loc="upper center",
+        bbox_to_anchor=(0.5, -0.05),
+        frameon=False,
+        ncol=2,
+        labelcolor='#b0bec5',
+        fontsize=legend_fontsize
+    )
+
+
+def _draw_empty_donut(ax, text):
+    ax.text(0.5, 0.5, text,
+            ha='center', va='center',
+            fontsize=12, color='#546e7a',
+            transform=ax.transAxes)
+    ax.set_xlim(-1, 1)
+    ax.set_ylim(-1, 1)
+
+
+def _finish_donut(figure, ax):
+    ax.axis('equal')
+    ax.set_facecolor('#2a2a2a')
+    figure.patch.set_facecolor('#1e1e1e')
+    # Márgenes limpios
+    figure.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.25)
+
+
+def draw_materials_chart(figure, materials):
+    """Donut de gramos por material (snapshot.materials)."""
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    total_weight = sum(s.grams for s in materials)
+    if total_weight > 0:
+        total_weight, labels, sizes = _group_small(materials, 'OTROS')
+        colors = [MATERIAL_PALETTE.get(label) or DEFAULT_COLORS[i % len(DEFAULT_COLORS)]
+                  for i, label in enumerate(labels)]
+        _draw_donut(ax, total_weight, labels, sizes, colors, legend_fontsize=10)
+    else:
+        _draw_empty_donut(ax, '0.0 kg\nSin Stock')
+
+    _finish_donut(figure, ax)
+
+
+def draw_colors_chart(figure, colors):
+    """Donut de gramos por color (snapshot.colors)."""
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    total_weight = sum(s.grams for s in colors)
+    if total_weight > 0:
+        total_weight, labels, sizes = _group_small(colors, 'Otros')
+        palette = ['#9e9e9e' if lab == 'Otros' else hex_for_color_name(lab) for lab in labels]
+        _draw_donut(ax, total_weight, labels, sizes, palette, legend_fontsize=9)
+    else:
+        _draw_empty_donut(ax, '0.0 kg\nSin Colores')
+
+    _finish_donut(figure, ax)
+
+
+def draw_costs_chart(figure, project_costs):
+    """Barras apiladas de coste por proyecto (snapshot.project_costs)."""
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    if project_costs:
+        # El más reciente arriba
+        projects = project_costs[::-1]
+
+        names = [p.name[:20] for p in projects]
+        filament_costs = [p.filament_cost for p in projects]
+        energy_costs = [p.energy_cost for p in projects]
+
+        y_pos = range(len(names))
+
+        # Barras apiladas horizontales
+        ax.barh(y_pos, filament_costs, height=0.6, color='#0288d1', label='Filamento')
+        ax.barh(y_pos, energy_costs, height=0.6, left=filament_costs, color='#f57c00', label='Energía')
+
+        # Texto con el coste total a la derecha de cada barra
+        for i, (fc, ec) in enumerate(zip(filament_costs, energy_costs)):
+            total = fc + ec
+            ax.text(total + 0.05, i, f"{total:.2f} €", va='center', fontsize=9, color='#e0e0e0')
+
+        ax.set_yticks(list(y_pos))
+        ax.set_yticklabels(names, fontsize=9, color='#b0b0b0')
+        ax.tick_params(axis='x', colors='#b0b0b0', labelsize=8)
+        ax.set_xlabel('Coste (€)', fontsize=9, color='#b0b0b0')
+
+        ax.legend(loc='lower right', frameon=False, fontsize=8, labelcolor='#b0b0b0')
+
+        # Ajustar márgenes para que se vean los textos de coste
+        max_cost = max(fc + ec for fc, ec in zip(filament_costs, energy_costs))
+        ax.set_xlim(0, max_cost * 1.25)
+    else:
+        ax.text(0.5, 0.5, 'Sin datos de costes aún',
+                ha='center', va='center',
+                fontsize=12, color='#546e7a',
+                transform=ax.transAxes)
+
+    # Estilo Dark Mode
+    ax.set_facecolor('#2a2a2a')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['bottom'].set_color('#404040')
+    ax.spines['left'].set_color('#404040')
+    figure.patch.set_facecolor('#2a2a2a')
+    figure.subplots_adjust(left=0.25, right=0.88, top=0.95, bottom=0.2)
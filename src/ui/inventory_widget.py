@@ -1,8 +1,11 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                             QTableWidgetItem, QPushButton, QHeaderView, QGroupBox, 
+from functools import partial
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                             QPushButton, QHeaderView, QGroupBox,
                              QFormLayout, QLineEdit, QComboBox, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from src.logic.inventory_manager import InventoryManager
+from src.ui.table_models import Column, PagedTableModel, SqlSortFilterProxyModel, ID_ROLE
 
 class InventoryWidget(QWidget):
     data_changed = pyqtSignal()
@@ -55,12 +58,42 @@ class InventoryWidget(QWidget):
         layout.addWidget(form_group)
 
         # --- Tabla de Inventario ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "Marca", "Tipo", "Color", "Peso Restante (g)", "Precio (€)"])
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar por marca, tipo o color...")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(
+            lambda: self.proxy.set_search_text(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(self.search_timer.start)
+        layout.addWidget(self.search_input)
+
+        self.model = PagedTableModel(
+            [
+                Column("ID", 'id'),
+                Column("Marca", 'brand'),
+                Column("Tipo", 'material_type'),
+                Column("Color", 'color'),
+                Column("Peso Restante (g)", 'weight_current'),
+                Column("Precio (€)", 'price'),
+            ],
+            partial(self.manager.get_filaments_page, self.user_id),
+            partial(self.manager.count_filaments, self.user_id),
+            sort='id', descending=True, parent=self
+        )
+        self.proxy = SqlSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.proxy.sort)
         self.table.verticalHeader().setVisible(False) # Ocultar barra lateral blanca (números de fila)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
 
         # --- Botones de Acción ---
@@ -76,20 +109,8 @@ class InventoryWidget(QWidget):
         self.setLayout(layout)
 
     def refresh_table(self):
-        """Recarga la tabla con datos de la BD."""
-        self.table.setRowCount(0)
-        # C5c: Filtra por usuario si se tiene user_id
-        filaments = self.manager.get_all_filaments(self.user_id)
-        
-        if filaments:
-            for row_idx, f in enumerate(filaments):
-                self.table.insertRow(row_idx)
-                self.table.setItem(row_idx, 0, QTableWidgetItem(str(f['id'])))
-                self.table.setItem(row_idx, 1, QTableWidgetItem(f['brand']))
-                self.table.setItem(row_idx, 2, QTableWidgetItem(f['material_type']))
-                self.table.setItem(row_idx, 3, QTableWidgetItem(f['color']))
-                self.table.setItem(row_idx, 4, QTableWidgetItem(str(f['weight_current'])))
-                self.table.setItem(row_idx, 5, QTableWidgetItem(str(f['price'])))
+        """Recarga la tabla con datos de la BD (la primera página)."""
+        self.model.reload()
 
     def add_filament(self):
         brand = self.input_brand.text()
@@ -147,8 +168,7 @@ class InventoryWidget(QWidget):
         msg_box.exec_()
         
         if msg_box.clickedButton() == btn_si:
-            row = selected_rows[0].row()
-            f_id = int(self.table.item(row, 0).text())
+            f_id = selected_rows[0].data(ID_ROLE)
             
             if self.manager.delete_filament(f_id):
                 self.refresh_table()
@@ -0,0 +1,34 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.logic.library_import import LibraryImporter
+
+
+class LibraryImportWorker(QThread):
+    """
+    Ejecuta LibraryImporter.import_source en segundo plano. El hilo usa su
+    propia conexión del pool de DBManager para guardar los lotes, así que la
+    interfaz sigue respondiendo (y leyendo) durante la importación.
+    """
+    progress = pyqtSignal(int, int, str)      # hechos, total, entrada
+    import_finished = pyqtSignal(object)      # resumen de import_source
+    import_failed = pyqtSignal(str)
+
+    def __init__(self, library_manager, source, user_id=None, parent=None):
+        super().__init__(parent)
+        self.importer = LibraryImporter(library_manager)
+        self.source = source
+        self.user_id = user_id
+
+    def run(self):
+        try:
+            summary = self.importer.import_source(
+                self.source, user_id=self.user_id,
+                progress=self.progress.emit,
+                should_stop=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.import_failed.emit(str(e))
+        else:
+            self.import_finished.emit(summary)
+        finally:
+            self.importer.db.release_thread_connections()
@@ -1,10 +1,19 @@
+import os
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QListWidget, QFileDialog, QMessageBox, QSplitter, QLineEdit, QFrame, QLabel)
+                             QListWidget, QFileDialog, QMessageBox, QSplitter, QLineEdit, QFrame, QLabel,
+                             QMenu, QProgressDialog)
 from src.ui.utils import MessageBoxHelper
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QTimer, QThreadPool
 from PyQt5.QtGui import QIcon
 from src.logic.library_manager import LibraryManager
+from src.logic.search_manager import SearchManager
 from src.ui.viewer_3d import Viewer3DWidget
+from src.ui.thumbnail_worker import ThumbnailWorker
+from src.ui.mesh_analysis_worker import MeshAnalysisWorker
+from src.ui.library_import_worker import LibraryImportWorker
+from src.ui.lod_build_worker import LodBuildTask
+from src.logic.mesh_analysis import MeshAnalyzer
 
 class LibraryWidget(QWidget):
     def __init__(self, user_id=None):
@@ -12,6 +21,19 @@ class LibraryWidget(QWidget):
         # C5c: user_id para filtrar modelos por usuario
         self.user_id = user_id
         self.manager = LibraryManager()
+        self.analyzer = MeshAnalyzer(self.manager.db)
+        self.search = SearchManager(self.manager.db)
+        self.thumbnail_worker = None
+        # Modelos cuya miniatura falló en esta sesión (por hash del blob): no
+        # se reintentan en cada refresh_list
+        self._thumbnail_failures = set()
+        self.analysis_worker = None
+        self.import_worker = None
+        self.import_dialog = None
+        # Cachés LOD de los modelos añadidos, de una en una
+        self.lod_pool = QThreadPool(self)
+        self.lod_pool.setMaxThreadCount(1)
+        self._icons = {}
         self.init_ui()
         self.refresh_list()
 
@@ -46,7 +68,12 @@ class LibraryWidget(QWidget):
                 background-color: #333333;
             }
         """)
-        self.search_input.textChanged.connect(self.filter_list)
+        # La búsqueda se lanza cuando se deja de escribir, no en cada tecla
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.filter_list(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
         
         # Botones de acción
         self.btn_add = QPushButton(" + Añadir Modelo")
@@ -67,6 +94,29 @@ class LibraryWidget(QWidget):
             }
         """)
         self.btn_add.clicked.connect(self.add_model)
+
+        # Importación masiva: carpeta (recursiva) o archivo ZIP
+        self.btn_import = QPushButton("Importar...")
+        self.btn_import.setCursor(Qt.PointingHandCursor)
+        self.btn_import.setStyleSheet("""
+            QPushButton {
+                background-color: #2d2d2d;
+                color: white;
+                border: 1px solid #3a3a3a;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-weight: 600;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: #333333;
+            }
+            QPushButton::menu-indicator { width: 0px; }
+        """)
+        import_menu = QMenu(self.btn_import)
+        import_menu.addAction("Carpeta...", self.import_folder)
+        import_menu.addAction("Archivo ZIP...", self.import_zip)
+        self.btn_import.setMenu(import_menu)
         
         self.btn_delete = QPushButton("Eliminar")
         self.btn_delete.setCursor(Qt.PointingHandCursor)
@@ -88,6 +138,7 @@ class LibraryWidget(QWidget):
         
         toolbar.addWidget(self.search_input, 1)
         toolbar.addWidget(self.btn_add)
+        toolbar.addWidget(self.btn_import)
         toolbar.addWidget(self.btn_delete)
         
         layout.addLayout(toolbar)
@@ -111,6 +162,7 @@ class LibraryWidget(QWidget):
         self.model_list = QListWidget()
         self.model_list.setObjectName("LibraryList") # Usa el estilo definido en QSS
         self.model_list.setSpacing(8)
+        self.model_list.setIconSize(QSize(40, 40))
         self.model_list.itemClicked.connect(self.on_model_selected)
         
         list_layout.addWidget(self.model_list)
@@ -144,6 +196,11 @@ class LibraryWidget(QWidget):
         vf_layout.addWidget(self.viewer)
         
         viewer_layout.addWidget(viewer_frame)
+
+        # Datos del análisis de malla del modelo seleccionado
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("font-size: 13px; color: #b0b0b0;")
+        viewer_layout.addWidget(self.info_label)
         splitter.addWidget(viewer_container)
         
         # Configuración del splitter
@@ -156,43 +213,122 @@ class LibraryWidget(QWidget):
 
     def refresh_list(self):
         """Recarga la lista de modelos desde la BD."""
-        self.model_list.clear()
         # C5c: Filtra modelos por usuario
         self.all_models = self.manager.get_all_models(self.user_id)
+        self.populate_list()
         self.filter_list(self.search_input.text())
+        self.generate_missing_thumbnails()
+        self.analyze_pending_models()
 
-    def filter_list(self, text):
-        """Filtra la lista de modelos según el texto."""
-        self.model_list.clear()
-        if not hasattr(self, 'all_models') or not self.all_models:
+    def analyze_pending_models(self):
+        """Analiza en segundo plano los modelos importados sin análisis de malla."""
+        if self.analysis_worker and self.analysis_worker.isRunning():
             return
-            
-        search_text = text.lower()
+        pending = self.analyzer.get_models_pending_analysis(self.user_id)
+        if not pending:
+            return
+        self.analysis_worker = MeshAnalysisWorker(pending, parent=self, db_manager=self.manager.db)
+        self.analysis_worker.analysis_ready.connect(self.on_analysis_ready)
+        self.analysis_worker.start()
+
+    def on_analysis_ready(self, model_id, analysis):
+        self.analyzer.save_analysis(model_id, analysis)
+        for model in self.all_models:
+            if model['id'] == model_id:
+                model.update(analysis)
+        current = self.model_list.currentItem()
+        if current and current.data(Qt.UserRole) == model_id:
+            self.show_model_info(model_id)
+
+    def generate_missing_thumbnails(self):
+        """Lanza el worker de miniaturas para los modelos que aún no la tienen."""
+        if self.thumbnail_worker and self.thumbnail_worker.isRunning():
+            return
+        missing = [
+            (model['id'], model['file_path']) for model in self.all_models
+            if not (model.get('thumbnail_path') and os.path.exists(model['thumbnail_path']))
+            and self._thumbnail_key(model) not in self._thumbnail_failures
+        ]
+        if not missing:
+            return
+        self.thumbnail_worker = ThumbnailWorker(missing, parent=self, db_manager=self.manager.db)
+        self.thumbnail_worker.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_worker.thumbnail_failed.connect(self.on_thumbnail_failed)
+        self.thumbnail_worker.start()
+
+    @staticmethod
+    def _thumbnail_key(model):
+        # Los modelos anteriores al almacén de blobs no tienen hash
+        return model.get('blob_hash') or model['file_path']
+
+    def on_thumbnail_failed(self, model_id):
         for model in self.all_models:
-            if search_text in model['name'].lower():
-                # Crear item con icono (simulado)
-                from PyQt5.QtWidgets import QListWidgetItem
-                
-                item = QListWidgetItem(f"  {model['name']}")
-                # item.setIcon(QIcon("path/to/icon.png")) # Si tuviéramos iconos
-                item.setSizeHint(QSize(0, 50)) # Altura fija para parecer tarjeta
-                
-                # Guardamos el ID en el item
-                item.setData(Qt.UserRole, model['id'])
-                item.setData(Qt.UserRole + 1, model['file_path'])
-                
-                self.model_list.addItem(item)
+            if model['id'] == model_id:
+                self._thumbnail_failures.add(self._thumbnail_key(model))
+
+    def on_thumbnail_ready(self, model_id, thumbnail_path):
+        self.manager.set_thumbnail(model_id, thumbnail_path)
+        for model in self.all_models:
+            if model['id'] == model_id:
+                model['thumbnail_path'] = thumbnail_path
+        for row in range(self.model_list.count()):
+            item = self.model_list.item(row)
+            if item.data(Qt.UserRole) == model_id:
+                item.setIcon(self.get_icon(thumbnail_path))
+
+    def get_icon(self, thumbnail_path):
+        """QIcon de una miniatura, reutilizado entre filtrados."""
+        icon = self._icons.get(thumbnail_path)
+        if icon is None:
+            icon = QIcon(thumbnail_path)
+            self._icons[thumbnail_path] = icon
+        return icon
+
+    def populate_list(self):
+        """Crea los items de la lista una sola vez por recarga."""
+        from PyQt5.QtWidgets import QListWidgetItem
+
+        self.model_list.clear()
+        for model in self.all_models:
+            item = QListWidgetItem(f"  {model['name']}")
+            # Solo se lee el PNG ya generado, nunca el archivo del modelo
+            if model.get('thumbnail_path'):
+                item.setIcon(self.get_icon(model['thumbnail_path']))
+            item.setSizeHint(QSize(0, 50)) # Altura fija para parecer tarjeta
+
+            # Guardamos el ID en el item
+            item.setData(Qt.UserRole, model['id'])
+            item.setData(Qt.UserRole + 1, model['file_path'])
+
+            self.model_list.addItem(item)
+
+    def filter_list(self, text):
+        """
+        Filtra la lista con el índice de texto completo: los items no se
+        recrean, solo se ocultan los que no coinciden.
+        """
+        matches = None
+        if self.search.build_match_query(text) is not None:
+            matches = set(self.search.search_ids('model', text, self.user_id, ranked=False))
+
+        self.model_list.setUpdatesEnabled(False)
+        try:
+            for row in range(self.model_list.count()):
+                item = self.model_list.item(row)
+                item.setHidden(matches is not None and item.data(Qt.UserRole) not in matches)
+        finally:
+            self.model_list.setUpdatesEnabled(True)
 
     def add_model(self):
-        """Abre diálogo para seleccionar archivo STL."""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar Modelo 3D", "", "Archivos STL (*.stl)")
+        """Abre diálogo para seleccionar un modelo 3D (STL, 3MF u OBJ)."""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar Modelo 3D", "", "Modelos 3D (*.stl *.3mf *.obj)")
         if file_path:
-            import os
             name = os.path.basename(file_path)
             
             # C5c: Pasar user_id al añadir el modelo
             try:
-                success, msg = self.manager.add_model(file_path, name, user_id=self.user_id)
+                success, msg = self.manager.add_model(file_path, name, user_id=self.user_id,
+                                                      build_lod=self.build_lod_in_background)
                 if success:
                     self.refresh_list()
                     MessageBoxHelper.show_info(self, "Éxito", msg)
@@ -201,6 +337,70 @@ class LibraryWidget(QWidget):
             except Exception as e:
                 MessageBoxHelper.show_warning(self, "Error", f"Error inesperado al añadir modelo: {e}")
 
+    def build_lod_in_background(self, file_path):
+        self.lod_pool.start(LodBuildTask(file_path))
+
+    def import_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta de modelos")
+        if folder:
+            self.import_models(folder)
+
+    def import_zip(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar archivo ZIP", "", "Archivos ZIP (*.zip)")
+        if file_path:
+            self.import_models(file_path)
+
+    def import_models(self, source):
+        """
+        Importa todos los modelos de una carpeta o ZIP en un LibraryImportWorker
+        (el hash y la copia van además en el pool de hilos del importador).
+        Si se cancela, volver a importar la misma carpeta continúa donde se
+        quedó.
+        """
+        if self.import_worker and self.import_worker.isRunning():
+            MessageBoxHelper.show_info(self, "Importación", "Ya hay una importación en curso.")
+            return
+        dialog = QProgressDialog("Preparando importación...", "Cancelar", 0, 0, self)
+        dialog.setWindowTitle("Importar modelos")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        self.import_dialog = dialog
+
+        self.import_worker = LibraryImportWorker(self.manager, source, self.user_id, parent=self)
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.import_finished.connect(self.on_import_finished)
+        self.import_worker.import_failed.connect(self.on_import_failed)
+        dialog.canceled.connect(self.import_worker.requestInterruption)
+        self.import_worker.start()
+
+    def on_import_progress(self, done, total, entry):
+        if self.import_dialog:
+            self.import_dialog.setMaximum(total)
+            self.import_dialog.setValue(done)
+            self.import_dialog.setLabelText(f"{done}/{total}  {os.path.basename(entry)}")
+
+    def _close_import_dialog(self):
+        if self.import_dialog:
+            self.import_dialog.close()
+            self.import_dialog = None
+
+    def on_import_failed(self, error):
+        self._close_import_dialog()
+        MessageBoxHelper.show_warning(self, "Error", f"Error en la importación: {error}")
+
+    def on_import_finished(self, summary):
+        self._close_import_dialog()
+        self.refresh_list()
+
+        msg = (f"Importados: {summary['imported']} "
+               f"(duplicados: {summary['duplicates']}, ya importados: {summary['resumed']}, "
+               f"errores: {summary['failed']})")
+        if summary['interrupted']:
+            msg += "\nImportación interrumpida: vuelve a importar el mismo origen para continuar."
+        MessageBoxHelper.show_info(self, "Importación", msg)
+
     def delete_model(self):
         """Elimina el modelo seleccionado."""
         current_item = self.model_list.currentItem()
@@ -212,9 +412,8 @@ class LibraryWidget(QWidget):
         if MessageBoxHelper.ask_confirmation(self, "Confirmar", "¿Estás seguro de eliminar este modelo?"):
             if self.manager.delete_model(model_id):
                 self.refresh_list()
-                self.viewer.ax.clear() # Limpiar visor
-                self.viewer.configure_axes() # Reconfigurar ejes vacíos
-                self.viewer.canvas.draw()
+                self.viewer.clear_model() # Limpiar visor
+                self.info_label.setText("")
             else:
                 MessageBoxHelper.show_warning(self, "Error", "No se pudo eliminar el modelo.")
 
@@ -222,3 +421,18 @@ class LibraryWidget(QWidget):
         """Carga el modelo en el visor cuando se selecciona."""
         file_path = item.data(Qt.UserRole + 1)
         self.viewer.load_model(file_path)
+        self.show_model_info(item.data(Qt.UserRole))
+
+    def show_model_info(self, model_id):
+        """Muestra volumen, dimensiones y peso estimado (PLA, 20% relleno)."""
+        model = next((m for m in self.all_models if m['id'] == model_id), None)
+        if not model or model.get('volume_cm3') is None:
+            self.info_label.setText("Analizando modelo..." if model else "")
+            return
+        estimate = self.analyzer.estimate_for_model(model_id)
+        text = (f"Volumen: {model['volume_cm3']:.1f} cm³  ·  "
+                f"Dimensiones: {model['bbox_x_mm']:.1f} × {model['bbox_y_mm']:.1f} × {model['bbox_z_mm']:.1f} mm  ·  "
+                f"Peso estimado: {estimate['grams']:.1f} g")
+        if not model['is_watertight']:
+            text += "  ·  ⚠ Malla no cerrada: volumen aproximado"
+        self.info_label.setText(text)
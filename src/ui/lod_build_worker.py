@@ -0,0 +1,18 @@
+from PyQt5.QtCore import QRunnable
+
+from src.logic.library_manager import LibraryManager
+
+
+class LodBuildTask(QRunnable):
+    """
+    Genera la caché LOD de un modelo recién añadido en un QThreadPool, para
+    no bloquear la interfaz al simplificar mallas grandes. Si falla, el visor
+    carga el archivo original (build_lod_cache ya lo registra en el log).
+    """
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+
+    def run(self):
+        LibraryManager.build_lod_cache(self.file_path)
@@ -3,18 +3,10 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QStackedWidget, QFrame, QLabel, QMessageBox)
 from src.ui.utils import MessageBoxHelper
 from src.utils.resource_path import get_asset_path
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap
 
-from src.ui.home_widget import HomeWidget
-from src.ui.calculator_widget import CalculatorWidget
-from src.ui.library_widget import LibraryWidget
-from src.ui.inventory_widget import InventoryWidget
-from src.ui.marketplace_widget import MarketplaceWidget
-from src.ui.settings_widget import SettingsWidget
-from src.ui.projects_widget import ProjectsWidget
-from src.ui.customers_widget import CustomersWidget
-from src.ui.orders_widget import OrdersWidget
+from src.utils.startup_timer import startup_timer
 from src.utils.translator import translator
 
 # Page indexes
@@ -28,6 +20,12 @@ _IDX_CUSTOMERS = 6
 _IDX_ORDERS = 7
 _IDX_SETTINGS = 8
 
+# Atributo de cada página, en el orden de _IDX_*. Las páginas (y sus módulos,
+# que cargan matplotlib, trimesh o reportlab) se crean al abrirlas
+_PAGE_ATTRS = ['home_widget', 'calc_widget', 'library_widget', 'inventory_widget',
+               'projects_widget', 'market_widget', 'customers_widget',
+               'orders_widget', 'settings_widget']
+
 class MainWindow(QMainWindow):
     logout_requested = pyqtSignal()  # Señal para volver al login
     
@@ -70,7 +68,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(f"Formexa - {self.user['username']}")
         
         # Inicializar páginas ahora que tenemos usuario
-        self.init_pages()
+        with startup_timer.phase("login: páginas"):
+            self.init_pages()
         
         self.central_stack.setCurrentWidget(self.main_app_widget)
         
@@ -78,6 +77,9 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'btn_home'):
             self.btn_home.click()
 
+        # Informe cuando la primera página ya se ha pintado
+        QTimer.singleShot(0, lambda: startup_timer.report("Inicio de sesión"))
+
     def setup_main_app_ui(self):
         """Configura la UI principal de la aplicación."""
         # Layout principal (Horizontal: Menú Lateral + Contenido)
@@ -92,45 +94,86 @@ class MainWindow(QMainWindow):
         # Área de Contenido (Stacked Widget)
         self.content_area = QStackedWidget()
         main_layout.addWidget(self.content_area)
+        for attr in _PAGE_ATTRS:
+            setattr(self, attr, None)
 
     # ... (other methods)
 
     def init_pages(self):
-        """Inicializa y añade las páginas al StackedWidget."""
+        """
+        Prepara el StackedWidget con un marcador por página. Cada página se
+        construye la primera vez que se abre (ensure_page), así el login no
+        paga las consultas ni los imports de las páginas que no se visitan.
+        """
         # Limpiar widgets anteriores si existen
         while self.content_area.count():
             widget = self.content_area.widget(0)
             self.content_area.removeWidget(widget)
             widget.deleteLater()
 
+        # Orden debe coincidir con _IDX_* constantes
+        for attr in _PAGE_ATTRS:
+            setattr(self, attr, None)
+            self.content_area.addWidget(QWidget())
+
+    def ensure_page(self, index):
+        """Construye la página index si aún es un marcador y la devuelve."""
+        widget = getattr(self, _PAGE_ATTRS[index])
+        if widget is not None:
+            return widget
+
+        with startup_timer.phase(f"página {_PAGE_ATTRS[index]}"):
+            widget = self._create_page(index)
+            placeholder = self.content_area.widget(index)
+            self.content_area.insertWidget(index, widget)
+            self.content_area.removeWidget(placeholder)
+            placeholder.deleteLater()
+        setattr(self, _PAGE_ATTRS[index], widget)
+        return widget
+
+    def _create_page(self, index):
+        """Importa el módulo de la página y la crea con sus señales conectadas."""
         # C5c: Pasamos el user_id a los widgets que filtran datos por usuario
         user_id = self.user['id'] if self.user else None
 
-        self.home_widget = HomeWidget(user_id=user_id)
-        self.calc_widget = CalculatorWidget()
-        self.library_widget = LibraryWidget(user_id=user_id)
-        self.inventory_widget = InventoryWidget(user_id=user_id)
-        self.projects_widget = ProjectsWidget(self.auth_manager)
-        self.market_widget = MarketplaceWidget()
-        self.customers_widget = CustomersWidget(user_id=user_id)
-        self.orders_widget = OrdersWidget(user_id=user_id)
-        self.settings_widget = SettingsWidget()
-
-        # Conectar señales
-        self.inventory_widget.data_changed.connect(self.home_widget.refresh_dashboard)
-        self.settings_widget.logout_requested.connect(self.handle_logout)
-        self.settings_widget.exit_requested.connect(self.handle_exit)
+        if index == _IDX_HOME:
+            from src.ui.home_widget import HomeWidget
+            return HomeWidget(user_id=user_id)
+        if index == _IDX_CALC:
+            from src.ui.calculator_widget import CalculatorWidget
+            return CalculatorWidget()
+        if index == _IDX_LIBRARY:
+            from src.ui.library_widget import LibraryWidget
+            return LibraryWidget(user_id=user_id)
+        if index == _IDX_INVENTORY:
+            from src.ui.inventory_widget import InventoryWidget
+            widget = InventoryWidget(user_id=user_id)
+            widget.data_changed.connect(self.refresh_home)
+            return widget
+        if index == _IDX_PROJECTS:
+            from src.ui.projects_widget import ProjectsWidget
+            return ProjectsWidget(self.auth_manager)
+        if index == _IDX_MARKET:
+            from src.ui.marketplace_widget import MarketplaceWidget
+            return MarketplaceWidget()
+        if index == _IDX_CUSTOMERS:
+            from src.ui.customers_widget import CustomersWidget
+            return CustomersWidget(user_id=user_id)
+        if index == _IDX_ORDERS:
+            from src.ui.orders_widget import OrdersWidget
+            return OrdersWidget(user_id=user_id)
+        if index == _IDX_SETTINGS:
+            from src.ui.settings_widget import SettingsWidget
+            widget = SettingsWidget()
+            widget.logout_requested.connect(self.handle_logout)
+            widget.exit_requested.connect(self.handle_exit)
+            return widget
+        raise ValueError(f"Página desconocida: {index}")
 
-        # Orden debe coincidir con _IDX_* constantes
-        self.content_area.addWidget(self.home_widget)        # 0
-        self.content_area.addWidget(self.calc_widget)        # 1
-        self.content_area.addWidget(self.library_widget)     # 2
-        self.content_area.addWidget(self.inventory_widget)   # 3
-        self.content_area.addWidget(self.projects_widget)    # 4
-        self.content_area.addWidget(self.market_widget)      # 5
-        self.content_area.addWidget(self.customers_widget)   # 6
-        self.content_area.addWidget(self.orders_widget)      # 7
-        self.content_area.addWidget(self.settings_widget)    # 8
+    def refresh_home(self):
+        """Refresca el dashboard si ya se ha construido."""
+        if self.home_widget is not None:
+            self.home_widget.refresh_dashboard()
 
     def load_styles(self):
         """Carga el archivo QSS."""
@@ -288,11 +331,19 @@ class MainWindow(QMainWindow):
             if index not in [_IDX_CALC, _IDX_SETTINGS]:
                 self.show_guest_restriction_message(index)
                 # Mantener en calculadora
+                self.ensure_page(_IDX_CALC)
                 self.content_area.setCurrentIndex(_IDX_CALC)
                 self.btn_calc.setChecked(True)
                 return
         
+        # La página se construye al abrirla por primera vez
+        if self.content_area.count():
+            self.ensure_page(index)
         self.content_area.setCurrentIndex(index)
+
+        # El dashboard se memoriza por usuario: si nada cambió no hay consultas
+        if index == _IDX_HOME and self.home_widget is not None:
+            self.home_widget.refresh_dashboard()
         
         # Marcar el botón actual
         button.setChecked(True)
@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.database.db_manager import DBManager
+from src.logic.mesh_analysis import MeshAnalyzer
+
+
+class MeshAnalysisWorker(QThread):
+    """
+    Analiza mallas (volumen, área, dimensiones) en el pool de procesos de
+    MeshAnalyzer. El guardado en la BD se hace al recibir la señal, en el
+    hilo de la interfaz.
+    """
+    analysis_ready = pyqtSignal(int, object)   # id del modelo, resultado
+
+    def __init__(self, models, parent=None, db_manager=None):
+        super().__init__(parent)
+        # models: [(id, ruta del archivo)]
+        self.models = list(models)
+        self.db = db_manager or DBManager()
+
+    def run(self):
+        try:
+            for model_id, analysis in MeshAnalyzer.analyze_batch(self.models):
+                if self.isInterruptionRequested():
+                    break
+                if analysis:
+                    self.analysis_ready.emit(model_id, analysis)
+        finally:
+            self.db.release_thread_connections()
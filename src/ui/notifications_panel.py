@@ -1,17 +1,15 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QProgressBar)
 from PyQt5.QtCore import Qt
-from src.logic.inventory_manager import InventoryManager
-from src.logic.library_manager import LibraryManager
-from src.logic.project_manager import ProjectManager
+from src.logic.dashboard_service import get_dashboard_service
 
 class NotificationsPanel(QWidget):
-    def __init__(self, user_id=None):
+    def __init__(self, user_id=None, dashboard=None):
         super().__init__()
         # C5c / M8: user_id para filtrar datos y mostrar estadísticas reales
         self.user_id = user_id
-        self.inventory_manager = InventoryManager()
-        self.library_manager = LibraryManager()
-        self.project_manager = ProjectManager()  # M8: para estadísticas reales
+        # Los datos salen del snapshot compartido con HomeWidget
+        self.dashboard = dashboard or get_dashboard_service()
+        self.snapshot = self.dashboard.snapshot(self.user_id)
         self.init_ui()
 
     def init_ui(self):
@@ -54,25 +52,9 @@ class NotificationsPanel(QWidget):
     def populate_low_material_card(self, card):
         layout = card.layout()
         
-        # Lógica para obtener filamentos bajos
+        # Lógica para obtener filamentos bajos (< 20 %, los más agotados)
         # C5c: Filtramos filamentos por usuario
-        filaments = self.inventory_manager.get_all_filaments(self.user_id)
-        low_stock_filaments = []
-
-        for f in filaments:
-            try:
-                initial = float(f['weight_initial'])
-                current = float(f['weight_current'])
-                if initial > 0:
-                    percentage = (current / initial) * 100
-                    if percentage < 20:
-                        low_stock_filaments.append({
-                            'name': f"{f['brand']} {f['material_type']} {f['color']}",
-                            'current': current,
-                            'percentage': percentage
-                        })
-            except (ValueError, KeyError):
-                continue
+        low_stock_filaments = self.snapshot.low_stock
         
         if not low_stock_filaments:
             lbl = QLabel("No hay alertas de material")
@@ -91,9 +73,9 @@ class NotificationsPanel(QWidget):
 
             # Nombre y Peso
             header_layout = QHBoxLayout()
-            name_lbl = QLabel(item['name'])
+            name_lbl = QLabel(item.name)
             name_lbl.setStyleSheet("color: #e0e0e0; font-weight: 500; border: none;")
-            weight_lbl = QLabel(f"{item['current']:.0f}g")
+            weight_lbl = QLabel(f"{item.current:.0f}g")
             weight_lbl.setStyleSheet("color: #b0b0b0; border: none;")
             
             header_layout.addWidget(name_lbl)
@@ -104,12 +86,12 @@ class NotificationsPanel(QWidget):
             # Barra de progreso
             progress = QProgressBar()
             progress.setRange(0, 100)
-            progress.setValue(int(item['percentage']))
+            progress.setValue(int(item.percentage))
             progress.setTextVisible(False)
             progress.setFixedHeight(6)
             
             # Color según criticidad
-            color = "#f44336" if item['percentage'] < 10 else "#ff9800" # Rojo (<10%) o Amarillo (10-20%)
+            color = "#f44336" if item.percentage < 10 else "#ff9800" # Rojo (<10%) o Amarillo (10-20%)
             progress.setStyleSheet(f"""
                 QProgressBar {{
                     border: none;
@@ -183,12 +165,11 @@ class NotificationsPanel(QWidget):
         
         # M8: Mostrar estadísticas reales del usuario si está logueado
         if self.user_id and self.user_id != -1:
-            stats = self.project_manager.get_project_stats(self.user_id)
-            # stats es un Row de sqlite3 — accedemos por índice
-            if stats and stats[0]:  # stats[0] = total_projects
-                total_projects = stats[0] or 0
-                total_spent = stats[4] or 0.0  # stats[4] = total_spent
-                total_hours = stats[5] or 0.0  # stats[5] = total_hours
+            stats = self.snapshot.project_stats
+            if stats and stats.total_projects:
+                total_projects = stats.total_projects
+                total_spent = stats.total_spent or 0.0
+                total_hours = stats.total_hours or 0.0
                 
                 projects_lbl = QLabel(f"Proyectos: {total_projects}")
                 projects_lbl.setStyleSheet("color: #e0e0e0; font-size: 13px; border: none;")
@@ -225,7 +206,7 @@ class NotificationsPanel(QWidget):
         layout.addWidget(line)
 
         # Últimos modelos añadidos (C5c: filtrado por usuario)
-        models = self.library_manager.get_all_models(self.user_id if self.user_id and self.user_id != -1 else None)
+        models = self.snapshot.recent_models
         
         recent_lbl = QLabel("Añadidos recientemente:")
         recent_lbl.setStyleSheet("color: #e0e0e0; font-weight: bold; font-size: 13px; border: none; margin-top: 5px;")
@@ -237,20 +218,30 @@ class NotificationsPanel(QWidget):
             layout.addWidget(lbl)
         else:
             for model in models[:3]:
-                m_lbl = QLabel(f"• {model['name']}")
+                m_lbl = QLabel(f"• {model.name}")
                 m_lbl.setStyleSheet("color: #b0b0b0; font-size: 12px; border: none;")
                 layout.addWidget(m_lbl)
 
         layout.addStretch()
 
-    def refresh_data(self):
-        """Actualiza los datos de todas las tarjetas."""
+    def refresh_data(self, snapshot=None):
+        """
+        Actualiza las tarjetas con un snapshot nuevo (o el actual del servicio).
+        Solo se repueblan las tarjetas cuyas secciones cambiaron.
+        """
+        previous = self.snapshot
+        self.snapshot = snapshot or self.dashboard.snapshot(self.user_id)
+        if self.snapshot is previous:
+            return
+
         # Limpiar layouts de tarjetas (excepto título)
-        for card, populate_func in [
-            (self.low_material_card, self.populate_low_material_card),
-            (self.most_used_card, self.populate_most_used_card),
-            (self.monthly_summary_card, self.populate_monthly_summary_card)
+        for card, populate_func, sections in [
+            (self.low_material_card, self.populate_low_material_card, ('low_stock',)),
+            (self.monthly_summary_card, self.populate_monthly_summary_card,
+             ('project_stats', 'recent_models'))
         ]:
+            if all(getattr(self.snapshot, s) == getattr(previous, s) for s in sections):
+                continue
             layout = card.layout()
             # Eliminar todo menos el título (index 0)
             while layout.count() > 1:
@@ -1,15 +1,19 @@
+from functools import partial
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QTableView, QHeaderView, QLineEdit,
     QComboBox, QDoubleSpinBox, QSpinBox, QDialog, QDialogButtonBox,
     QFormLayout, QFileDialog, QDateEdit
 )
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QDate, QTimer
 from src.logic.order_manager import OrderManager
 from src.logic.customer_manager import CustomerManager
 from src.logic.project_manager import ProjectManager
 from src.logic.report_generator import ReportGenerator
 from src.ui.utils import MessageBoxHelper
+from src.ui.table_models import (Column, PagedTableModel, SqlSortFilterProxyModel,
+                                 ActionButtonDelegate)
 
 
 class OrdersWidget(QWidget):
@@ -41,64 +45,66 @@ class OrdersWidget(QWidget):
         btn_add.setObjectName("btn_success")
         btn_add.setCursor(Qt.PointingHandCursor)
         btn_add.clicked.connect(self.open_add_dialog)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar por cliente, proyecto o estado...")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(
+            lambda: self.proxy.set_search_text(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(self.search_timer.start)
+
         btn_row = QHBoxLayout()
-        btn_row.addStretch()
+        btn_row.addWidget(self.search_input, 1)
         btn_row.addWidget(btn_add)
         layout.addLayout(btn_row)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Cliente", "Proyecto", "Estado", "Cant.", "P. Unit.", "Total", "Acciones"
-        ])
+        # Filas cargadas por páginas desde SQLite; orden y búsqueda en SQL
+        money = lambda v: f"{v or 0:.2f} €"
+        self.model = PagedTableModel(
+            [
+                Column("ID", 'id'),
+                Column("Cliente", 'customer_name', lambda v: v or '-'),
+                Column("Proyecto", 'project_name', lambda v: v or '-'),
+                Column("Estado", 'status', lambda v: v or '-'),
+                Column("Cant.", 'quantity'),
+                Column("P. Unit.", 'unit_price', money),
+                Column("Total", 'total_price', money),
+                Column("Acciones", None),
+            ],
+            partial(self.order_mgr.get_orders_page, self.user_id),
+            partial(self.order_mgr.count_orders, self.user_id),
+            sort='created_at', descending=True, parent=self
+        )
+        self.proxy = SqlSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.proxy.sort)
         self.table.verticalHeader().setVisible(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setDefaultSectionSize(40)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+
+        self.actions_delegate = ActionButtonDelegate([
+            ('edit', "Editar", "#007BFF"),
+            ('pdf', "PDF", "#28a745"),
+            ('delete', "Eliminar", "#dc3545"),
+        ], self.table)
+        self.actions_delegate.action_triggered.connect(self.on_action)
+        self.table.setItemDelegateForColumn(7, self.actions_delegate)
         layout.addWidget(self.table)
 
         self.setLayout(layout)
 
     def load_table(self):
-        self.table.setRowCount(0)
-        orders = self.order_mgr.get_all_orders(self.user_id)
-
-        for r, o in enumerate(orders):
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(str(o['id'])))
-            self.table.setItem(r, 1, QTableWidgetItem(o.get('customer_name') or '-'))
-            self.table.setItem(r, 2, QTableWidgetItem(o.get('project_name') or '-'))
-            self.table.setItem(r, 3, QTableWidgetItem(o.get('status') or '-'))
-            self.table.setItem(r, 4, QTableWidgetItem(str(o.get('quantity', 1))))
-            self.table.setItem(r, 5, QTableWidgetItem(f"{o.get('unit_price', 0):.2f} €"))
-            self.table.setItem(r, 6, QTableWidgetItem(f"{o.get('total_price', 0):.2f} €"))
-
-            btn_row = QWidget()
-            btn_layout = QHBoxLayout(btn_row)
-            btn_layout.setContentsMargins(4, 2, 4, 2)
-            btn_layout.setSpacing(4)
-
-            btn_edit = QPushButton("Editar")
-            btn_edit.setObjectName("btn_primary_sm")
-            btn_edit.setCursor(Qt.PointingHandCursor)
-            btn_edit.clicked.connect(lambda checked, oid=o['id']: self.open_edit_dialog(oid))
-
-            btn_pdf = QPushButton("PDF")
-            btn_pdf.setObjectName("btn_success_sm")
-            btn_pdf.setCursor(Qt.PointingHandCursor)
-            btn_pdf.clicked.connect(lambda checked, oid=o['id']: self.export_pdf(oid))
-
-            btn_del = QPushButton("Eliminar")
-            btn_del.setObjectName("btn_danger_sm")
-            btn_del.setCursor(Qt.PointingHandCursor)
-            btn_del.clicked.connect(lambda checked, oid=o['id']: self.delete_order(oid))
-
-            btn_layout.addWidget(btn_edit)
-            btn_layout.addWidget(btn_pdf)
-            btn_layout.addWidget(btn_del)
-            btn_layout.addStretch()
-            self.table.setCellWidget(r, 7, btn_row)
-            self.table.setRowHeight(r, 40)
+        self.model.reload()
 
         # Update stats
         stats = self.order_mgr.get_revenue_stats(self.user_id)
@@ -110,6 +116,14 @@ class OrdersWidget(QWidget):
                 f"Total pedidos: {total}  |  Ingresos cobrados: {rev:.2f} €  |  Pendiente de cobro: {pend:.2f} €"
             )
 
+    def on_action(self, action, order_id):
+        if action == 'edit':
+            self.open_edit_dialog(order_id)
+        elif action == 'pdf':
+            self.export_pdf(order_id)
+        elif action == 'delete':
+            self.delete_order(order_id)
+
     def open_add_dialog(self):
         customers = self.customer_mgr.get_all_customers(self.user_id)
         if not customers:
@@ -274,12 +288,8 @@ class _OrderDialog(QDialog):
         else:
             ok, msg = self.order_mgr.create_order(
                 self.user_id, customer_id, unit_price, quantity=quantity,
-                project_id=project_id, delivery_date=delivery_date
+                project_id=project_id, delivery_date=delivery_date, status=status
             )
-            if ok and status != 'Presupuesto':
-                last_orders = self.order_mgr.get_all_orders(self.user_id)
-                if last_orders:
-                    self.order_mgr.update_order(last_orders[0]['id'], status=status)
 
         if ok:
             self.accept()
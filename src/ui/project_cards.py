@@ -0,0 +1,182 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QListView
+
+from src.ui.table_models import ActionButtonDelegate, ID_ROLE
+
+PROJECT_ROLE = Qt.UserRole + 1
+
+STATUS_COLORS = {
+    'Pendiente': '#FFA500',
+    'En Progreso': '#007BFF',
+    'Completado': '#28a745'
+}
+
+
+class ProjectListModel(QAbstractListModel):
+    """
+    Proyectos de la rejilla. Se actualiza por filas (upsert/remove) tras
+    crear, editar o borrar, sin volver a construir la lista completa.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._projects = []
+
+    def set_projects(self, projects):
+        self.beginResetModel()
+        self._projects = list(projects)
+        self.endResetModel()
+
+    def row_of(self, project_id):
+        for row, project in enumerate(self._projects):
+            if project['id'] == project_id:
+                return row
+        return -1
+
+    def upsert_project(self, project):
+        """Sustituye la tarjeta del proyecto o la añade al principio si es nuevo."""
+        row = self.row_of(project['id'])
+        if row >= 0:
+            self._projects[row] = project
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+        else:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self._projects.insert(0, project)
+            self.endInsertRows()
+
+    def remove_project(self, project_id):
+        row = self.row_of(project_id)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._projects[row]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._projects)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        project = self._projects[index.row()]
+        if role == Qt.DisplayRole:
+            return project['name']
+        if role == ID_ROLE:
+            return project['id']
+        if role == PROJECT_ROLE:
+            return project
+        return None
+
+
+class ProjectCardDelegate(ActionButtonDelegate):
+    """
+    Pinta la tarjeta de un proyecto (nombre, estado, modelo, filamento,
+    coste y botones). Solo se pintan las tarjetas visibles: no hay un
+    QFrame con etiquetas y botones por proyecto.
+    """
+
+    CARD_SIZE = QSize(320, 240)
+    MARGIN = 20
+    BUTTON_HEIGHT = 28
+
+    def __init__(self, parent=None):
+        super().__init__([
+            ('edit', "Editar", "#007BFF"),
+            ('delete', "Eliminar", "#f44336"),
+        ], parent)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def _card_rect(self, option):
+        return QRect(option.rect.topLeft(), self.CARD_SIZE)
+
+    def _button_rects(self, option):
+        card = self._card_rect(option)
+        metrics = option.fontMetrics
+        top = card.bottom() - self.MARGIN - self.BUTTON_HEIGHT
+        x = card.left() + self.MARGIN
+        width = (card.width() - 2 * self.MARGIN - self.SPACING * 2) // len(self.buttons)
+        rects = []
+        for button in self.buttons:
+            button_width = max(width, metrics.horizontalAdvance(button.label) + 2 * self.PADDING)
+            rects.append(QRect(x, top, button_width, self.BUTTON_HEIGHT))
+            x += button_width + self.SPACING * 2
+        return rects
+
+    @staticmethod
+    def _font(base, pixel_size, bold=False):
+        font = QFont(base)
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    def paint(self, painter, option, index):
+        project = index.data(PROJECT_ROLE)
+        card = self._card_rect(option)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        painter.setPen(QPen(QColor("#3a3a3a"), 1))
+        painter.setBrush(QColor("#2a2a2a"))
+        painter.drawRoundedRect(card.adjusted(0, 0, -1, -1), 8, 8)
+
+        inner = card.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        y = inner.top()
+
+        # Nombre del proyecto (hasta dos líneas)
+        painter.setFont(self._font(option.font, 18, bold=True))
+        painter.setPen(QColor("white"))
+        name_rect = QRect(inner.left(), y, inner.width(), 48)
+        bounds = painter.drawText(name_rect, Qt.TextWordWrap | Qt.AlignLeft | Qt.AlignTop,
+                                  project['name'])
+        y += min(bounds.height(), name_rect.height()) + 10
+
+        # Estado
+        status = project['status']
+        painter.setFont(self._font(option.font, 14, bold=True))
+        painter.setPen(QColor(STATUS_COLORS.get(status, '#888')))
+        painter.drawText(QRect(inner.left(), y, inner.width(), 20), Qt.AlignLeft, f"Estado: {status}")
+        y += 30
+
+        # Modelo y filamento
+        model_name = project.get('model_name') or "Sin modelo"
+        filament_info = (f"{project['filament_brand']} {project['material_type']}"
+                         if project.get('filament_brand') else "Sin filamento")
+        painter.setFont(self._font(option.font, 12))
+        painter.setPen(QColor("#aaa"))
+        metrics = painter.fontMetrics()
+        for line in (f"Modelo: {model_name}", f"Filamento: {filament_info}"):
+            painter.drawText(QRect(inner.left(), y, inner.width(), 16), Qt.AlignLeft,
+                             metrics.elidedText(line, Qt.ElideRight, inner.width()))
+            y += 18
+        y += 8
+
+        # Coste total
+        total_cost = project.get('total_cost') or 0
+        painter.setFont(self._font(option.font, 16, bold=True))
+        painter.setPen(QColor("#28a745"))
+        painter.drawText(QRect(inner.left(), y, inner.width(), 22), Qt.AlignLeft,
+                         f"Coste: {total_cost:.2f} €")
+        painter.restore()
+
+        painter.save()
+        painter.setFont(self._font(option.font, 12))
+        self._paint_buttons(painter, option)
+        painter.restore()
+
+
+class ProjectGridView(QListView):
+    """QListView en modo icono que reparte las tarjetas según el ancho."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setStyleSheet("QListView { border: none; background-color: transparent; }")
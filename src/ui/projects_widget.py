@@ -9,6 +9,8 @@ from src.logic.project_manager import ProjectManager
 from src.logic.library_manager import LibraryManager
 from src.logic.inventory_manager import InventoryManager
 from src.logic.report_generator import ReportGenerator
+from src.logic.mesh_analysis import MeshAnalyzer
+from src.ui.project_cards import ProjectListModel, ProjectCardDelegate, ProjectGridView
 from datetime import datetime  # M9: Necesario para registrar completed_at
 
 class ProjectsWidget(QWidget):
@@ -19,6 +21,8 @@ class ProjectsWidget(QWidget):
         self.auth_manager = auth_manager
         self.user = auth_manager.get_current_user()
         self.project_manager = ProjectManager()
+        # Las estadísticas del informe se leen con la conexión de solo lectura
+        self.stats_manager = ProjectManager(self.project_manager.db.reader())
         self.library_manager = LibraryManager()
         self.inventory_manager = InventoryManager()
         self.report_generator = ReportGenerator()
@@ -84,146 +88,61 @@ class ProjectsWidget(QWidget):
         
         layout.addLayout(header_layout)
         
-        # Área de scroll para proyectos
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("border: none; background-color: transparent;")
-        
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background-color: transparent;")
-        self.projects_layout = QGridLayout(scroll_content)
-        self.projects_layout.setSpacing(20)
-        self.projects_layout.setContentsMargins(0, 0, 0, 0)
-        
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
+        # Rejilla virtualizada: solo se pintan las tarjetas visibles
+        self.projects_model = ProjectListModel(self)
+        self.card_delegate = ProjectCardDelegate(self)
+        self.card_delegate.action_triggered.connect(self.on_card_action)
+        self.projects_view = ProjectGridView()
+        self.projects_view.setModel(self.projects_model)
+        self.projects_view.setItemDelegate(self.card_delegate)
+        layout.addWidget(self.projects_view)
+
+        # Mensaje si no hay proyectos
+        self.no_projects = QLabel("No tienes proyectos aún. ¡Crea tu primer proyecto!")
+        self.no_projects.setStyleSheet("color: #888; font-size: 16px; padding: 40px;")
+        self.no_projects.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.no_projects)
+
+        self.projects_model.rowsInserted.connect(self.update_empty_state)
+        self.projects_model.rowsRemoved.connect(self.update_empty_state)
+        self.projects_model.modelReset.connect(self.update_empty_state)
+
         self.setLayout(layout)
         
         # Cargar proyectos
         self.load_projects()
     
     def load_projects(self):
-        """Carga y muestra todos los proyectos del usuario."""
-        # Limpiar layout
-        for i in reversed(range(self.projects_layout.count())):
-            widget = self.projects_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        # Obtener proyectos
-        projects = self.project_manager.get_all_projects(self.user['id'])
-        
-        if not projects:
-            # Mensaje si no hay proyectos
-            no_projects = QLabel("No tienes proyectos aún. ¡Crea tu primer proyecto!")
-            no_projects.setStyleSheet("color: #888; font-size: 16px; padding: 40px;")
-            no_projects.setAlignment(Qt.AlignCenter)
-            self.projects_layout.addWidget(no_projects, 0, 0)
-            return
-        
-        # Mostrar proyectos en grid
-        col_count = 3
-        for i, project in enumerate(projects):
-            card = self.create_project_card(project)
-            row = i // col_count
-            col = i % col_count
-            self.projects_layout.addWidget(card, row, col)
-    
-    def create_project_card(self, project):
-        """Crea una tarjeta de proyecto."""
-        card = QFrame()
-        card.setObjectName("Card")
-        card.setFixedSize(320, 240)
-        
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(10)
-        
-        # Nombre del proyecto
-        name = QLabel(project['name'])
-        name.setStyleSheet("font-size: 18px; font-weight: bold; color: white;")
-        name.setWordWrap(True)
-        layout.addWidget(name)
-
-        # Estado
-        status = project['status']
-        status_label = QLabel(f"Estado: {status}")
-        status_colors = {
-            'Pendiente': '#FFA500',
-            'En Progreso': '#007BFF',
-            'Completado': '#28a745'
-        }
-        color = status_colors.get(status, '#888')
-        status_label.setStyleSheet(f"color: {color}; font-weight: bold;")
-        layout.addWidget(status_label)
+        """Carga todos los proyectos del usuario (recarga completa)."""
+        self.projects_model.set_projects(self.project_manager.get_all_projects(self.user['id']))
 
-        # Modelo y filamento
-        model_name = project['model_name'] if project['model_name'] else "Sin modelo"
-        filament_info = (f"{project['filament_brand']} {project['material_type']}"
-                         if project['filament_brand'] else "Sin filamento")
-
-        info = QLabel(f"Modelo: {model_name}\nFilamento: {filament_info}")
-        info.setStyleSheet("color: #aaa; font-size: 12px;")
-        info.setWordWrap(True)
-        layout.addWidget(info)
-
-        # Coste total
-        total_cost = project['total_cost'] or 0
-        cost_label = QLabel(f"Coste: {total_cost:.2f} €")
-        cost_label.setStyleSheet("color: #28a745; font-size: 16px; font-weight: bold;")
-        layout.addWidget(cost_label)
-
-        layout.addStretch()
+    def refresh_project(self, project_id):
+        """Actualiza solo la tarjeta de un proyecto creado o editado."""
+        project = self.project_manager.get_project_by_id(project_id) if project_id else None
+        if project:
+            self.projects_model.upsert_project(project)
+        else:
+            self.load_projects()
 
-        # Botones de acción
-        btn_layout = QHBoxLayout()
+    def update_empty_state(self):
+        empty = self.projects_model.rowCount() == 0
+        self.no_projects.setVisible(empty)
+        self.projects_view.setVisible(not empty)
 
-        btn_edit = QPushButton("Editar")
-        btn_edit.setCursor(Qt.PointingHandCursor)
-        btn_edit.setStyleSheet("""
-            QPushButton {
-                background-color: #007BFF;
-                color: white;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-        """)
-        btn_edit.clicked.connect(lambda checked, pid=project['id']: self.edit_project(pid))
-        btn_layout.addWidget(btn_edit)
-
-        btn_delete = QPushButton("Eliminar")
-        btn_delete.setCursor(Qt.PointingHandCursor)
-        btn_delete.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
-        btn_delete.clicked.connect(lambda checked, pid=project['id'], pname=project['name']: self.delete_project(pid, pname))
-        btn_layout.addWidget(btn_delete)
-        
-        layout.addLayout(btn_layout)
-        
-        return card
+    def on_card_action(self, action, project_id):
+        if action == 'edit':
+            self.edit_project(project_id)
+        elif action == 'delete':
+            row = self.projects_model.row_of(project_id)
+            if row >= 0:
+                name = self.projects_model.index(row).data()
+                self.delete_project(project_id, name)
     
     def open_new_project_dialog(self):
         """Abre el diálogo para crear un nuevo proyecto."""
         dialog = ProjectDialog(self, self.user['id'], self.library_manager, self.inventory_manager)
         if dialog.exec_() == QDialog.Accepted:
-            self.load_projects()
+            self.refresh_project(dialog.saved_project_id)
     
     def edit_project(self, project_id):
         """Abre el diálogo para editar un proyecto."""
@@ -232,7 +151,7 @@ class ProjectsWidget(QWidget):
             dialog = ProjectDialog(self, self.user['id'], self.library_manager, 
                                   self.inventory_manager, project)
             if dialog.exec_() == QDialog.Accepted:
-                self.load_projects()
+                self.refresh_project(project_id)
     
     def delete_project(self, project_id, project_name):
         """Elimina un proyecto."""
@@ -241,14 +160,14 @@ class ProjectsWidget(QWidget):
             success, message = self.project_manager.delete_project(project_id)
             
             if success:
+                self.projects_model.remove_project(project_id)
                 MessageBoxHelper.show_info(self.window(), "Éxito", message)
-                self.load_projects()
             else:
                 MessageBoxHelper.show_warning(self.window(), "Error", message)
 
     def export_stats(self):
         """Exporta las estadísticas de proyectos a PDF."""
-        stats = self.project_manager.get_project_stats(self.user['id'])
+        stats = self.stats_manager.get_project_stats(self.user['id'])
         
         if not stats or stats['total_projects'] == 0:
             MessageBoxHelper.show_warning(self, "Aviso", "No hay datos suficientes para generar un informe.")
@@ -280,6 +199,8 @@ class ProjectDialog(QDialog):
         self.project_manager = ProjectManager()
         self.project = project
         self.is_edit = project is not None
+        # Id del proyecto guardado, para actualizar solo su tarjeta
+        self.saved_project_id = project['id'] if project else None
         
         self.setWindowTitle("Editar Proyecto" if self.is_edit else "Nuevo Proyecto")
         self.setMinimumSize(500, 600)
@@ -347,7 +268,29 @@ class ProjectDialog(QDialog):
         self.weight_input.setStyleSheet(self.get_input_style())
         if self.is_edit and self.project.get('weight_grams'):
             self.weight_input.setValue(self.project['weight_grams'])
-        form_layout.addRow("Peso:", self.weight_input)
+
+        # Estimación desde el análisis de malla del modelo
+        self.btn_estimate = QPushButton("Estimar")
+        self.btn_estimate.setCursor(Qt.PointingHandCursor)
+        self.btn_estimate.setToolTip("Estima el peso a partir del volumen del modelo\n"
+                                     "(2 perímetros, 20% de relleno, densidad del filamento)")
+        self.btn_estimate.setStyleSheet("""
+            QPushButton {
+                background-color: #00bcd4;
+                color: #000000;
+                border-radius: 4px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #26c6da;
+            }
+        """)
+        self.btn_estimate.clicked.connect(self.estimate_weight)
+        weight_layout = QHBoxLayout()
+        weight_layout.addWidget(self.weight_input)
+        weight_layout.addWidget(self.btn_estimate)
+        form_layout.addRow("Peso:", weight_layout)
 
         # Tiempo de impresión
         self.time_input = QDoubleSpinBox()
@@ -400,6 +343,23 @@ class ProjectDialog(QDialog):
         layout.addLayout(btn_layout)
         self.setLayout(layout)
     
+    def estimate_weight(self):
+        """Rellena el peso con la estimación del modelo y filamento elegidos."""
+        model_id = self.model_combo.currentData()
+        if not model_id:
+            MessageBoxHelper.show_warning(self, "Estimar peso", "Selecciona un modelo primero")
+            return
+        estimate = MeshAnalyzer(self.library_manager.db).estimate_for_model(
+            model_id, self.filament_combo.currentData()
+        )
+        if estimate is None:
+            MessageBoxHelper.show_warning(
+                self, "Estimar peso",
+                "El modelo aún no se ha analizado. Ábrelo en la Biblioteca y vuelve a intentarlo."
+            )
+            return
+        self.weight_input.setValue(round(estimate['grams'], 1))
+
     def load_models(self):
         """Carga los modelos disponibles."""
         self.model_combo.addItem("Sin modelo", None)
@@ -462,10 +422,7 @@ class ProjectDialog(QDialog):
                 # RF3: Descontar filamento al completar (solo si NO estaba ya completado)
                 was_completed = self.project['status'] == "Completado"
                 if status == "Completado" and not was_completed and filament_id and weight > 0:
-                    filament = self.inventory_manager.get_filament_by_id(filament_id)
-                    if filament:
-                        nuevo_peso = max(0, filament['weight_current'] - weight)
-                        self.inventory_manager.update_filament_weight(filament_id, nuevo_peso)
+                    self.inventory_manager.consume_filaments({filament_id: weight})
         else:
             success, message = self.project_manager.create_project(
                 self.user_id, name, description, model_id, filament_id,
@@ -473,16 +430,14 @@ class ProjectDialog(QDialog):
             )
 
             if success:
-                projects = self.project_manager.get_all_projects(self.user_id)
+                projects = self.project_manager.get_all_projects_paged(self.user_id, limit=1)
                 if projects:
+                    self.saved_project_id = projects[0]['id']
                     self.project_manager.update_project(projects[0]['id'], **costs)
 
                 # RF3: Descontar filamento si se crea directamente como "Completado"
                 if status == "Completado" and filament_id and weight > 0:
-                    filament = self.inventory_manager.get_filament_by_id(filament_id)
-                    if filament:
-                        nuevo_peso = max(0, filament['weight_current'] - weight)
-                        self.inventory_manager.update_filament_weight(filament_id, nuevo_peso)
+                    self.inventory_manager.consume_filaments({filament_id: weight})
         
         if success:
             self.accept()
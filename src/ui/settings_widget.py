@@ -1,6 +1,9 @@
+from datetime import datetime
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QComboBox, QCheckBox, QTextEdit, QPushButton, QFrame, QMessageBox,
-                             QFileDialog)
+                             QFileDialog, QScrollArea, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView)
 from src.ui.utils import MessageBoxHelper
 from PyQt5.QtCore import Qt, pyqtSignal
 from src.utils.translator import translator
@@ -11,8 +14,17 @@ class SettingsWidget(QWidget):
     logout_requested = pyqtSignal()  # Señal para cerrar sesión
     exit_requested = pyqtSignal()    # Señal para salir de la app
     
-    def __init__(self):
+    # Columnas del panel de diagnóstico: título y clave de QueryStats.snapshot()
+    DIAG_COLUMNS = [
+        ("Consulta", 'sql'), ("Ejecuciones", 'count'), ("Total (ms)", 'total_ms'),
+        ("p50 (ms)", 'p50_ms'), ("p95 (ms)", 'p95_ms'), ("p99 (ms)", 'p99_ms'),
+        ("Máx (ms)", 'max_ms'),
+    ]
+    DIAG_ROWS = 50
+
+    def __init__(self, db_manager=None):
         super().__init__()
+        self.db = db_manager or DBManager()
         self.init_ui()
         
         # Conectar cambio de idioma
@@ -24,7 +36,18 @@ class SettingsWidget(QWidget):
         self.lang_combo.setCurrentIndex(lang_index)
 
     def init_ui(self):
-        main_layout = QVBoxLayout()
+        # El contenido va en un QScrollArea: con el panel de diagnóstico no
+        # cabe en ventanas pequeñas
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        scroll.setStyleSheet("QScrollArea { background-color: transparent; }")
+        content = QWidget()
+        outer_layout = QVBoxLayout()
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.addWidget(scroll)
+
+        main_layout = QVBoxLayout(content)
         main_layout.setSpacing(20)
         main_layout.setContentsMargins(30, 30, 30, 30)
         
@@ -148,9 +171,102 @@ class SettingsWidget(QWidget):
         report_layout.addLayout(btn_layout)
 
         main_layout.addWidget(report_frame)
-        
+
+        main_layout.addWidget(self._build_diagnostics_frame())
+
         main_layout.addStretch()
-        self.setLayout(main_layout)
+        scroll.setWidget(content)
+        self.setLayout(outer_layout)
+
+    def _build_diagnostics_frame(self):
+        """Sección Diagnóstico: tiempos de las consultas SQL (QueryStats)."""
+        diag_frame = QFrame()
+        diag_frame.setObjectName("Card")
+        diag_layout = QVBoxLayout(diag_frame)
+        diag_layout.setContentsMargins(20, 20, 20, 20)
+
+        diag_title = QLabel("Diagnóstico")
+        diag_title.setStyleSheet("font-size: 18px; font-weight: 600; color: #e0e0e0; border: none; margin-bottom: 10px;")
+        diag_layout.addWidget(diag_title)
+
+        self.diag_summary = QLabel()
+        self.diag_summary.setStyleSheet("color: #b0b0b0; border: none;")
+        diag_layout.addWidget(self.diag_summary)
+
+        self.diag_table = QTableWidget(0, len(self.DIAG_COLUMNS))
+        self.diag_table.setHorizontalHeaderLabels([header for header, _ in self.DIAG_COLUMNS])
+        self.diag_table.verticalHeader().setVisible(False)
+        self.diag_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diag_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.diag_table.setWordWrap(False)
+        header = self.diag_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(self.DIAG_COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.diag_table.setMinimumHeight(220)
+        diag_layout.addWidget(self.diag_table)
+
+        slow_label = QLabel("Consultas lentas recientes (con su plan de ejecución):")
+        slow_label.setStyleSheet("color: #b0b0b0; border: none; margin-top: 10px;")
+        diag_layout.addWidget(slow_label)
+
+        self.diag_slow = QTextEdit()
+        self.diag_slow.setReadOnly(True)
+        self.diag_slow.setMinimumHeight(120)
+        self.diag_slow.setStyleSheet("font-family: monospace; font-size: 12px;")
+        diag_layout.addWidget(self.diag_slow)
+
+        diag_buttons = QHBoxLayout()
+        btn_refresh = QPushButton("Actualizar")
+        btn_refresh.setCursor(Qt.PointingHandCursor)
+        btn_refresh.setObjectName("btn_primary")
+        btn_refresh.clicked.connect(self.refresh_diagnostics)
+        btn_reset = QPushButton("Reiniciar estadísticas")
+        btn_reset.setCursor(Qt.PointingHandCursor)
+        btn_reset.clicked.connect(self.reset_diagnostics)
+        diag_buttons.addWidget(btn_refresh)
+        diag_buttons.addWidget(btn_reset)
+        diag_buttons.addStretch()
+        diag_layout.addLayout(diag_buttons)
+        return diag_frame
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        """Vuelca en el panel las estadísticas de consultas del DBManager."""
+        stats = self.db.stats
+        summary = stats.summary()
+        since = datetime.fromtimestamp(summary['since']).strftime('%H:%M:%S')
+        self.diag_summary.setText(
+            f"{summary['executions']} ejecuciones de {summary['statements']} consultas distintas "
+            f"({summary['total_ms']:.1f} ms en total) desde las {since}. "
+            f"Lentas (≥ {stats.slow_ms:.0f} ms): {summary['slow']}."
+        )
+
+        rows = stats.snapshot(self.DIAG_ROWS)
+        self.diag_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.DIAG_COLUMNS):
+                value = row[key]
+                item = QTableWidgetItem(value if key == 'sql' else str(value))
+                if key == 'sql':
+                    item.setToolTip(value)
+                else:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.diag_table.setItem(r, c, item)
+
+        lines = []
+        for slow in stats.slow_queries():
+            when = datetime.fromtimestamp(slow['at']).strftime('%H:%M:%S')
+            lines.append(f"[{when}] {slow['ms']:.1f} ms  {slow['sql']}")
+            lines.extend(f"    {line}" for line in slow['plan'])
+        self.diag_slow.setPlainText('\n'.join(lines) or "Ninguna.")
+
+    def reset_diagnostics(self):
+        self.db.stats.reset()
+        self.refresh_diagnostics()
 
     def handle_logout(self):
         """Emite señal para cerrar sesión y volver al login."""
@@ -162,8 +278,7 @@ class SettingsWidget(QWidget):
 
     def backup_database(self):
         """M10: Crea una copia de seguridad de la base de datos."""
-        db = DBManager()
-        source = db.db_file
+        source = self.db.db_file
         
         dest, _ = QFileDialog.getSaveFileName(
             self, "Guardar copia de seguridad", "formexa_backup.db",
@@ -0,0 +1,194 @@
+from collections import namedtuple
+
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                          QRect, QSize, QEvent, pyqtSignal)
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+# Columna de una tabla paginada: título, clave del dict de la fila (también
+# la clave de orden que entiende el manager; None = no ordenable) y una
+# función opcional para formatear el valor.
+Column = namedtuple('Column', ['header', 'key', 'fmt', 'align'], defaults=(None, None))
+
+# Botón pintado por ActionButtonDelegate: acción emitida, texto y color
+ActionButton = namedtuple('ActionButton', ['action', 'label', 'color'])
+
+ID_ROLE = Qt.UserRole
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla que carga las filas de SQLite por páginas a medida que la
+    vista se desplaza (canFetchMore/fetchMore). El orden y el filtro se
+    resuelven en SQL con las funciones del manager:
+
+        fetch_page(offset, limit, sort, descending, search) -> [dict]
+        count(search) -> int
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, columns, fetch_page, count, sort=None, descending=False, parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self._fetch_page = fetch_page
+        self._count = count
+        self._sort = sort
+        self._descending = descending
+        self._search = ""
+        self._rows = []
+        self._total = 0
+
+    # --- API propia ---
+
+    def reload(self):
+        """Vuelve a consultar desde el principio (tras crear, editar o borrar)."""
+        self.beginResetModel()
+        self._total = self._count(self._search or None)
+        self._rows = self._load(0)
+        self.endResetModel()
+
+    def set_search(self, text):
+        text = (text or "").strip()
+        if text != self._search:
+            self._search = text
+            self.reload()
+
+    def total_count(self):
+        return self._total
+
+    def row_data(self, row):
+        return self._rows[row]
+
+    def _load(self, offset):
+        return self._fetch_page(offset, self.PAGE_SIZE, self._sort, self._descending,
+                                self._search or None)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self._load(len(self._rows))
+        if not rows:
+            # La tabla cambió por debajo: se ajusta el total a lo cargado
+            self._total = len(self._rows)
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            if column.key is None:
+                return None
+            value = row.get(column.key)
+            if column.fmt:
+                return column.fmt(value)
+            return "" if value is None else str(value)
+        if role == ID_ROLE:
+            return row.get('id')
+        if role == Qt.TextAlignmentRole and column.align is not None:
+            return column.align
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section].header
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = self.columns[column].key if 0 <= column < len(self.columns) else None
+        if key is None:
+            return
+        self._sort = key
+        self._descending = order == Qt.DescendingOrder
+        self.reload()
+
+
+class SqlSortFilterProxyModel(QSortFilterProxyModel):
+    """
+    Proxy de ordenación y filtrado para PagedTableModel. Con filas que aún no
+    se han cargado, ordenar o filtrar en memoria daría resultados parciales:
+    el proxy traslada ambas operaciones a la consulta SQL del modelo.
+    """
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def set_search_text(self, text):
+        self.sourceModel().set_search(text)
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """
+    Pinta botones de acción en una celda sin crear widgets por fila. Al
+    pulsar uno emite action_triggered(acción, id de la fila).
+    """
+    action_triggered = pyqtSignal(str, int)
+
+    BUTTON_HEIGHT = 26
+    SPACING = 4
+    PADDING = 12
+
+    def __init__(self, buttons, parent=None):
+        super().__init__(parent)
+        self.buttons = [ActionButton(*b) for b in buttons]
+
+    def _button_rects(self, option):
+        metrics = option.fontMetrics
+        rect = option.rect
+        top = rect.top() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        x = rect.left() + self.SPACING
+        rects = []
+        for button in self.buttons:
+            width = metrics.horizontalAdvance(button.label) + 2 * self.PADDING
+            rects.append(QRect(x, top, width, self.BUTTON_HEIGHT))
+            x += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        self._paint_buttons(painter, option)
+
+    def _paint_buttons(self, painter, option):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        for button, rect in zip(self.buttons, self._button_rects(option)):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(button.color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignCenter, button.label)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        rects = self._button_rects(option)
+        width = (rects[-1].right() - option.rect.left() + self.SPACING) if rects else 0
+        return super().sizeHint(option, index).expandedTo(QSize(width, self.BUTTON_HEIGHT + 8))
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            for button, rect in zip(self.buttons, self._button_rects(option)):
+                if rect.contains(event.pos()):
+                    self.action_triggered.emit(button.action, index.data(ID_ROLE))
+                    return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,37 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.database.db_manager import DBManager
+from src.logic.thumbnails import ThumbnailCache
+
+
+class ThumbnailWorker(QThread):
+    """
+    Genera en segundo plano las miniaturas de una lista de modelos. La
+    escritura en la BD la hace el widget al recibir la señal, en el hilo de
+    la interfaz (la conexión SQLite no se comparte entre hilos).
+    """
+    thumbnail_ready = pyqtSignal(int, str)   # id del modelo, ruta del PNG
+    thumbnail_failed = pyqtSignal(int)       # id del modelo sin miniatura posible
+
+    def __init__(self, models, cache=None, parent=None, db_manager=None):
+        super().__init__(parent)
+        # models: [(id, ruta del archivo)]
+        self.models = list(models)
+        self.cache = cache or ThumbnailCache()
+        self.db = db_manager or DBManager()
+
+    def run(self):
+        try:
+            ids_by_path = {}
+            for model_id, file_path in self.models:
+                ids_by_path.setdefault(file_path, []).append(model_id)
+            for file_path, thumbnail_path in self.cache.generate_batch(ids_by_path):
+                if self.isInterruptionRequested():
+                    break
+                for model_id in ids_by_path[file_path]:
+                    if thumbnail_path:
+                        self.thumbnail_ready.emit(model_id, thumbnail_path)
+                    else:
+                        self.thumbnail_failed.emit(model_id)
+        finally:
+            self.db.release_thread_connections()
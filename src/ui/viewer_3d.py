@@ -1,25 +1,177 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from mpl_toolkits.mplot3d import art3d
-import trimesh
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 import numpy as np
 from src.utils.logger import logger
+from src.logic.mesh_lod import (
+    MeshLoadCancelled, MeshLODCache, compute_vertex_normals, load_mesh, simplify_mesh
+)
+from src.ui.viewer_gl import GLMeshView, opengl_available
+
+MAX_PREVIEW_FACES = 5000
+
+
+def load_mesh_arrays(file_path, max_faces=MAX_PREVIEW_FACES, is_cancelled=None, progress=None):
+    """
+    Carga un modelo y devuelve (vertices, faces), simplificados a max_faces
+    caras (None = malla completa). Pensada para ejecutarse fuera del hilo de
+    la interfaz: entre etapas comprueba is_cancelled() y lanza MeshLoadCancelled.
+    """
+    _, vertices, faces = _load_preview(file_path, max_faces, is_cancelled, progress)
+    return vertices, faces
+
+
+def _load_preview(file_path, max_faces, is_cancelled, progress):
+    """Como load_mesh_arrays, pero devuelve también la malla completa de trimesh."""
+    def check():
+        if is_cancelled and is_cancelled():
+            raise MeshLoadCancelled()
+
+    if progress:
+        progress("Leyendo archivo...")
+    mesh = load_mesh(file_path)
+    check()
+
+    if max_faces is not None and len(mesh.faces) > max_faces and progress:
+        progress("Simplificando malla...")
+    vertices, faces = simplify_mesh(mesh, max_faces)
+    check()
+    return mesh, vertices, faces
+
+
+class MeshLoadSignals(QObject):
+    progress = pyqtSignal(int, str)
+    loaded = pyqtSignal(int, object)  # {'vertices', 'faces', 'normals', 'final'}
+    failed = pyqtSignal(int, str)
+    finished = pyqtSignal(int)
+
+
+class MeshLoadTask(QRunnable):
+    """
+    Carga una malla en el QThreadPool del visor. Si el modelo tiene caché de
+    niveles de detalle (MeshLODCache) emite los niveles de menor a mayor
+    detalle; si no, carga el archivo original y genera la caché al terminar.
+    """
+
+    def __init__(self, request_id, file_path, max_faces=MAX_PREVIEW_FACES, with_normals=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.file_path = file_path
+        self.max_faces = max_faces
+        self.with_normals = with_normals
+        self.signals = MeshLoadSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        # trimesh.load no se puede interrumpir: la tarea termina la etapa en
+        # curso y descarta el resultado.
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def _emit_mesh(self, vertices, faces, normals, final):
+        if self.is_cancelled():
+            raise MeshLoadCancelled()
+        self.signals.loaded.emit(self.request_id, {
+            'vertices': vertices, 'faces': faces, 'normals': normals, 'final': final
+        })
+
+    def run(self):
+        try:
+            cache = MeshLODCache.open(self.file_path)
+            if cache is not None:
+                self._run_cached(cache)
+            else:
+                self._run_uncached()
+        except MeshLoadCancelled:
+            pass
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+        finally:
+            self.signals.finished.emit(self.request_id)
+
+    def _run_cached(self, cache):
+        levels = cache.levels_up_to(self.max_faces)
+        for position, level in enumerate(levels):
+            vertices, faces, normals = cache.get_level(level)
+            self._emit_mesh(vertices, faces, normals, position == len(levels) - 1)
+
+    def _run_uncached(self):
+        mesh, vertices, faces = _load_preview(
+            self.file_path, self.max_faces, self.is_cancelled,
+            lambda text: self.signals.progress.emit(self.request_id, text)
+        )
+        normals = None
+        if self.with_normals:
+            self.signals.progress.emit(self.request_id, "Calculando normales...")
+            normals = compute_vertex_normals(vertices, faces)
+        self._emit_mesh(vertices, faces, normals, True)
+
+        # Modelos añadidos antes de existir la caché: se genera para la próxima
+        # vez con la malla ya cargada (sin volver a leer el archivo)
+        try:
+            MeshLODCache.build(self.file_path, is_cancelled=self.is_cancelled, mesh=mesh)
+        except MeshLoadCancelled:
+            raise
+        except Exception as e:
+            logger.warning(f"No se pudo generar la caché LOD de {self.file_path}: {e}")
+
 
 class Viewer3DWidget(QWidget):
-    def __init__(self):
+    """
+    Visor 3D de modelos. backend: 'opengl' (malla completa en la GPU),
+    'matplotlib' (malla simplificada, sin aceleración) o 'auto' para usar
+    OpenGL si se puede crear un contexto y matplotlib en caso contrario.
+    """
+
+    def __init__(self, backend='auto'):
         super().__init__()
+        if backend == 'auto':
+            backend = 'opengl' if opengl_available() else 'matplotlib'
+        self.backend = backend
+
+        # Pool propio: las cargas del visor no compiten con otras tareas globales
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(2)
+        self._load_id = 0
+        self._load_task = None
+        # Tareas vivas (también las canceladas, hasta que el pool las suelte)
+        self._tasks = {}
+
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(0, 0, 0, 0) # Sin márgenes para inmersión
         self.setLayout(self.layout)
-        
-        # Fondo oscuro suave (casi negro pero no #000)
-        self.figure = Figure(figsize=(5, 5), dpi=100, facecolor='#1e1e1e')
-        self.canvas = FigureCanvas(self.figure)
-        self.layout.addWidget(self.canvas)
-        
-        self.ax = self.figure.add_subplot(111, projection='3d')
-        self.configure_axes()
+
+        if self.backend == 'opengl':
+            self.gl_view = GLMeshView()
+            self.layout.addWidget(self.gl_view)
+        else:
+            # matplotlib solo se carga si no hay OpenGL
+            from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+            from matplotlib.figure import Figure
+
+            # Fondo oscuro suave (casi negro pero no #000)
+            self.figure = Figure(figsize=(5, 5), dpi=100, facecolor='#1e1e1e')
+            self.canvas = FigureCanvas(self.figure)
+            self.layout.addWidget(self.canvas)
+
+            self.ax = self.figure.add_subplot(111, projection='3d')
+            self.configure_axes()
+
+        # Estado de carga superpuesto al lienzo
+        self.status_label = QLabel(self)
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.status_label.setStyleSheet("""
+            QLabel {
+                background-color: rgba(30, 30, 30, 200);
+                color: #cfcfcf;
+                font-size: 14px;
+                padding: 10px 18px;
+                border-radius: 8px;
+            }
+        """)
+        self.status_label.hide()
 
     def configure_axes(self):
         self.ax.set_facecolor('#1e1e1e')
@@ -55,6 +207,8 @@ class Viewer3DWidget(QWidget):
 
     def draw_shadow_blob(self):
         """Dibuja una sombra suave en el suelo (Z=0)."""
+        from mpl_toolkits.mplot3d import art3d
+
         # Círculo semitransparente negro en Z=0
         p = np.linspace(0, 2*np.pi, 50)
         r = 80
@@ -70,48 +224,120 @@ class Viewer3DWidget(QWidget):
         poly.set_edgecolor('none')
         self.ax.add_collection3d(poly)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_status_label()
+
+    def _place_status_label(self):
+        self.status_label.adjustSize()
+        x = (self.width() - self.status_label.width()) // 2
+        y = (self.height() - self.status_label.height()) // 2
+        self.status_label.move(max(0, x), max(0, y))
+
+    def _show_status(self, text):
+        self.status_label.setText(text)
+        self._place_status_label()
+        self.status_label.show()
+        self.status_label.raise_()
+
+    def _cancel_pending_load(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+            if self.thread_pool.tryTake(self._load_task):  # aún no había empezado
+                self._tasks.pop(self._load_task.request_id, None)
+            self._load_task = None
+
+    def is_loading(self):
+        return self._load_task is not None
+
     def load_model(self, file_path):
-        """Carga y renderiza un archivo STL."""
+        """
+        Carga un archivo STL en segundo plano. Si se pide otro modelo antes de
+        que termine, la carga anterior se cancela y su resultado se descarta.
+        """
+        self._cancel_pending_load()
+        self._load_id += 1
+
+        if self.backend == 'opengl':
+            task = MeshLoadTask(self._load_id, file_path, max_faces=None, with_normals=True)
+        else:
+            task = MeshLoadTask(self._load_id, file_path)
+        task.signals.progress.connect(self._on_load_progress)
+        task.signals.loaded.connect(self._on_mesh_loaded)
+        task.signals.failed.connect(self._on_load_failed)
+        task.signals.finished.connect(self._on_task_finished)
+        self._load_task = task
+        self._tasks[task.request_id] = task
+
+        self._show_status("Cargando modelo...")
+        self.thread_pool.start(task)
+
+    def clear_model(self):
+        """Cancela la carga en curso y deja el visor vacío."""
+        self._cancel_pending_load()
+        self._load_id += 1
+        self.status_label.hide()
+        if self.backend == 'opengl':
+            self.gl_view.clear()
+            return
+        self.ax.clear()
+        self.configure_axes()
+        self.canvas.draw()
+
+    def _on_task_finished(self, request_id):
+        self._tasks.pop(request_id, None)
+
+    def _on_load_progress(self, request_id, text):
+        if request_id == self._load_id:
+            self._show_status(text)
+
+    def _on_mesh_loaded(self, request_id, mesh):
+        if request_id != self._load_id:
+            return
+        if mesh['final']:
+            self._load_task = None
+        self.status_label.hide()
+        self.render_mesh(mesh['vertices'], mesh['faces'], mesh['normals'])
+
+    def _on_load_failed(self, request_id, message):
+        if request_id != self._load_id:
+            return
+        self._load_task = None
+        self.status_label.hide()
+        logger.error(f"Error al cargar modelo: {message}")
+        if self.backend == 'opengl':
+            self.gl_view.clear()
+            self._show_status("Error al cargar el modelo")
+            return
+        self.ax.clear()
+        self.configure_axes()
+        self.ax.text(0, 0, 0, "Error", color='#ff6b6b', ha='center')
+        self.canvas.draw()
+
+    def render_mesh(self, vertices, faces, normals=None):
+        """Renderiza una malla (ya simplificada si el backend es matplotlib)."""
+        if self.backend == 'opengl':
+            self.gl_view.set_mesh(vertices, faces, normals)
+            return
+
+        from mpl_toolkits.mplot3d import art3d
         self.ax.clear()
         self.configure_axes()
         self.draw_shadow_blob() # Añadir sombra base
-        
-        try:
-            mesh = trimesh.load(file_path)
-            
-            if isinstance(mesh, trimesh.Scene):
-                if len(mesh.geometry) > 0:
-                    mesh = list(mesh.geometry.values())[0]
-                else:
-                    return
-
-            if len(mesh.faces) > 5000:
-                try:
-                    mesh = mesh.simplify_quadratic_decimation(5000)
-                except Exception:
-                    pass
-
-            vertices = mesh.vertices
-            faces = mesh.faces
-
-            # Material moderno: Gris metálico suave con bordes muy sutiles
-            poly3d = art3d.Poly3DCollection(vertices[faces], alpha=0.9)
-            poly3d.set_facecolor('#cfcfcf') # Gris claro para mejor contraste con fondo oscuro
-            poly3d.set_edgecolor('#2a2a2a') # Bordes oscuros sutiles
-            poly3d.set_linewidth(0.05) # Líneas muy finas
-
-            self.ax.add_collection3d(poly3d)
-
-            # Auto-escalado y centrado
-            scale = vertices.flatten()
-            self.ax.auto_scale_xyz(scale, scale, scale)
-            
-            # Ajustar límites para que el modelo quede sobre la sombra (Z>=0)
-            # Esto es aproximado, matplotlib centra la vista
-            
-            self.canvas.draw()
-            
-        except Exception as e:
-            logger.error(f"Error al cargar modelo: {e}")
-            self.ax.text(0, 0, 0, "Error", color='#ff6b6b', ha='center')
-            self.canvas.draw()
+
+        # Material moderno: Gris metálico suave con bordes muy sutiles
+        poly3d = art3d.Poly3DCollection(vertices[faces], alpha=0.9)
+        poly3d.set_facecolor('#cfcfcf') # Gris claro para mejor contraste con fondo oscuro
+        poly3d.set_edgecolor('#2a2a2a') # Bordes oscuros sutiles
+        poly3d.set_linewidth(0.05) # Líneas muy finas
+
+        self.ax.add_collection3d(poly3d)
+
+        # Auto-escalado y centrado
+        scale = vertices.flatten()
+        self.ax.auto_scale_xyz(scale, scale, scale)
+
+        # Ajustar límites para que el modelo quede sobre la sombra (Z>=0)
+        # Esto es aproximado, matplotlib centra la vista
+
+        self.canvas.draw()
@@ -0,0 +1,205 @@
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import (
+    QMatrix4x4, QOpenGLBuffer, QOpenGLContext, QOpenGLShader,
+    QOpenGLShaderProgram, QOpenGLVersionProfile, QVector3D
+)
+from PyQt5.QtWidgets import QOpenGLWidget
+from src.logic.mesh_lod import compute_vertex_normals
+from src.utils.logger import logger
+
+# Constantes de OpenGL usadas (evita depender de PyOpenGL)
+GL_TRIANGLES = 0x0004
+GL_UNSIGNED_INT = 0x1405
+GL_FLOAT = 0x1406
+GL_DEPTH_TEST = 0x0B71
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_DEPTH_BUFFER_BIT = 0x0100
+
+# GLSL 1.20: compatible con Mesa por software (llvmpipe) y drivers antiguos
+VERTEX_SHADER = """
+#version 120
+attribute vec3 a_position;
+attribute vec3 a_normal;
+uniform mat4 u_modelview;
+uniform mat4 u_projection;
+varying vec3 v_normal;
+void main() {
+    v_normal = mat3(u_modelview) * a_normal;
+    gl_Position = u_projection * u_modelview * vec4(a_position, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+uniform vec3 u_color;
+varying vec3 v_normal;
+void main() {
+    // Iluminación a dos caras: los STL suelen tener normales invertidas
+    float diffuse = abs(dot(normalize(v_normal), vec3(0.0, 0.0, 1.0)));
+    gl_FragColor = vec4(u_color * (0.25 + 0.75 * diffuse), 1.0);
+}
+"""
+
+_available = None
+
+
+def opengl_available():
+    """Comprueba (una sola vez) si se puede crear un contexto OpenGL."""
+    global _available
+    if _available is None:
+        try:
+            context = QOpenGLContext()
+            # Los shaders y versionFunctions(2.0) requieren OpenGL de escritorio
+            _available = context.create() and not context.isOpenGLES()
+        except Exception as e:
+            logger.warning(f"OpenGL no disponible: {e}")
+            _available = False
+    return _available
+
+
+class GLMeshView(QOpenGLWidget):
+    """
+    Visor de mallas con OpenGL. Los vértices (posición + normal intercalados)
+    y los índices se suben una vez a buffers de la GPU; rotar o hacer zoom
+    solo cambia las matrices, así que funciona con millones de triángulos.
+    """
+
+    BACKGROUND = (0x1e / 255, 0x1e / 255, 0x1e / 255)
+    MESH_COLOR = QVector3D(0xcf / 255, 0xcf / 255, 0xcf / 255)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.gl = None
+        self.program = None
+        self.vertex_buffer = None
+        self.index_buffer = None
+        self._index_count = 0
+        self._pending = None
+
+        self._center = QVector3D(0, 0, 0)
+        self._radius = 100.0
+        self._distance = 300.0
+        self._azimuth = 45.0
+        self._elevation = 25.0
+        self._last_pos = None
+
+    def set_mesh(self, vertices, faces, normals=None):
+        """Programa la subida de la malla; se hace en el próximo paintGL."""
+        vertices = np.asarray(vertices, dtype=np.float32)
+        faces = np.asarray(faces, dtype=np.uint32)
+        if len(vertices) == 0 or len(faces) == 0:
+            # Malla vacía (p. ej. un STL sin triángulos): no hay caja que encuadrar
+            self.clear()
+            return
+        if normals is None:
+            normals = compute_vertex_normals(vertices, faces)
+        self._pending = (np.hstack([vertices, normals]).astype(np.float32), faces)
+
+        vmin, vmax = vertices.min(axis=0), vertices.max(axis=0)
+        center = (vmin + vmax) / 2
+        self._center = QVector3D(*map(float, center))
+        self._radius = max(float(np.linalg.norm(vmax - vmin)) / 2, 1e-3)
+        self._distance = self._radius * 2.8
+        self.update()
+
+    def clear(self):
+        self._pending = (np.zeros((0, 6), dtype=np.float32), np.zeros((0, 3), dtype=np.uint32))
+        self.update()
+
+    # --- Ciclo de vida de OpenGL ---
+
+    def initializeGL(self):
+        profile = QOpenGLVersionProfile()
+        profile.setVersion(2, 0)
+        self.gl = self.context().versionFunctions(profile)
+        self.gl.initializeOpenGLFunctions()
+        self.gl.glEnable(GL_DEPTH_TEST)
+        self.gl.glClearColor(*self.BACKGROUND, 1.0)
+
+        self.program = QOpenGLShaderProgram(self)
+        self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, VERTEX_SHADER)
+        self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, FRAGMENT_SHADER)
+        self.program.bindAttributeLocation('a_position', 0)
+        self.program.bindAttributeLocation('a_normal', 1)
+        if not self.program.link():
+            logger.error(f"Error enlazando shaders: {self.program.log()}")
+
+        self.vertex_buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self.vertex_buffer.create()
+        self.vertex_buffer.setUsagePattern(QOpenGLBuffer.StaticDraw)
+        self.index_buffer = QOpenGLBuffer(QOpenGLBuffer.IndexBuffer)
+        self.index_buffer.create()
+        self.index_buffer.setUsagePattern(QOpenGLBuffer.StaticDraw)
+
+    def _upload_pending(self):
+        interleaved, faces = self._pending
+        self._pending = None
+        self.vertex_buffer.bind()
+        self.vertex_buffer.allocate(interleaved.tobytes(), interleaved.nbytes)
+        self.vertex_buffer.release()
+        self.index_buffer.bind()
+        self.index_buffer.allocate(faces.tobytes(), faces.nbytes)
+        self.index_buffer.release()
+        self._index_count = faces.size
+
+    def resizeGL(self, width, height):
+        self.gl.glViewport(0, 0, width, height)
+
+    def paintGL(self):
+        self.gl.glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        if self._pending is not None:
+            self._upload_pending()
+        if not self._index_count:
+            return
+
+        projection = QMatrix4x4()
+        aspect = self.width() / max(1, self.height())
+        projection.perspective(35.0, aspect, self._radius * 0.05, self._distance + self._radius * 4)
+
+        # Eje Z hacia arriba, como en el visor de matplotlib
+        modelview = QMatrix4x4()
+        modelview.translate(0, 0, -self._distance)
+        modelview.rotate(self._elevation - 90.0, 1, 0, 0)
+        modelview.rotate(-self._azimuth, 0, 0, 1)
+        modelview.translate(-self._center)
+
+        self.program.bind()
+        self.program.setUniformValue('u_projection', projection)
+        self.program.setUniformValue('u_modelview', modelview)
+        self.program.setUniformValue('u_color', self.MESH_COLOR)
+
+        self.vertex_buffer.bind()
+        self.index_buffer.bind()
+        self.program.enableAttributeArray(0)
+        self.program.enableAttributeArray(1)
+        self.program.setAttributeBuffer(0, GL_FLOAT, 0, 3, 24)
+        self.program.setAttributeBuffer(1, GL_FLOAT, 12, 3, 24)
+        self.gl.glDrawElements(GL_TRIANGLES, self._index_count, GL_UNSIGNED_INT, None)
+        self.program.disableAttributeArray(0)
+        self.program.disableAttributeArray(1)
+        self.index_buffer.release()
+        self.vertex_buffer.release()
+        self.program.release()
+
+    # --- Interacción: arrastrar para orbitar, rueda para zoom ---
+
+    def mousePressEvent(self, event):
+        self._last_pos = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self._last_pos is None or not event.buttons() & Qt.LeftButton:
+            return
+        delta = event.pos() - self._last_pos
+        self._last_pos = event.pos()
+        self._azimuth = (self._azimuth + delta.x() * 0.5) % 360
+        self._elevation = max(-89.0, min(89.0, self._elevation + delta.y() * 0.5))
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._last_pos = None
+
+    def wheelEvent(self, event):
+        factor = 0.9 if event.angleDelta().y() > 0 else 1.1
+        self._distance = max(self._radius * 1.1, min(self._radius * 20, self._distance * factor))
+        self.update()
@@ -40,3 +40,25 @@ def setup_logger(name="Gestor3D"):
 
 # Instancia global para importar fácilmente
 logger = setup_logger()
+
+
+def setup_slow_query_logger(name="Gestor3D.slow_queries"):
+    """
+    Logger de consultas lentas (QueryStats): escribe solo en
+    logs/slow_queries.log, sin pasar por la consola ni por app.log.
+    """
+    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+
+    slow_logger = logging.getLogger(name)
+    slow_logger.setLevel(logging.INFO)
+    slow_logger.propagate = False
+    if not slow_logger.handlers:
+        handler = RotatingFileHandler(os.path.join(log_dir, 'slow_queries.log'),
+                                      maxBytes=2*1024*1024, backupCount=2, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        slow_logger.addHandler(handler)
+    return slow_logger
+
+
+slow_query_logger = setup_slow_query_logger()
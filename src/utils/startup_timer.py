@@ -0,0 +1,208 @@
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils.logger import logger
+
+# Traza de arranque: FORMEXA_TRACE_STARTUP=1 (solo log) o =ruta.json, o bien
+# --trace-startup / --trace-startup=ruta.json en la línea de comandos
+TRACE_ENV = 'FORMEXA_TRACE_STARTUP'
+TRACE_FLAG = '--trace-startup'
+# Cerrar la aplicación tras el primer frame (benchmarks/bench_startup.py)
+QUIT_FLAG = '--quit-after-startup'
+
+
+def trace_request(argv=None, environ=None):
+    """None si no se pidió la traza; si no, la ruta del JSON ('' = solo log)."""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    for arg in argv[1:]:
+        if arg == TRACE_FLAG:
+            return ''
+        if arg.startswith(TRACE_FLAG + '='):
+            return arg.split('=', 1)[1]
+    value = environ.get(TRACE_ENV, '')
+    if value in ('', '0'):
+        return None
+    return '' if value == '1' else value
+
+
+class ImportTracer:
+    """
+    Tiempo de import por módulo, al estilo de python -X importtime: envuelve
+    builtins.__import__ y, por cada módulo que se carga por primera vez,
+    guarda el tiempo propio y el acumulado (con lo que importa él).
+
+    Los submódulos de "from paquete import a, b" se miden en la misma
+    llamada (si se cargan varios a la vez el tiempo se reparte entre ellos).
+    Lo que se carga sin pasar por __import__ (importlib.import_module)
+    cuenta como tiempo propio del módulo que lo provoca.
+    """
+
+    def __init__(self):
+        self.modules = {}  # nombre -> (propio, acumulado) en segundos
+        self._local = threading.local()
+        # Se conserva tras uninstall: otro hilo puede seguir dentro de _import
+        self._original = builtins.__import__
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            builtins.__import__ = self._original
+            self.installed = False
+
+    def _target(self, name, globals, level):
+        if not level:
+            return name
+        globals = globals or {}
+        package = globals.get('__package__') or globals.get('__name__', '').rpartition('.')[0]
+        try:
+            return importlib.util.resolve_name('.' * level + name, package)
+        except (ImportError, ValueError):
+            return None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        target = self._target(name, globals, level)
+        new = []
+        if target is not None:
+            if target not in sys.modules:
+                new.append(target)
+            for item in fromlist or ():
+                if item != '*' and f"{target}.{item}" not in sys.modules:
+                    new.append(f"{target}.{item}")
+        if not new:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # tiempo de los imports anidados
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            # Los nombres del fromlist que no eran submódulos no se anotan
+            loaded = [module for module in new if module in sys.modules]
+            for module in loaded:
+                self.modules[module] = ((elapsed - children) / len(loaded),
+                                        elapsed / len(loaded))
+
+    def by_package(self):
+        """[(paquete de primer nivel, tiempo propio sumado)], de mayor a menor."""
+        totals = {}
+        for name, (own, _) in list(self.modules.items()):
+            top = name.partition('.')[0]
+            totals[top] = totals.get(top, 0.0) + own
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def slowest(self, limit=15):
+        """[(módulo, propio, acumulado)] por tiempo acumulado."""
+        rows = [(name, own, total) for name, (own, total) in list(self.modules.items())]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+
+class StartupTimer:
+    """
+    Tiempos de pared de las fases de arranque. Dos formas de medir:
+
+    - checkpoint(nombre): cierra la fase que empezó en el checkpoint anterior
+      (o al crear el temporizador), para los pasos secuenciales de main().
+    - with phase(nombre): mide un bloque concreto, p. ej. construir una página.
+
+    report() escribe la tabla en el log y empieza una tanda nueva.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self._last = self.origin
+        self.phases = []  # [(nombre, segundos)]
+        self.tracer = None
+
+    def checkpoint(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, end - start))
+            self._last = end
+
+    def since_origin(self):
+        """Segundos desde que se creó el temporizador (inicio del proceso)."""
+        return time.perf_counter() - self.origin
+
+    def report(self, title="Arranque"):
+        """Registra las fases medidas desde el último informe y las devuelve."""
+        phases, self.phases = self.phases, []
+        total = sum(seconds for _, seconds in phases)
+        lines = [f"{title}: {total * 1000:.0f} ms ({self.since_origin():.2f} s desde el inicio)"]
+        lines += [f"  {name:<32} {seconds * 1000:9.1f} ms" for name, seconds in phases]
+        logger.info('\n'.join(lines))
+        return phases
+
+    # --- Traza detallada (opcional) ---
+
+    def start_trace(self):
+        """Empieza a medir los imports (llamar antes de los imports pesados)."""
+        if self.tracer is None:
+            self.tracer = ImportTracer()
+            self.tracer.install()
+
+    def finish_trace(self, phases, output=''):
+        """
+        Deja de medir imports, registra el resumen y, si hay ruta, guarda la
+        traza en JSON: fases, imports por paquete y módulos más lentos.
+        """
+        if self.tracer is None:
+            return None
+        self.tracer.uninstall()
+        packages = self.tracer.by_package()
+        slowest = self.tracer.slowest()
+        lines = [f"Imports: {len(self.tracer.modules)} módulos, "
+                 f"{sum(own for _, own in packages) * 1000:.0f} ms"]
+        lines += [f"  {name:<32} {seconds * 1000:9.1f} ms" for name, seconds in packages[:10]]
+        logger.info('\n'.join(lines))
+
+        trace = {
+            'first_frame_s': round(self.since_origin(), 4),
+            'phases': [{'name': name, 'ms': round(seconds * 1000, 2)} for name, seconds in phases],
+            'imports': {
+                'modules': len(self.tracer.modules),
+                'by_package': [{'name': name, 'ms': round(seconds * 1000, 2)}
+                               for name, seconds in packages],
+                'slowest': [{'name': name, 'self_ms': round(own * 1000, 2),
+                             'cumulative_ms': round(total * 1000, 2)}
+                            for name, own, total in slowest],
+            },
+        }
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, indent=2, ensure_ascii=False)
+        self.tracer = None
+        return trace
+
+
+# Instancia global: se crea al importar este módulo, lo primero en main.py
+startup_timer = StartupTimer()
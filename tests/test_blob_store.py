@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from src.logic.blob_store import BlobStore, hash_file
+
+
+@pytest.fixture
+def store(db, tmp_path):
+    return BlobStore(str(tmp_path / "store"), db)
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_put_shards_by_hash(store, tmp_path):
+    src = _write(tmp_path / "a" / "pieza.STL", b"solid a\nendsolid a\n")
+    digest, path, is_new = store.put(src)
+    assert is_new
+    assert digest == hash_file(src)
+    assert path == os.path.join(store.root, digest[:2], digest[2:4], digest + ".stl")
+    with open(path, 'rb') as f:
+        assert f.read() == b"solid a\nendsolid a\n"
+    assert store.get(digest)['refcount'] == 1
+
+
+def test_duplicate_adds_reference(store, tmp_path):
+    first = _write(tmp_path / "a" / "pieza.stl", b"x" * 1000)
+    second = _write(tmp_path / "b" / "copia.stl", b"x" * 1000)
+    d1, p1, _ = store.put(first)
+    d2, p2, is_new = store.put(second)
+    assert (d1, p1) == (d2, p2)
+    assert not is_new
+    assert store.get(d1)['refcount'] == 2
+
+    assert not store.release(d1)
+    assert os.path.exists(p1)
+    assert store.release(d1)
+    assert not os.path.exists(p1)
+    assert store.get(d1) is None
+
+
+def test_chunked_copy_reports_progress(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(BlobStore, 'CHUNK_SIZE', 256)
+    monkeypatch.setattr(BlobStore, '_reflink', staticmethod(lambda src, dest: False))
+    store.USE_HARDLINKS = False
+    src = _write(tmp_path / "grande.stl", os.urandom(1000))
+    events = []
+    _, path, _ = store.put(src, progress=lambda stage, done, total: events.append((stage, done, total)))
+
+    assert [e for e in events if e[0] == 'hash'][-1] == ('hash', 1000, 1000)
+    assert [e for e in events if e[0] == 'copy'] == [
+        ('copy', 256, 1000), ('copy', 512, 1000), ('copy', 768, 1000), ('copy', 1000, 1000)
+    ]
+    assert os.stat(path).st_ino != os.stat(src).st_ino
+
+
+def test_copies_by_default(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(BlobStore, '_reflink', staticmethod(lambda src, dest: False))
+    src = _write(tmp_path / "pieza.stl", b"contenido")
+    _, path, _ = store.put(src)
+    assert os.stat(path).st_ino != os.stat(src).st_ino
+
+
+def test_hardlink_when_enabled(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(BlobStore, '_reflink', staticmethod(lambda src, dest: False))
+    store.USE_HARDLINKS = True
+    src = _write(tmp_path / "pieza.stl", b"contenido")
+    _, path, _ = store.put(src)
+    assert os.stat(path).st_ino == os.stat(src).st_ino
+
+
+def test_changed_hardlinked_blob_is_recreated(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(BlobStore, '_reflink', staticmethod(lambda src, dest: False))
+    store.USE_HARDLINKS = True
+    src = _write(tmp_path / "pieza.stl", b"solid a\nendsolid a\n")
+    digest, path, _ = store.put(src)
+
+    # El usuario edita el original: el blob enlazado cambia con él
+    with open(src, 'ab') as f:
+        f.write(b"editado\n")
+    copy = _write(tmp_path / "copia.stl", b"solid a\nendsolid a\n")
+    store.USE_HARDLINKS = False
+    d2, p2, is_new = store.put(copy)
+
+    assert (d2, p2) == (digest, path) and is_new
+    with open(path, 'rb') as f:
+        assert f.read() == b"solid a\nendsolid a\n"
+    assert os.stat(path).st_ino != os.stat(src).st_ino
+    row = store.get(digest)
+    assert row['refcount'] == 2 and row['size'] == os.path.getsize(path)
+
+    # Con otra extensión se rehace en la misma ruta
+    with open(path, 'wb') as f:
+        f.write(b"roto")
+    other = _write(tmp_path / "copia.STL.obj", b"solid a\nendsolid a\n")
+    assert store.put(other)[1] == path
+    with open(path, 'rb') as f:
+        assert f.read() == b"solid a\nendsolid a\n"
+
+
+def test_library_same_name_different_content(db, tmp_path, monkeypatch):
+    from src.database.db_manager import DBManager
+    from src.logic.library_manager import LibraryManager
+
+    monkeypatch.setattr(DBManager, '_get_user_data_dir', staticmethod(lambda: str(tmp_path / "app")))
+    manager = LibraryManager(db)
+    a = _write(tmp_path / "a" / "pieza.stl", b"solid a\nendsolid a\n")
+    b = _write(tmp_path / "b" / "pieza.stl", b"solid b\nendsolid b\n")
+    dup = _write(tmp_path / "c" / "otra.stl", b"solid a\nendsolid a\n")
+    for path in (a, b, dup):
+        assert manager.add_model(path, os.path.basename(path))[0]
+
+    models = manager.get_all_models()
+    paths = {m['name']: m['file_path'] for m in models}
+    assert len({m['file_path'] for m in models}) == 2
+    assert paths['otra.stl'] in {m['file_path'] for m in models if m['name'] == 'pieza.stl'}
+
+    shared = next(m for m in models if m['name'] == 'otra.stl')
+    assert manager.delete_model(shared['id'])
+    assert os.path.exists(shared['file_path'])  # sigue referenciado
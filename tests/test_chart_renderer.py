@@ -0,0 +1,64 @@
+import threading
+
+from src.logic.dashboard_service import ProjectCost, Slice
+from src.ui.chart_renderer import ChartRenderer, ChartView, render_chart
+from src.ui.dashboard_charts import (draw_colors_chart, draw_costs_chart, draw_materials_chart,
+                                     hex_for_color_name)
+
+MATERIALS = (Slice('PLA', 900.0), Slice('PETG', 300.0), Slice('TPU', 10.0))
+
+
+def test_render_chart_size_and_empty_data():
+    image = render_chart(draw_materials_chart, MATERIALS, 300, 200)
+    assert (image.width(), image.height()) == (300, 200)
+    # Sin datos también se dibuja (texto de "sin stock")
+    for draw, data in [(draw_materials_chart, ()), (draw_colors_chart, ()), (draw_costs_chart, ())]:
+        assert not render_chart(draw, data, 120, 80).isNull()
+    costs = (ProjectCost('Pieza', 1.5, 0.4, 1.9),)
+    hidpi = render_chart(draw_costs_chart, costs, 200, 100, dpr=2.0)
+    assert (hidpi.width(), hidpi.height()) == (400, 200)
+
+
+def test_hex_for_color_name():
+    assert hex_for_color_name("Rojo fuego") == '#d32f2f'
+    assert hex_for_color_name("") == '#808080'
+    assert hex_for_color_name("Desconocido") == '#b0bec5'
+
+
+def test_renderer_draws_off_thread_and_caches(qtbot):
+    renderer = ChartRenderer()
+    threads = []
+
+    def draw(figure, data):
+        threads.append(threading.get_ident())
+        draw_materials_chart(figure, data)
+
+    with qtbot.waitSignal(renderer.rendered, timeout=5000):
+        key, image = renderer.request(draw, MATERIALS, 200, 200)
+    assert image is None
+    assert threads and threads[0] != threading.get_ident()
+
+    # Mismos datos y tamaño: imagen de la caché, sin volver a dibujar
+    same_key, cached = renderer.request(draw, MATERIALS, 200, 200)
+    renderer.wait()
+    assert same_key == key and cached is not None
+    assert len(threads) == 1
+
+    renderer.request(draw, MATERIALS[:2], 200, 200)
+    renderer.wait()
+    assert len(threads) == 2
+
+
+def test_chart_view_shows_rendered_image(qtbot):
+    renderer = ChartRenderer()
+    view = ChartView(draw_materials_chart, MATERIALS, renderer=renderer)
+    qtbot.addWidget(view)
+    view.resize(240, 160)
+    view.show()
+    qtbot.waitUntil(lambda: view.image is not None, timeout=5000)
+    first = view.image
+
+    view.set_data(MATERIALS)
+    assert view.image is first
+    view.set_data(())
+    qtbot.waitUntil(lambda: view.image is not first, timeout=5000)
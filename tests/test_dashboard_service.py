@@ -0,0 +1,86 @@
+import pytest
+
+from src.logic.change_events import ChangeBus, INVENTORY, ORDERS
+from src.logic.dashboard_service import DashboardService
+from src.logic.inventory_manager import InventoryManager
+
+
+def _user(db, username):
+    db.execute(
+        "INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+        (username,)
+    )
+    return db.query_one("SELECT id FROM users WHERE username = ?", (username,))['id']
+
+
+def _executions(db):
+    return db.stats.summary()['executions']
+
+
+@pytest.fixture
+def service(db):
+    # Bus global: así llegan los eventos que publican los managers
+    svc = DashboardService(db)
+    yield svc
+    svc.close()
+
+
+def test_snapshot_is_memoized(db, service):
+    uid = _user(db, "dash1")
+    InventoryManager(db).add_filament("A", "PLA", "Red", 1000, 20.0, user_id=uid)
+
+    first = service.snapshot(uid)
+    assert first.materials[0].label == "PLA"
+    before = _executions(db)
+    assert service.snapshot(uid) is first
+    assert _executions(db) == before
+
+
+def test_inventory_change_reloads_only_inventory_sections(db, service):
+    uid = _user(db, "dash2")
+    inventory = InventoryManager(db)
+    inventory.add_filament("A", "PLA", "Red", 1000, 20.0, user_id=uid)
+    first = service.snapshot(uid)
+
+    inventory.add_filament("B", "PETG", "Blue", 100, 20.0, user_id=uid)
+    db.stats.reset()
+    second = service.snapshot(uid)
+
+    assert second is not first
+    assert {s.label for s in second.materials} == {"PLA", "PETG"}
+    assert second.recent_models is first.recent_models
+    assert second.project_stats is first.project_stats
+    queried = ' '.join(row['sql'] for row in db.stats.snapshot())
+    assert "filaments" in queried
+    assert "projects" not in queried and "models" not in queried and "orders" not in queried
+
+
+def test_changes_of_other_users_keep_snapshot(db):
+    bus = ChangeBus()
+    svc = DashboardService(db, bus=bus)
+    uid = _user(db, "dash3")
+    other = _user(db, "dash4")
+    first = svc.snapshot(uid)
+
+    bus.publish(INVENTORY, other)
+    assert svc.snapshot(uid) is first
+    bus.publish(ORDERS, uid)
+    assert svc.snapshot(uid).materials is first.materials
+    svc.close()
+
+
+def test_snapshot_is_immutable(db, service):
+    snap = service.snapshot(None)
+    assert snap.project_stats is None
+    with pytest.raises(AttributeError):
+        snap.materials = ()
+
+
+def test_service_reads_through_read_only_connection(db, service):
+    from src.database.db_manager import ReadOnlyDB
+
+    uid = _user(db, "dash5")
+    InventoryManager(db).add_filament("A", "PETG", "Azul", 500, 20.0, user_id=uid)
+    assert all(isinstance(manager.db, ReadOnlyDB)
+               for manager in (service.inventory, service.library, service.projects, service.orders))
+    assert service.snapshot(uid).materials == (("PETG", 500.0),)
@@ -1,5 +1,10 @@
+import sqlite3
+import threading
+
 import pytest
 
+from src.database.db_manager import DBManager
+
 
 def test_query_returns_list_of_dicts(db):
     result = db.query("SELECT 1 AS x, 2 AS y")
@@ -60,3 +65,187 @@ def test_multiple_queries_same_connection(db):
     db.execute("INSERT INTO users (username, password_hash, email, is_guest) VALUES ('mq2','h','',0)")
     result = db.query("SELECT username FROM users WHERE username LIKE 'mq%' ORDER BY username")
     assert [r['username'] for r in result] == ['mq1', 'mq2']
+
+
+def _insert_users(db, n):
+    db.executemany(
+        "INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+        [(f"it{i:03d}",) for i in range(n)]
+    )
+
+
+def test_iter_query_streams_in_batches(db):
+    _insert_users(db, 25)
+    first_id = db.query_one("SELECT MIN(id) AS id FROM users WHERE username LIKE 'it%'")['id']
+    rows = db.iter_query("SELECT id, username FROM users WHERE username LIKE 'it%' ORDER BY id",
+                         batch_size=10)
+    assert next(rows) == {'id': first_id, 'username': 'it000'}
+    assert len(list(rows)) == 24
+
+
+def test_iter_query_row_modes(db):
+    _insert_users(db, 3)
+    sql = "SELECT id, username FROM users WHERE username LIKE 'it%' ORDER BY id"
+    tuples = list(db.iter_query(sql, row_mode=db.ROW_TUPLE))
+    assert all(type(row) is tuple for row in tuples)
+    assert [row[1] for row in tuples] == ['it000', 'it001', 'it002']
+
+    named = list(db.iter_query(sql, row_mode=db.ROW_NAMEDTUPLE))
+    assert named[2].username == 'it002'
+    assert named[0].id == tuples[0][0]
+    # El modo de fila no afecta a las consultas normales
+    assert db.query_one("SELECT 1 AS n") == {'n': 1}
+
+
+def test_iter_query_error_yields_nothing(db):
+    assert list(db.iter_query("SELECT * FROM tabla_inexistente")) == []
+
+
+def test_query_page_keyset(db):
+    _insert_users(db, 7)
+    sql = "SELECT id, username FROM users WHERE username LIKE ?"
+    seen, after_id = [], None
+    while True:
+        page = db.query_page(sql, ('it%',), after_id=after_id, limit=3)
+        if not page:
+            break
+        seen.extend(row['username'] for row in page)
+        after_id = page[-1]['id']
+    assert seen == [f"it{i:03d}" for i in range(7)]
+
+    newest = db.query_page(sql, ('it%',), limit=2, descending=True, row_mode=db.ROW_TUPLE)
+    assert [row[1] for row in newest] == ['it006', 'it005']
+    older = db.query_page(sql, ('it%',), after_id=newest[-1][0], limit=10, descending=True)
+    assert [row['username'] for row in older] == ['it004', 'it003', 'it002', 'it001', 'it000']
+
+
+def _in_thread(func):
+    result = {}
+
+    def run():
+        try:
+            result['value'] = func()
+        except Exception as e:
+            result['error'] = e
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+def test_each_thread_has_its_own_connection(db):
+    _insert_users(db, 3)
+    main_connection = db.connection
+
+    def worker():
+        rows = db.query("SELECT username FROM users WHERE username LIKE 'it%' ORDER BY id")
+        db.execute("INSERT INTO users (username, password_hash, email, is_guest) VALUES ('th1','h','',0)")
+        other = db.connection
+        db.release_thread_connections()
+        return [r['username'] for r in rows], other
+
+    usernames, worker_connection = _in_thread(worker)
+    assert usernames == ['it000', 'it001', 'it002']
+    assert worker_connection is not main_connection
+    assert db.connection is main_connection
+    # La escritura del worker es visible desde el hilo principal
+    assert db.query_one("SELECT id FROM users WHERE username = 'th1'") is not None
+    assert db.pool_size() == 1
+
+
+def test_transaction_state_is_per_thread(db):
+    with db.transaction():
+        db.execute("INSERT INTO users (username, password_hash, email, is_guest) VALUES ('tx1','h','',0)")
+        assert _in_thread(lambda: db._in_transaction) is False
+        assert db._in_transaction is True
+
+
+def test_reader_rejects_writes(db):
+    _insert_users(db, 2)
+    reader = db.reader()
+    assert reader.query_one("SELECT COUNT(*) AS n FROM users WHERE username LIKE 'it%'")['n'] == 2
+    with pytest.raises(sqlite3.OperationalError):
+        reader._read_connection().execute("DELETE FROM users")
+    assert db.query_one("SELECT COUNT(*) AS n FROM users WHERE username LIKE 'it%'")['n'] == 2
+
+
+def test_reader_on_file_reads_concurrently_with_writer(tmp_path):
+    file_db = DBManager(db_file=str(tmp_path / "pool.db"))
+    file_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    file_db.execute("INSERT INTO items (name) VALUES ('a')")
+    reader = file_db.reader()
+    try:
+        with file_db.transaction():
+            file_db.execute("INSERT INTO items (name) VALUES ('b')")
+            # WAL: el lector no espera al escritor y solo ve lo confirmado
+            names = _in_thread(
+                lambda: [r['name'] for r in reader.query("SELECT name FROM items ORDER BY id")]
+            )
+            assert names == ['a']
+        assert [r['name'] for r in reader.query("SELECT name FROM items ORDER BY id")] == ['a', 'b']
+        with pytest.raises(sqlite3.OperationalError):
+            reader._read_connection().execute("INSERT INTO items (name) VALUES ('c')")
+    finally:
+        file_db.disconnect()
+    assert file_db.pool_size() == 0
+
+
+def _count_users(db, pattern):
+    return db.query_one("SELECT COUNT(*) AS n FROM users WHERE username LIKE ?", (pattern,))['n']
+
+
+def _add_user(db, username):
+    db.execute("INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+               (username,))
+
+
+def test_nested_transaction_inner_rollback_keeps_outer(db):
+    with db.transaction():
+        _add_user(db, 'nt_outer')
+        with pytest.raises(ValueError):
+            with db.transaction():
+                _add_user(db, 'nt_inner')
+                raise ValueError("fallo interior")
+        assert db._in_transaction
+    assert _count_users(db, 'nt_outer') == 1
+    assert _count_users(db, 'nt_inner') == 0
+    assert not db._in_transaction
+
+
+def test_nested_transaction_commits_once_at_outer_level(db):
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                _add_user(db, 'nc1')
+            # El nivel interior no confirma: el fallo exterior lo deshace
+            assert 'COMMIT' not in statements
+            raise RuntimeError("fallo exterior")
+    db.connection.set_trace_callback(None)
+    assert _count_users(db, 'nc%') == 0
+
+
+def test_unit_of_work_batches_into_one_commit(db):
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    with db.unit_of_work(flush_size=100) as uow:
+        for i in range(1000):
+            uow.add("INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+                    (f"uw{i:04d}",))
+        uow.add("UPDATE users SET email = 'x' WHERE username = ?", ('uw0000',))
+    db.connection.set_trace_callback(None)
+    assert uow.statements == 1001
+    assert statements.count('COMMIT') == 1
+    assert _count_users(db, 'uw%') == 1000
+    assert db.query_one("SELECT email FROM users WHERE username = 'uw0000'")['email'] == 'x'
+
+
+def test_unit_of_work_discards_everything_on_error(db):
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.unit_of_work(flush_size=2) as uow:
+            uow.add_many("INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+                         [('ue1',), ('ue2',), ('ue1',)])
+    assert _count_users(db, 'ue%') == 0
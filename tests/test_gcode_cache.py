@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+from src.logic.gcode_cache import GcodeCache
+from src.logic.slicer_parser import SlicerParser
+
+CURA_CONTENT = """;FLAVOR:Marlin
+;TIME:3665
+;Filament used: 1.23m
+"""
+
+
+@pytest.fixture
+def parser(db):
+    return SlicerParser(cache=GcodeCache(db_manager=db))
+
+
+def _count_parses(parser, monkeypatch):
+    calls = []
+    original = parser._parse_uncached
+
+    def counting(*args):
+        calls.append(args[0])
+        return original(*args)
+
+    monkeypatch.setattr(parser, '_parse_uncached', counting)
+    return calls
+
+
+def test_second_parse_hits_cache(tmp_path, parser, monkeypatch):
+    f = tmp_path / "cura.gcode"
+    f.write_text(CURA_CONTENT)
+    calls = _count_parses(parser, monkeypatch)
+    first = parser.parse_file(str(f))
+    second = parser.parse_file(str(f))
+    assert first == second
+    assert second['print_time_seconds'] == 3665
+    assert len(calls) == 1
+
+
+def test_changed_file_is_reparsed(tmp_path, parser, monkeypatch):
+    f = tmp_path / "cura.gcode"
+    f.write_text(CURA_CONTENT)
+    calls = _count_parses(parser, monkeypatch)
+    parser.parse_file(str(f))
+    f.write_text(CURA_CONTENT.replace("3665", "100"))
+    os.utime(f, (1, 1))
+    assert parser.parse_file(str(f))['print_time_seconds'] == 100
+    assert len(calls) == 2
+
+
+def test_same_size_and_mtime_but_different_content(tmp_path, parser):
+    f = tmp_path / "cura.gcode"
+    f.write_text(CURA_CONTENT)
+    os.utime(f, (1, 1))
+    parser.parse_file(str(f))
+    f.write_text(CURA_CONTENT.replace("3665", "1234"))
+    os.utime(f, (1, 1))
+    assert parser.parse_file(str(f))['print_time_seconds'] == 1234
+
+
+def test_files_without_metadata_are_cached(tmp_path, parser, monkeypatch):
+    f = tmp_path / "empty.gcode"
+    f.write_text("G28\n")
+    calls = _count_parses(parser, monkeypatch)
+    assert parser.parse_file(str(f)) is None
+    assert parser.parse_file(str(f)) is None
+    assert len(calls) == 1
+
+
+def test_options_are_part_of_the_key(tmp_path, parser):
+    f = tmp_path / "plain.gcode"
+    f.write_text("M83\nG1 X10 E1 F1200\n")
+    pytest.importorskip("numpy")
+    assert parser.parse_file(str(f)) is not None
+    assert parser.parse_file(str(f), simulate=False) is None
+
+
+def test_lru_eviction(tmp_path, db):
+    cache = GcodeCache(db_manager=db)
+    cache.MAX_ENTRIES = 2
+    paths = []
+    for i in range(3):
+        f = tmp_path / f"f{i}.gcode"
+        f.write_text(CURA_CONTENT)
+        paths.append(str(f))
+    cache.put(paths[0], {'n': 0})
+    cache.put(paths[1], {'n': 1})
+    assert cache.get(paths[0]) == (True, {'n': 0})  # paths[0] pasa a ser el más reciente
+    cache.put(paths[2], {'n': 2})
+    assert cache.get(paths[1]) == (False, None)
+    assert cache.get(paths[0])[0]
+    assert cache.get(paths[2])[0]
+    assert db.query_one("SELECT COUNT(*) AS n FROM gcode_cache")['n'] == 2
+
+
+def test_batch_uses_cache(tmp_path, parser):
+    (tmp_path / "a.gcode").write_text(CURA_CONTENT)
+    first = dict(parser.parse_batch(str(tmp_path), max_workers=1))
+    found, data = parser.cache.get(str(tmp_path / "a.gcode"), parser._cache_options(False, True))
+    assert found and data == first[str(tmp_path / "a.gcode")]
+    assert dict(parser.parse_batch(str(tmp_path), max_workers=1)) == first
+
+
+def test_batch_worker_keeps_cache_on_gui_thread(tmp_path, parser, qtbot, monkeypatch):
+    import threading
+
+    from src.ui.calculator_widget import GcodeBatchWorker
+
+    (tmp_path / "a.gcode").write_text(CURA_CONTENT)
+    (tmp_path / "b.gcode").write_text(CURA_CONTENT.replace("3665", "60"))
+    files = parser.collect_gcode_files(str(tmp_path))
+    parser.cache_batch_result(files[0], parser.parse_file(files[0]))
+
+    # La caché usa la conexión de la interfaz: nunca se consulta desde el worker
+    threads = set()
+    for name in ('get', 'put'):
+        def recording(*args, _original=getattr(parser.cache, name)):
+            threads.add(threading.get_ident())
+            return _original(*args)
+        monkeypatch.setattr(parser.cache, name, recording)
+
+    cached, pending = parser.split_cached(files)
+    assert [path for path, _ in cached] == files[:1] and pending == files[1:]
+
+    def on_parsed(path, data):
+        if path in pending:
+            parser.cache_batch_result(path, data)
+
+    connections = parser.cache.db.pool_size()
+    worker = GcodeBatchWorker(parser, pending, cached, db_manager=parser.cache.db)
+    worker.file_parsed.connect(on_parsed)
+    with qtbot.waitSignal(worker.batch_finished, timeout=20000) as blocker:
+        worker.start()
+    worker.wait()
+
+    assert blocker.args[0]['parsed'] == 2
+    assert blocker.args[0]['print_time_seconds'] == 3665 + 60
+    assert threads == {threading.get_ident()}
+    assert parser.cache.db.pool_size() == connections
+    cached_now, pending_now = parser.split_cached(files)
+    assert pending_now == [] and cached_now[1][1]['print_time_seconds'] == 60
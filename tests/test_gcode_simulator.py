@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.logic.gcode_simulator import GcodeSimulator, _DEFAULT_LIMITS as LIMITS_DEFAULT
+from src.logic.slicer_parser import SlicerParser
+
+# Límites amplios para que solo actúen F y la aceleración de M204
+LIMITS = """M201 X100000 Y100000 Z100000 E100000
+M203 X100000 Y100000 Z100000 E100000
+M204 P1000 R1000 T1000
+"""
+
+
+def _moves(gcode):
+    """Movimientos de un único bloque partiendo del estado inicial."""
+    sim = GcodeSimulator()
+    state = {'pos': np.zeros(4), 'relative_xyz': 0, 'relative_e': 0, 'tool': 0,
+             'feed': 1500.0, 'limits': np.array(LIMITS_DEFAULT)}
+    return sim._chunk_moves(np.frombuffer(gcode.encode(), dtype=np.uint8), state)
+
+
+def test_tokenize_numbers_and_comments():
+    buf = np.frombuffer(b"G1 X-10.5 Y.25 E+3 ; X99\nG1X7Y8\nSET_FAN SPEED=1\n", dtype=np.uint8)
+    line, letter, value = GcodeSimulator._tokenize(buf)
+    assert [chr(c) for c in letter] == ['G', 'X', 'Y', 'E', 'G', 'X', 'Y']
+    assert list(line) == [0, 0, 0, 0, 1, 1, 1]
+    assert list(value) == pytest.approx([1, -10.5, 0.25, 3, 1, 7, 8])
+
+
+def test_tokenize_parenthesized_comments():
+    buf = np.frombuffer(b"G1 X5 (mover X9) Y7\nG1 (sin cerrar Y4\nG1 Z2 (a;b) E3\n; (x\nG1 F60\n",
+                        dtype=np.uint8)
+    line, letter, value = GcodeSimulator._tokenize(buf)
+    assert [chr(c) for c in letter] == ['G', 'X', 'Y', 'G', 'G', 'Z', 'E', 'G', 'F']
+    assert list(line) == [0, 0, 0, 1, 2, 2, 2, 4, 4]
+    assert list(value) == pytest.approx([1, 5, 7, 1, 1, 2, 3, 1, 60])
+
+
+def test_single_move_trapezoid_time():
+    # 100 mm a 100 mm/s con a=1000: 0.1 s acelerando + 0.1 s frenando + 0.9 s crucero
+    data = GcodeSimulator().simulate_text(LIMITS + "G1 X100 E5 F6000\n")
+    assert data['print_time_seconds'] == 1
+    assert data['filament_length_m'] == pytest.approx(0.005)
+
+
+def test_triangle_profile_when_cruise_not_reached():
+    moves, _ = _moves(LIMITS + "G1 X10 F60000\n")
+    times, _ = GcodeSimulator()._segment_times(moves)
+    # 10 mm con a=1000 desde y hasta parado: 2 * sqrt(10 / 1000)
+    assert times.sum() == pytest.approx(0.2)
+
+
+def test_straight_segments_keep_speed():
+    sim = GcodeSimulator()
+    split, _ = _moves(LIMITS + "G1 X50 F6000\nG1 X100\n")
+    whole, _ = _moves(LIMITS + "G1 X100 F6000\n")
+    assert sim._segment_times(split)[0].sum() == pytest.approx(sim._segment_times(whole)[0].sum())
+
+
+def test_extrusion_per_tool():
+    gcode = """M83
+T0
+G1 X10 E2 F1200
+T1
+G1 X20 E3
+G1 E-0.5
+G1 E0.5
+T0
+G1 X30 E1
+"""
+    data = GcodeSimulator().simulate_text(gcode)
+    assert data['filament_lengths_m'] == pytest.approx([0.003, 0.003])
+    assert len(data['filament_weights_g']) == 2
+    assert data['filament_weight_g'] == pytest.approx(sum(data['filament_weights_g']))
+
+
+def test_absolute_extrusion_with_g92_reset():
+    gcode = """M82
+G1 X10 E10 F1200
+G92 E0
+G1 X20 E5
+"""
+    data = GcodeSimulator().simulate_text(gcode)
+    assert data['filament_length_m'] == pytest.approx(0.015)
+
+
+def test_relative_positioning_and_dwell():
+    moves, dwell = _moves(LIMITS + "G91\nG1 X100 F6000\nG1 X-100\nG90\nG1 X5\nG4 P2000\n")
+    assert list(moves['dx']) == [100.0, -100.0, 5.0]
+    assert dwell == pytest.approx(2.0)
+
+
+def test_machine_limits_follow_m201_m203_m204():
+    moves, _ = _moves("M204 S500\nG1 X10 F600\nM204 P800\nG1 X20\nM203 X50 Y0\nM204 T900\nG1 X30\n")
+    limits = moves['limits']
+    # M204 S fija impresión y desplazamiento; P y T solo su columna
+    assert list(limits[:, 8]) == [500, 800, 800]
+    assert list(limits[:, 10]) == [500, 500, 900]
+    # M203 X cambia la velocidad máxima de X; Y0 no se aplica
+    assert list(limits[:, 0]) == [LIMITS_DEFAULT[0], LIMITS_DEFAULT[0], 50]
+    assert limits[2, 1] == LIMITS_DEFAULT[1]
+
+
+def test_arc_length():
+    # Semicírculo de radio 10 en sentido antihorario
+    moves, _ = _moves("G1 X10 Y0 F600\nG3 X-10 Y0 I-10 J0\n")
+    assert moves['dist'][1] == pytest.approx(31.4159, abs=1e-3)
+
+
+def test_chunked_simulation_matches_single_pass():
+    rng = random.Random(1)
+    lines = ["M83", "M204 S2000"]
+    for i in range(3000):
+        if i % 500 == 0:
+            lines.append(f"T{(i // 500) % 2}")
+        lines.append(f"G1 X{rng.uniform(0, 200):.3f} Y{rng.uniform(0, 200):.3f} "
+                     f"E{rng.uniform(0, 0.1):.4f} F{rng.choice([1800, 3600, 9000])}")
+    text = "\n".join(lines) + "\n"
+
+    whole = GcodeSimulator().simulate_text(text)
+    chunked_sim = GcodeSimulator()
+    chunked_sim.CHUNK_SIZE = 1000
+    chunked = chunked_sim.simulate_text(text)
+
+    assert chunked['print_time_seconds'] == whole['print_time_seconds']
+    assert chunked['filament_lengths_m'] == pytest.approx(whole['filament_lengths_m'])
+
+
+def test_zero_feedrate_keeps_previous_feed(tmp_path):
+    sim = GcodeSimulator()
+    with_f0 = sim.simulate_text(LIMITS + "G1 X60 F600\nG1 X120 F0\n")
+    without = sim.simulate_text(LIMITS + "G1 X60 F600\nG1 X120\n")
+    assert with_f0['print_time_seconds'] == without['print_time_seconds'] == 12
+    # Solo F0 (se usa el avance por defecto) y límites de máquina a 0: tiempo finito
+    assert sim.simulate_text("G1 X10 F0\n")['print_time_seconds'] >= 0
+    assert sim.simulate_text("M203 X0\nM201 X0\nG1 X10 F600\n")['print_time_seconds'] >= 0
+
+    f = tmp_path / "f0.gcode"
+    f.write_text("M83\nG1 X10 E1 F0\n")
+    assert SlicerParser().parse_file(str(f))['filament_length_m'] == pytest.approx(0.001)
+
+
+def test_no_moves_returns_none():
+    assert GcodeSimulator().simulate_text("M104 S200\nG28\n") is None
+
+
+def test_parse_file_falls_back_to_simulation(tmp_path):
+    f = tmp_path / "plain.gcode"
+    f.write_text("M83\nG1 X10 E1 F1200\nG1 X20 E1\n")
+    data = SlicerParser().parse_file(str(f))
+    assert data is not None
+    assert data['slicer_name'] == 'Simulación G-code'
+    assert data['filament_length_m'] == pytest.approx(0.002)
+    assert SlicerParser().parse_file(str(f), simulate=False) is None
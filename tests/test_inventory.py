@@ -59,3 +59,123 @@ def test_update_filament_weight(db):
     mgr.update_filament_weight(fid, 750)
     updated = mgr.get_filament_by_id(fid)
     assert updated['weight_current'] == 750
+
+
+def test_filaments_page_sort_and_search(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db, "pageuser")
+    for i, (brand, color) in enumerate([("Sunlu", "Rojo"), ("Prusament", "Negro"), ("Sunlu", "Blanco")]):
+        mgr.add_filament(brand, "PLA", color, 1000 - i * 100, 20.0, user_id=uid)
+
+    assert mgr.count_filaments(uid) == 3
+    page = mgr.get_filaments_page(uid, sort='weight_current', descending=False)
+    assert [f['weight_current'] for f in page] == [800, 900, 1000]
+    assert mgr.count_filaments(uid, search="sunlu") == 2
+    assert [f['color'] for f in mgr.get_filaments_page(uid, search="sun bla")] == ["Blanco"]
+    assert len(mgr.get_filaments_page(uid, offset=2, limit=2)) == 1
+
+
+def test_get_all_filaments_paged(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db, "keyset")
+    for i in range(4):
+        mgr.add_filament(f"B{i}", "PLA", "Rojo", 1000, 20.0, user_id=uid)
+    page = mgr.get_all_filaments_paged(uid, limit=3)
+    assert [f['brand'] for f in page] == ["B3", "B2", "B1"]
+    assert [f['brand'] for f in mgr.get_all_filaments_paged(uid, after_id=page[-1]['id'])] == ["B0"]
+
+
+def test_add_filaments_bulk_is_all_or_nothing(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db)
+    rows = [{'brand': f"B{i}", 'material_type': "PLA", 'color': "Red",
+             'weight_initial': 1000, 'price': 20.0} for i in range(50)]
+    ok, _ = mgr.add_filaments(rows, user_id=uid)
+    assert ok
+    assert mgr.count_filaments(uid) == 50
+
+    rows.append({'brand': "Mal", 'material_type': "PLA", 'color': "Red",
+                 'weight_initial': -1, 'price': 20.0})
+    ok, _ = mgr.add_filaments(rows, user_id=uid)
+    assert not ok
+    assert mgr.count_filaments(uid) == 50
+
+
+def test_consume_filaments_clamps_at_zero(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db)
+    mgr.add_filament("A", "PLA", "Red", 1000, 20.0, user_id=uid)
+    mgr.add_filament("B", "PETG", "Blue", 100, 20.0, user_id=uid)
+    ids = {f['brand']: f['id'] for f in mgr.get_all_filaments(uid)}
+    mgr.consume_filaments({ids['A']: 250, ids['B']: 300})
+    assert mgr.get_filament_by_id(ids['A'])['weight_current'] == 750
+    assert mgr.get_filament_by_id(ids['B'])['weight_current'] == 0
+
+    mgr.delete_filaments(list(ids.values()))
+    assert mgr.count_filaments(uid) == 0
+
+
+@pytest.fixture
+def stock(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db)
+    other = _user(db, "otro")
+    for brand, material, color, initial, current in [
+        ("A", "PLA", "rojo", 1000, 800),
+        ("B", " pla ", "  Rojo", 1000, 100),
+        ("C", "PETG", "Azul", 1000, 50),
+        ("D", "abs", "", 500, 90),
+        ("E", "PLA", "Verde", 0, 0),
+    ]:
+        mgr.add_filament(brand, material, color, initial, 20.0, user_id=uid)
+        db.execute("UPDATE filaments SET weight_current = ? WHERE brand = ?", (current, brand))
+    mgr.add_filament("Z", "PLA", "rojo", 1000, 20.0, user_id=other)
+    return mgr, uid
+
+
+def test_grams_by_material(stock):
+    mgr, uid = stock
+    assert mgr.grams_by_material(uid) == [
+        {'material': 'PLA', 'grams': 900}, {'material': 'ABS', 'grams': 90},
+        {'material': 'PETG', 'grams': 50},
+    ]
+
+
+def test_grams_by_material_merges_non_ascii_case(db):
+    mgr = InventoryManager(db_manager=db)
+    uid = _user(db)
+    for brand, material in [("A", "Poliéster"), ("B", "POLIÉSTER"), ("C", " poliéster ")]:
+        mgr.add_filament(brand, material, "Negro", 1000, 20.0, user_id=uid)
+    assert mgr.grams_by_material(uid) == [{'material': 'POLIÉSTER', 'grams': 3000}]
+
+
+def test_grams_by_color_normalizes_names(stock):
+    mgr, uid = stock
+    assert mgr.grams_by_color(uid) == [
+        {'color': 'Rojo', 'grams': 900}, {'color': 'Desconocido', 'grams': 90},
+        {'color': 'Azul', 'grams': 50}, {'color': 'Verde', 'grams': 0},
+    ]
+
+
+def test_low_stock_filaments_ordered_and_limited(stock):
+    mgr, uid = stock
+    low = mgr.low_stock_filaments(uid, threshold_pct=20, limit=3)
+    assert [f['brand'] for f in low] == ['C', 'B', 'D']
+    assert low[0]['percentage'] == pytest.approx(5.0)
+    assert [f['brand'] for f in mgr.low_stock_filaments(uid, threshold_pct=20, limit=1)] == ['C']
+    assert mgr.low_stock_filaments(uid, threshold_pct=1) == []
+
+
+def test_inventory_aggregates_use_indexes(stock, db):
+    mgr, uid = stock
+    plans = []
+    for sql, params in [
+        ("SELECT UPPER(TRIM(material_type)), SUM(weight_current) FROM filaments "
+         "WHERE user_id = ? GROUP BY UPPER(TRIM(material_type))", (uid,)),
+        ("SELECT id FROM filaments WHERE user_id = ? AND weight_initial > 0 "
+         "AND weight_current * 100.0 / weight_initial < ? "
+         "ORDER BY weight_current * 100.0 / weight_initial, id LIMIT 3", (uid, 20)),
+    ]:
+        plans.append(' '.join(r['detail'] for r in db.query(f"EXPLAIN QUERY PLAN {sql}", params)))
+    assert 'idx_filaments_user_material' in plans[0]
+    assert 'idx_filaments_user_stock' in plans[1] and 'TEMP B-TREE' not in plans[1]
@@ -0,0 +1,175 @@
+import os
+import zipfile
+
+import pytest
+
+from src.database.db_manager import DBManager
+from src.logic.library_import import LibraryImporter
+from src.logic.library_manager import LibraryManager
+
+
+@pytest.fixture
+def manager(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(DBManager, '_get_user_data_dir', staticmethod(lambda: str(tmp_path / "app")))
+    return LibraryManager(db)
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def _make_folder(root):
+    _write(root / "a.stl", b"solid a\nendsolid a\n")
+    _write(root / "sub" / "b.STL", b"solid b\nendsolid b\n")
+    _write(root / "sub" / "deep" / "copia.stl", b"solid a\nendsolid a\n")
+    _write(root / "sub" / "c.obj", b"v 0 0 0\n")
+    _write(root / "notas.txt", b"no es un modelo")
+    return str(root)
+
+
+def test_collect_entries_recursive(tmp_path):
+    source = _make_folder(tmp_path / "src")
+    assert LibraryImporter.collect_entries(source) == sorted([
+        "a.stl", os.path.join("sub", "b.STL"),
+        os.path.join("sub", "c.obj"), os.path.join("sub", "deep", "copia.stl"),
+    ])
+
+
+def test_import_folder_deduplicates(manager, tmp_path):
+    source = _make_folder(tmp_path / "src")
+    events = []
+    summary = LibraryImporter(manager).import_source(
+        source, progress=lambda done, total, entry: events.append((done, total))
+    )
+
+    assert summary['total'] == 4
+    assert summary['imported'] == 4
+    assert summary['duplicates'] == 1
+    assert not summary['interrupted']
+    assert [done for done, _ in events] == [1, 2, 3, 4]
+
+    models = manager.get_all_models()
+    assert len(models) == 4
+    assert len({m['file_path'] for m in models}) == 3
+    blob = manager.store.get(next(m for m in models if m['name'] == 'copia.stl')['blob_hash'])
+    assert blob['refcount'] == 2
+    assert blob['mtime'] == os.stat(blob['path']).st_mtime
+    assert all(os.path.exists(m['file_path']) for m in models)
+
+
+def test_import_zip(manager, tmp_path, monkeypatch):
+    archive = tmp_path / "modelos.zip"
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr("piezas/a.stl", b"solid a\nendsolid a\n")
+        zf.writestr("piezas/b.3mf", b"3mf falso")
+        zf.writestr("leeme.txt", b"texto")
+
+    opened = []
+
+    class TrackedZipFile(zipfile.ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(zipfile, 'ZipFile', TrackedZipFile)
+    summary = LibraryImporter(manager, max_workers=2).import_source(str(archive))
+    assert summary['imported'] == 2
+    # Los ZipFile de los hilos del pool se cierran al terminar
+    assert opened and all(zf.fp is None for zf in opened)
+
+    models = {m['name']: m for m in manager.get_all_models()}
+    assert set(models) == {'a.stl', 'b.3mf'}
+    with open(models['a.stl']['file_path'], 'rb') as f:
+        assert f.read() == b"solid a\nendsolid a\n"
+    # No quedan temporales de la extracción
+    assert not [name for name in os.listdir(manager.store.root) if name.endswith('.tmp')]
+
+
+def test_resume_after_interruption(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(LibraryImporter, 'BATCH_SIZE', 2)
+    source = _make_folder(tmp_path / "src")
+    importer = LibraryImporter(manager, max_workers=1)
+
+    calls = []
+    summary = importer.import_source(source, should_stop=lambda: len(calls) > 0,
+                                     progress=lambda *args: calls.append(args))
+    assert summary['interrupted']
+    first = summary['imported']
+    assert 0 < first < 4
+    assert len(manager.get_all_models()) == first
+
+    summary = importer.import_source(source)
+    assert summary['resumed'] == first
+    assert summary['imported'] == 4 - first
+    assert len(manager.get_all_models()) == 4
+
+    # Una tercera pasada no importa nada de nuevo
+    assert importer.import_source(source)['imported'] == 0
+    assert len(manager.get_all_models()) == 4
+
+
+def test_reimport_after_delete_model(manager, tmp_path):
+    source = tmp_path / "src"
+    _write(source / "a.stl", b"solid a\nendsolid a\n")
+    importer = LibraryImporter(manager, max_workers=1)
+    assert importer.import_source(str(source))['imported'] == 1
+
+    assert manager.delete_model(manager.get_all_models()[0]['id'])
+    summary = importer.import_source(str(source))
+    assert (summary['imported'], summary['resumed']) == (1, 0)
+    models = manager.get_all_models()
+    assert len(models) == 1 and os.path.exists(models[0]['file_path'])
+
+
+def test_reimport_modified_file(manager, tmp_path):
+    source = tmp_path / "src"
+    path = _write(source / "a.stl", b"solid a\nendsolid a\n")
+    importer = LibraryImporter(manager, max_workers=1)
+    assert importer.import_source(str(source))['imported'] == 1
+
+    manager.delete_model(manager.get_all_models()[0]['id'])
+    _write(source / "a.stl", b"solid otra\nendsolid otra\n")
+    os.utime(path, (0, 0))
+    summary = importer.import_source(str(source))
+    assert (summary['imported'], summary['resumed']) == (1, 0)
+    with open(manager.get_all_models()[0]['file_path'], 'rb') as f:
+        assert f.read() == b"solid otra\nendsolid otra\n"
+
+    # Editado en el sitio sin borrar el modelo: también se vuelve a importar
+    _write(source / "a.stl", b"solid tercera\nendsolid tercera\n")
+    assert importer.import_source(str(source))['imported'] == 1
+    assert len(manager.get_all_models()) == 2
+
+
+def test_bulk_import_recreates_damaged_blob(manager, tmp_path):
+    source = tmp_path / "src"
+    _write(source / "a.stl", b"solid a\nendsolid a\n")
+    _write(tmp_path / "otra" / "copia.stl", b"solid a\nendsolid a\n")
+    LibraryImporter(manager, max_workers=1).import_source(str(source))
+    blob_path = manager.get_all_models()[0]['file_path']
+    with open(blob_path, 'wb') as f:
+        f.write(b"truncado")
+
+    summary = LibraryImporter(manager, max_workers=1).import_source(str(tmp_path / "otra"))
+    assert summary['duplicates'] == 1
+    with open(blob_path, 'rb') as f:
+        assert f.read() == b"solid a\nendsolid a\n"
+    blob = manager.store.get(manager.get_all_models()[0]['blob_hash'])
+    assert blob['refcount'] == 2
+    assert (blob['size'], blob['mtime']) == (os.path.getsize(blob_path), os.stat(blob_path).st_mtime)
+
+
+def test_import_worker_runs_in_background_thread(manager, tmp_path, qtbot):
+    from src.ui.library_import_worker import LibraryImportWorker
+    source = _make_folder(tmp_path / "src")
+    worker = LibraryImportWorker(manager, source)
+    with qtbot.waitSignal(worker.import_finished, timeout=10000) as blocker:
+        worker.start()
+    worker.wait()
+
+    assert blocker.args[0]['imported'] == 4
+    assert manager.db.query_one("SELECT COUNT(*) AS n FROM models")['n'] == 4
+    # El hilo del worker cerró su conexión al terminar
+    assert manager.db.pool_size() == 1
@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+trimesh = pytest.importorskip("trimesh")
+
+from src.logic.mesh_analysis import MeshAnalyzer, analyze_arrays, estimate_filament
+
+
+def test_box_analysis():
+    box = trimesh.creation.box(extents=(10, 20, 30))
+    result = analyze_arrays(box.vertices, box.faces)
+    assert result['volume_cm3'] == pytest.approx(6.0)
+    assert result['surface_area_cm2'] == pytest.approx(22.0)
+    assert (result['bbox_x_mm'], result['bbox_y_mm'], result['bbox_z_mm']) == pytest.approx((10, 20, 30))
+    assert result['is_watertight']
+
+
+def test_sphere_volume_and_open_mesh():
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    result = analyze_arrays(sphere.vertices, sphere.faces)
+    assert result['volume_cm3'] == pytest.approx(4 / 3 * math.pi, rel=0.01)
+
+    open_mesh = analyze_arrays(sphere.vertices, sphere.faces[:-10])
+    assert not open_mesh['is_watertight']
+
+
+def test_estimate_filament():
+    # 10 cm³ sólidos, carcasa de 0.08 cm sobre 20 cm² = 1.6 cm³
+    estimate = estimate_filament(10.0, 20.0, density=1.24, diameter=1.75,
+                                 infill=0.2, perimeters=2, line_width=0.4)
+    material = 1.6 + (10.0 - 1.6) * 0.2
+    assert estimate['material_cm3'] == pytest.approx(material)
+    assert estimate['grams'] == pytest.approx(material * 1.24)
+    assert estimate['length_m'] == pytest.approx(material / (math.pi * 0.0875 ** 2) / 100)
+
+    # Pieza fina: la carcasa no puede superar el volumen
+    assert estimate_filament(1.0, 100.0)['material_cm3'] == pytest.approx(1.0)
+
+
+def test_save_and_estimate_for_model(db):
+    db.execute("INSERT INTO models (name, file_path) VALUES ('cubo', 'cubo.stl')")
+    db.execute(
+        """INSERT INTO filaments (brand, material_type, color, weight_initial, weight_current,
+                                  price, density, diameter)
+           VALUES ('X', 'PETG', 'Negro', 1000, 1000, 20, 1.27, 2.85)"""
+    )
+    model_id = db.query_one("SELECT id FROM models")['id']
+    filament_id = db.query_one("SELECT id FROM filaments")['id']
+    analyzer = MeshAnalyzer(db)
+
+    assert analyzer.get_models_pending_analysis() == [(model_id, 'cubo.stl')]
+    assert analyzer.estimate_for_model(model_id) is None
+
+    box = trimesh.creation.box(extents=(20, 20, 20))
+    analyzer.save_analysis(model_id, analyze_arrays(box.vertices, box.faces))
+    assert analyzer.get_models_pending_analysis() == []
+
+    pla = analyzer.estimate_for_model(model_id)
+    petg = analyzer.estimate_for_model(model_id, filament_id)
+    assert petg['grams'] == pytest.approx(pla['grams'] * 1.27 / 1.24)
+    assert petg['length_m'] < pla['length_m']
+
+
+def test_analyze_batch(tmp_path):
+    path = tmp_path / "box.stl"
+    trimesh.creation.box(extents=(10, 10, 10)).export(str(path))
+    results = dict(MeshAnalyzer.analyze_batch([(1, str(path)), (2, str(tmp_path / "x.stl"))], max_workers=2))
+    assert results[1]['volume_cm3'] == pytest.approx(1.0)
+    assert results[2] is None
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+trimesh = pytest.importorskip("trimesh")
+
+from src.logic.mesh_lod import MeshLODCache, compute_vertex_normals, decimate_arrays
+
+
+@pytest.fixture
+def sphere_stl(tmp_path):
+    path = tmp_path / "sphere.stl"
+    trimesh.creation.icosphere(subdivisions=5, radius=20).export(str(path))  # 20480 caras
+    return str(path)
+
+
+def test_decimate_arrays_small_mesh_untouched():
+    box = trimesh.creation.box()
+    vertices, faces = decimate_arrays(box.vertices, box.faces, max_faces=100)
+    assert len(faces) == len(box.faces)
+
+
+def test_compute_vertex_normals_sphere():
+    sphere = trimesh.creation.icosphere(subdivisions=3)
+    normals = compute_vertex_normals(sphere.vertices, sphere.faces)
+    assert normals.dtype == np.float32
+    assert np.linalg.norm(normals, axis=1) == pytest.approx(1.0, abs=1e-5)
+    # En una esfera centrada la normal apunta hacia fuera
+    radial = sphere.vertices / np.linalg.norm(sphere.vertices, axis=1)[:, None]
+    assert np.einsum('ij,ij->i', normals, radial).min() > 0.99
+
+
+def test_build_and_open_lod_cache(sphere_stl):
+    built = MeshLODCache.build(sphere_stl, levels=(1000, 5000, 50000, None))
+    assert os.path.exists(sphere_stl + '.lod.npz')
+    # 50000 >= 20480 caras: ese nivel se omite
+    assert len(built.face_counts) == 3
+    assert built.face_counts[0] <= 1000 <= built.face_counts[1] <= 5000
+    assert built.face_counts[-1] == 20480
+
+    cache = MeshLODCache.open(sphere_stl)
+    assert cache.face_counts == built.face_counts
+    assert cache.bbox == pytest.approx(np.array([[-20, -20, -20], [20, 20, 20]]), abs=0.1)
+    vertices, faces, normals = cache.get_level(2)
+    assert isinstance(vertices, np.memmap)
+    assert faces.dtype == np.uint32 and len(faces) == 20480
+    assert normals.shape == vertices.shape
+
+
+def test_lod_levels_up_to(sphere_stl):
+    cache = MeshLODCache.build(sphere_stl, levels=(1000, 5000, None))
+    assert cache.levels_up_to(None) == [0, 1, 2]
+    assert cache.levels_up_to(5000) == [0, 1]
+    assert cache.levels_up_to(10) == [0]
+
+
+def test_lod_cache_invalidated_when_model_changes(sphere_stl):
+    MeshLODCache.build(sphere_stl)
+    trimesh.creation.box().export(sphere_stl)
+    assert MeshLODCache.open(sphere_stl) is None
+
+    MeshLODCache.remove(sphere_stl)
+    assert not os.path.exists(sphere_stl + '.lod.npz')
+
+
+def test_library_add_model_builds_lod_cache(db, sphere_stl, tmp_path, monkeypatch):
+    from src.database.db_manager import DBManager
+    from src.logic.library_manager import LibraryManager
+
+    monkeypatch.setattr(DBManager, '_get_user_data_dir', staticmethod(lambda: str(tmp_path / "app")))
+    manager = LibraryManager(db)
+    ok, _ = manager.add_model(sphere_stl, "Esfera")
+    assert ok
+
+    model = manager.get_all_models()[0]
+    assert MeshLODCache.open(model['file_path']) is not None
+    assert manager.delete_model(model['id'])
+    assert not os.path.exists(MeshLODCache.path_for(model['file_path']))
+
+
+def test_build_reuses_loaded_mesh(sphere_stl, monkeypatch):
+    import src.logic.mesh_lod as mesh_lod
+
+    mesh = trimesh.load(sphere_stl)
+    monkeypatch.setattr(mesh_lod, 'load_mesh', lambda path: pytest.fail("no debe releer el archivo"))
+    cache = MeshLODCache.build(sphere_stl, levels=(1000, None), mesh=mesh)
+    assert cache.face_counts[-1] == 20480
+    assert not [name for name in os.listdir(os.path.dirname(sphere_stl)) if name.endswith('.tmp')]
+
+
+def test_library_add_model_defers_lod_cache(db, sphere_stl, tmp_path, monkeypatch):
+    from src.database.db_manager import DBManager
+    from src.logic.library_manager import LibraryManager
+
+    monkeypatch.setattr(DBManager, '_get_user_data_dir', staticmethod(lambda: str(tmp_path / "app")))
+    manager = LibraryManager(db)
+    deferred = []
+
+    def build_lod(path):
+        # La fila ya está guardada cuando se pide la caché
+        assert [m['file_path'] for m in manager.get_all_models()] == [path]
+        deferred.append(path)
+
+    ok, _ = manager.add_model(sphere_stl, "Esfera", build_lod=build_lod)
+    assert ok and len(deferred) == 1
+    assert MeshLODCache.open(deferred[0]) is None
+
+
+def test_gl_view_accepts_empty_mesh(qtbot):
+    from src.ui.viewer_gl import GLMeshView
+    view = GLMeshView()
+    qtbot.addWidget(view)
+    view.set_mesh(np.zeros((0, 3)), np.zeros((0, 3)))
+    interleaved, faces = view._pending
+    assert interleaved.shape == (0, 6) and faces.size == 0
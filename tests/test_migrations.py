@@ -35,12 +35,54 @@ def test_orders_table_exists(db):
     assert len(result) == 1
 
 
+def test_blobs_table_exists(db):
+    result = db.query("SELECT name FROM sqlite_master WHERE type='table' AND name='blobs'")
+    assert len(result) == 1
+
+
+def test_library_import_journal_table_exists(db):
+    result = db.query("SELECT name FROM sqlite_master WHERE type='table' AND name='library_import_journal'")
+    assert len(result) == 1
+
+
+def test_fts_tables_exist(db):
+    names = {row['name'] for row in db.query("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {'models_fts', 'projects_fts', 'customers_fts', 'orders_fts'}.issubset(names)
+
+
+def test_gcode_cache_table_exists(db):
+    result = db.query("SELECT name FROM sqlite_master WHERE type='table' AND name='gcode_cache'")
+    assert len(result) == 1
+
+
+def test_models_analysis_columns(db):
+    columns = {r['name'] for r in db.query("PRAGMA table_info(models)")}
+    assert {'volume_cm3', 'surface_area_cm2', 'bbox_x_mm', 'bbox_y_mm',
+            'bbox_z_mm', 'is_watertight', 'analyzed_at'} <= columns
+
+
+def test_add_column_migration_on_old_schema():
+    from src.database.db_manager import DBManager
+    old = DBManager(db_file=":memory:")
+    old.connect()
+    old.execute("CREATE TABLE models (id INTEGER PRIMARY KEY, name TEXT, file_path TEXT)")
+    for stmt in MIGRATIONS[4]:
+        stmt(old)
+        stmt(old)  # idempotente
+    columns = {r['name'] for r in old.query("PRAGMA table_info(models)")}
+    assert 'volume_cm3' in columns and 'analyzed_at' in columns
+    old.disconnect()
+
+
 def test_indexes_created(db):
     indexes = {r['name'] for r in db.query("SELECT name FROM sqlite_master WHERE type='index'")}
     expected = {
         'idx_filaments_user', 'idx_models_user', 'idx_projects_user',
         'idx_projects_status', 'idx_projects_user_status', 'idx_user_tokens_user',
         'idx_orders_customer', 'idx_orders_status', 'idx_customers_user',
+        'idx_gcode_cache_last_used', 'idx_models_blob',
+        'idx_orders_user_created', 'idx_customers_user_name', 'idx_orders_user',
+        'idx_filaments_user_material', 'idx_filaments_user_color', 'idx_filaments_user_stock',
     }
     assert expected.issubset(indexes)
 
@@ -57,3 +99,16 @@ def test_fresh_db_migration_from_zero():
     current = fresh.query_one("SELECT MAX(version) AS v FROM schema_version")
     assert current['v'] == max(MIGRATIONS.keys())
     fresh.disconnect()
+
+
+def test_failed_migration_applies_nothing(db, monkeypatch):
+    import sqlite3
+    import src.database.migrations as migrations
+    last = max(MIGRATIONS.keys())
+    monkeypatch.setitem(migrations.MIGRATIONS, last + 1,
+                        ["CREATE TABLE mig_tmp (id INTEGER PRIMARY KEY)"])
+    monkeypatch.setitem(migrations.MIGRATIONS, last + 2, ["SELECT * FROM tabla_inexistente"])
+    with pytest.raises(sqlite3.OperationalError):
+        run_migrations(db)
+    assert db.query_one("SELECT MAX(version) AS v FROM schema_version")['v'] == last
+    assert db.query("SELECT name FROM sqlite_master WHERE name = 'mig_tmp'") == []
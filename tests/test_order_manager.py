@@ -0,0 +1,76 @@
+import pytest
+
+from src.logic.customer_manager import CustomerManager
+from src.logic.order_manager import OrderManager
+
+
+def _user(db, username="omuser"):
+    db.execute(
+        "INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+        (username,)
+    )
+    return db.query_one("SELECT id FROM users WHERE username = ?", (username,))['id']
+
+
+def _manager(cls, db):
+    manager = cls.__new__(cls)
+    manager.db = db
+    return manager
+
+
+@pytest.fixture
+def setup(db):
+    uid = _user(db)
+    customers = _manager(CustomerManager, db)
+    customers.create_customer(uid, "Ana Pérez")
+    customer_id = customers.get_all_customers(uid)[0]['id']
+    return uid, customer_id, _manager(OrderManager, db)
+
+
+def test_create_order_with_status(setup):
+    uid, customer_id, manager = setup
+    ok, _ = manager.create_order(uid, customer_id, 12.5, quantity=2, status='Aceptado')
+    assert ok
+    order = manager.get_all_orders(uid)[0]
+    assert order['status'] == 'Aceptado'
+    assert order['total_price'] == 25.0
+
+
+def test_create_orders_bulk_single_commit(setup, db):
+    uid, customer_id, manager = setup
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    ok, _ = manager.create_orders(uid, [
+        {'customer_id': customer_id, 'unit_price': float(i), 'quantity': 2} for i in range(300)
+    ])
+    db.connection.set_trace_callback(None)
+    assert ok
+    assert manager.count_orders(uid) == 300
+    assert statements.count('COMMIT') == 1
+
+
+def test_create_orders_bulk_rolls_back_on_error(setup):
+    uid, customer_id, manager = setup
+    ok, _ = manager.create_orders(uid, [
+        {'customer_id': customer_id, 'unit_price': 1.0},
+        {'customer_id': 999999, 'unit_price': 1.0},
+    ])
+    assert not ok
+    assert manager.count_orders(uid) == 0
+
+
+def test_update_orders_status_and_delete(setup):
+    uid, customer_id, manager = setup
+    manager.create_orders(uid, [{'customer_id': customer_id, 'unit_price': 5.0}] * 3)
+    ids = [o['id'] for o in manager.get_all_orders(uid)]
+
+    ok, _ = manager.update_orders_status(ids[:2], 'Entregado')
+    assert ok
+    delivered = [o for o in manager.get_all_orders(uid) if o['status'] == 'Entregado']
+    assert len(delivered) == 2
+    assert all(o['delivered_at'] for o in delivered)
+    assert not manager.update_orders_status(ids, 'Inexistente')[0]
+
+    ok, _ = manager.delete_orders(ids)
+    assert ok
+    assert manager.count_orders(uid) == 0
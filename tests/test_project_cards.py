@@ -0,0 +1,73 @@
+from PyQt5.QtCore import Qt, QEvent, QRect
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QStyleOptionViewItem
+
+from src.ui.project_cards import (PROJECT_ROLE, ProjectCardDelegate, ProjectGridView,
+                                  ProjectListModel)
+from src.ui.table_models import ID_ROLE
+
+
+def _project(pid, name="Proyecto", status="Pendiente", cost=0):
+    return {'id': pid, 'name': name, 'status': status, 'total_cost': cost,
+            'model_name': None, 'filament_brand': None, 'material_type': None}
+
+
+def test_incremental_updates(qtbot):
+    model = ProjectListModel()
+    model.set_projects([_project(2, "B"), _project(1, "A")])
+    inserted, changed, removed = [], [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+    model.dataChanged.connect(lambda top, bottom: changed.append(top.row()))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+
+    model.upsert_project(_project(3, "C"))
+    assert inserted == [0]
+    assert [model.index(r).data() for r in range(3)] == ["C", "B", "A"]
+
+    model.upsert_project(_project(1, "A editado", status="Completado"))
+    assert changed == [2]
+    assert model.index(2).data(PROJECT_ROLE)['status'] == "Completado"
+
+    model.remove_project(2)
+    assert removed == [1]
+    assert [model.index(r).data(ID_ROLE) for r in range(2)] == [3, 1]
+    model.remove_project(99)  # inexistente: no hace nada
+    assert model.rowCount() == 2
+
+
+def test_card_buttons_emit_actions(qtbot):
+    model = ProjectListModel()
+    model.set_projects([_project(5)])
+    delegate = ProjectCardDelegate()
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 320, 240)
+    triggered = []
+    delegate.action_triggered.connect(lambda action, pid: triggered.append((action, pid)))
+
+    for rect in delegate._button_rects(option):
+        assert option.rect.contains(rect)
+        event = QMouseEvent(QEvent.MouseButtonRelease, rect.center(), Qt.LeftButton,
+                            Qt.LeftButton, Qt.NoModifier)
+        delegate.editorEvent(event, model, option, model.index(0))
+    assert triggered == [('edit', 5), ('delete', 5)]
+
+
+def test_grid_paints_visible_cards_only(qtbot):
+    model = ProjectListModel()
+    model.set_projects([_project(i, f"Proyecto {i}", cost=i) for i in range(2000)])
+    painted = []
+
+    class CountingDelegate(ProjectCardDelegate):
+        def paint(self, painter, option, index):
+            painted.append(index.row())
+            super().paint(painter, option, index)
+
+    view = ProjectGridView()
+    qtbot.addWidget(view)
+    view.setModel(model)
+    view.setItemDelegate(CountingDelegate(view))
+    view.resize(1050, 600)
+    view.show()
+    view.grab()
+    assert painted
+    assert len(set(painted)) < 50
@@ -20,9 +20,7 @@ def _setup(db, username="pmuser"):
 
 @pytest.fixture
 def pm(db):
-    manager = ProjectManager.__new__(ProjectManager)
-    manager.db = db
-    return manager
+    return ProjectManager(db)
 
 
 def test_create_project(db, pm):
@@ -100,3 +98,14 @@ def test_get_project_stats(db, pm):
     stats = pm.get_project_stats(uid)
     assert stats['total_projects'] == 2
     assert stats['pending'] == 2
+
+
+def test_get_all_projects_paged(db, pm):
+    uid, _ = _setup(db, "paguser")
+    for i in range(5):
+        pm.create_project(uid, f"P{i}")
+    first = pm.get_all_projects_paged(uid, limit=2)
+    assert [p['name'] for p in first] == ["P4", "P3"]
+    rest = pm.get_all_projects_paged(uid, after_id=first[-1]['id'], limit=10)
+    assert [p['name'] for p in rest] == ["P2", "P1", "P0"]
+    assert set(first[0]) == set(pm.get_all_projects(uid)[0])
@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+
+from src.database.query_stats import QueryStats, normalize_sql
+from src.utils.logger import slow_query_logger
+
+
+def test_normalize_sql_groups_literals_and_in_lists():
+    assert normalize_sql("SELECT *  FROM t\n WHERE id = 5 AND name = 'ana'") == \
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+        normalize_sql("SELECT * FROM t WHERE id IN (?,?)")
+    # Los números dentro de identificadores no se tocan
+    assert normalize_sql("SELECT col_2 FROM t1") == "SELECT col_2 FROM t1"
+
+
+def test_percentiles_by_statement():
+    stats = QueryStats(slow_ms=10_000)
+    for ms in range(1, 101):
+        stats.record("SELECT * FROM t WHERE id = ?", ms / 1000.0)
+    stats.record("SELECT 1", 0.002)
+    top = stats.snapshot()
+    assert [row['sql'] for row in top] == ["SELECT * FROM t WHERE id = ?", "SELECT ?"]
+    row = top[0]
+    assert row['count'] == 100
+    assert row['p50_ms'] == pytest.approx(50, abs=1)
+    assert row['p95_ms'] == pytest.approx(95, abs=1)
+    assert row['p99_ms'] == pytest.approx(99, abs=1)
+    assert row['max_ms'] == pytest.approx(100)
+    assert stats.summary()['executions'] == 101
+
+    stats.reset()
+    assert stats.snapshot() == []
+
+
+def test_db_manager_records_statements(db):
+    db.stats.reset()
+    db.execute("INSERT INTO users (username, password_hash, email, is_guest) VALUES ('qs1','h','',0)")
+    db.query("SELECT * FROM users WHERE username = ?", ('qs1',))
+    db.reader().query_one("SELECT * FROM users WHERE username = ?", ('qs1',))
+    by_sql = {row['sql']: row for row in db.stats.snapshot()}
+    assert by_sql["SELECT * FROM users WHERE username = ?"]['count'] == 2
+    assert by_sql["COMMIT"]['count'] == 1
+
+
+def test_slow_queries_logged_with_plan(db, tmp_path, monkeypatch):
+    # El log de consultas lentas va a tmp_path, no a logs/ del proyecto
+    log_file = tmp_path / 'slow_queries.log'
+    handler = logging.FileHandler(log_file, encoding='utf-8')
+    monkeypatch.setattr(slow_query_logger, 'handlers', [handler])
+
+    db.stats.reset()
+    db.stats.slow_ms = 0
+    try:
+        db.query("SELECT * FROM filaments WHERE user_id = ?", (1,))
+    finally:
+        db.stats.slow_ms = QueryStats.SLOW_MS
+        handler.close()
+    slow = db.stats.slow_queries()
+    assert slow[0]['sql'] == "SELECT * FROM filaments WHERE user_id = ?"
+    assert any('idx_filaments_user' in line for line in slow[0]['plan'])
+    assert "SELECT * FROM filaments WHERE user_id = ?" in log_file.read_text(encoding='utf-8')
+
+
+def test_settings_diagnostics_panel(db, qtbot):
+    from src.ui.settings_widget import SettingsWidget
+    db.stats.reset()
+    db.query("SELECT COUNT(*) FROM users")
+    widget = SettingsWidget(db_manager=db)
+    qtbot.addWidget(widget)
+    widget.refresh_diagnostics()
+    assert widget.diag_table.rowCount() >= 1
+    assert widget.diag_table.item(0, 0).text() == "SELECT COUNT(*) FROM users"
+    widget.reset_diagnostics()
+    assert widget.diag_table.rowCount() == 0
@@ -0,0 +1,101 @@
+import pytest
+
+from src.database.db_manager import DBManager
+from src.database.migrations import run_migrations
+from src.logic.search_manager import SearchManager
+from tests.conftest import SCHEMA
+
+
+def _user(db, username):
+    db.execute(
+        "INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+        (username,)
+    )
+    return db.query_one("SELECT id FROM users WHERE username = ?", (username,))['id']
+
+
+@pytest.fixture
+def search(db):
+    return SearchManager(db)
+
+
+def test_build_match_query():
+    assert SearchManager.build_match_query("  ") is None
+    assert SearchManager.build_match_query('soporte "AND* cámara') == '"soporte"* "AND"* "cámara"*'
+
+
+def test_prefix_and_accents(db, search):
+    uid = _user(db, "s1")
+    db.execute("INSERT INTO models (name, description, file_path, user_id) VALUES (?, ?, '', ?)",
+               ("Soporte_cámara_v2.stl", "Para trípode", uid))
+    db.execute("INSERT INTO models (name, description, file_path, user_id) VALUES (?, ?, '', ?)",
+               ("Engranaje.stl", "", uid))
+    model_id = db.query_one("SELECT id FROM models WHERE name LIKE 'Soporte%'")['id']
+
+    assert search.search_ids('model', "sop") == [model_id]
+    assert search.search_ids('model', "CAMARA") == [model_id]
+    assert search.search_ids('model', "sop tripo") == [model_id]
+    assert search.search_ids('model', "sop engra") == []
+    assert set(search.search_ids('model', "stl", ranked=False)) == {
+        row['id'] for row in db.query("SELECT id FROM models")
+    }
+
+
+def test_triggers_keep_index_in_sync(db, search):
+    uid = _user(db, "s2")
+    db.execute("INSERT INTO models (name, file_path, user_id) VALUES ('Jarrón', '', ?)", (uid,))
+    model_id = db.query_one("SELECT id FROM models")['id']
+
+    db.execute("UPDATE models SET name = 'Maceta' WHERE id = ?", (model_id,))
+    assert search.search_ids('model', "jarron") == []
+    assert search.search_ids('model', "mace") == [model_id]
+
+    db.execute("DELETE FROM models WHERE id = ?", (model_id,))
+    assert search.search_ids('model', "mace") == []
+
+
+def test_orders_follow_customer_and_project_names(db, search):
+    uid = _user(db, "s3")
+    db.execute("INSERT INTO customers (user_id, name) VALUES (?, 'Lucía Gómez')", (uid,))
+    cid = db.query_one("SELECT id FROM customers")['id']
+    db.execute("INSERT INTO projects (user_id, name) VALUES (?, 'Llavero')", (uid,))
+    pid = db.query_one("SELECT id FROM projects")['id']
+    db.execute(
+        "INSERT INTO orders (user_id, customer_id, project_id, unit_price, total_price) VALUES (?, ?, ?, 5, 5)",
+        (uid, cid, pid)
+    )
+    oid = db.query_one("SELECT id FROM orders")['id']
+
+    assert search.search_ids('order', "lucia") == [oid]
+    assert search.search_ids('order', "llave") == [oid]
+
+    db.execute("UPDATE customers SET name = 'Marta Ruiz' WHERE id = ?", (cid,))
+    assert search.search_ids('order', "lucia") == []
+    assert search.search_ids('order', "marta") == [oid]
+
+
+def test_global_search_ranks_and_filters_by_user(db, search):
+    uid = _user(db, "s4")
+    other = _user(db, "s5")
+    db.execute("INSERT INTO projects (user_id, name, description) VALUES (?, 'Dragón', '')", (uid,))
+    db.execute("INSERT INTO models (name, description, file_path, user_id) VALUES "
+               "('Base.stl', 'base para el dragón', '', ?)", (uid,))
+    db.execute("INSERT INTO customers (user_id, name) VALUES (?, 'Dragones S.L.')", (other,))
+
+    results = search.search("drag", user_id=uid)
+    assert [r['kind'] for r in results] == ['project', 'model']
+    assert results[0]['title'] == 'Dragón'
+
+    assert {r['kind'] for r in search.search("drag")} == {'project', 'model', 'customer'}
+    assert search.search("drag", kinds=['customer'])[0]['title'] == 'Dragones S.L.'
+
+
+def test_migration_indexes_existing_rows():
+    db = DBManager(db_file=":memory:")
+    db.init_db(SCHEMA)
+    db.execute("INSERT INTO models (name, file_path) VALUES ('Existente.stl', '')")
+    run_migrations(db)
+    try:
+        assert len(SearchManager(db).search_ids('model', "exist")) == 1
+    finally:
+        db.disconnect()
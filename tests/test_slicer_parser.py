@@ -1,5 +1,7 @@
+import os
+
 import pytest
-from src.logic.slicer_parser import SlicerParser
+from src.logic.slicer_parser import SlicerDialect, SlicerParser
 
 CURA_CONTENT = """;FLAVOR:Marlin
 ;TIME:3665
@@ -50,3 +52,233 @@ def test_prusa_estimation(tmp_path):
     assert data is not None
     assert data['print_time_seconds'] == 2700  # 45m
     assert data['filament_weight_g'] == pytest.approx(2.98, abs=0.1)
+
+
+def test_full_scan_finds_metadata_in_the_middle(tmp_path):
+    f = tmp_path / "middle.gcode"
+    moves = "G1 X10 Y10 E0.5\n" * 5000
+    f.write_text(moves + PRUSA_CONTENT + moves)
+    data = SlicerParser().parse_file(str(f), full_scan=True)
+    assert data is not None
+    assert data['print_time_seconds'] == 5025
+    assert data['filament_weight_g'] == pytest.approx(12.34)
+
+
+def test_head_tail_miss_falls_back_to_full_scan(tmp_path):
+    f = tmp_path / "fallback.gcode"
+    moves = "G1 X10 Y10 E0.5\n" * 5000
+    f.write_text(moves + CURA_CONTENT + moves)
+    data = SlicerParser().parse_file(str(f))
+    assert data is not None
+    assert data['print_time_seconds'] == 3665
+
+
+def test_full_scan_key_across_chunk_boundary(tmp_path):
+    parser = SlicerParser()
+    parser.CHUNK_SIZE = 64
+    parser.CHUNK_OVERLAP = 64
+    f = tmp_path / "boundary.gcode"
+    # La línea ';TIME:' empieza justo antes del límite del primer bloque
+    f.write_text("G1 X1 Y1\n" * 6 + "G28\n;TIME:3665\n;Filament used: 1.23m\n")
+    data = parser.parse_file(str(f), full_scan=True)
+    assert data is not None
+    assert data['print_time_seconds'] == 3665
+    assert data['filament_length_m'] == pytest.approx(1.23)
+
+
+def test_full_scan_empty_file(tmp_path):
+    f = tmp_path / "empty.gcode"
+    f.write_text("")
+    assert SlicerParser().parse_file(str(f), full_scan=True) is None
+
+
+PRUSA_MULTI = """; estimated printing time = 10m 0s
+; filament used [mm] = 1000.00, 500.00
+; filament used [g] = 3.00, 1.50
+"""
+
+
+def test_prusa_multi_filament(tmp_path):
+    f = tmp_path / "multi.gcode"
+    f.write_text(PRUSA_MULTI)
+    data = SlicerParser().parse_file(str(f))
+    assert data['filament_weight_g'] == pytest.approx(4.5)
+    assert data['filament_weights_g'] == [3.0, 1.5]
+    assert data['filament_lengths_m'] == pytest.approx([1.0, 0.5])
+
+
+def test_time_str_with_days():
+    assert SlicerParser()._parse_time_str("1d 2h 3m 4s") == 93784
+    assert SlicerParser()._parse_time_str("45s") == 45
+
+
+class _SimplifyDialect(SlicerDialect):
+    name = 'Simplify3D'
+    keys = {
+        'time': rb'   Build time: ',
+        'weight': rb'   Plastic weight: ',
+    }
+
+    def build(self, values, parser):
+        hours, minutes = parser._parse_number_list(values.get('time', ''))[:2]
+        data = {'print_time_seconds': int(hours * 3600 + minutes * 60), 'slicer_name': self.name}
+        weights = parser._parse_number_list(values.get('weight', ''))
+        if weights:
+            data['filament_weight_g'] = weights[0]
+        return data
+
+
+def test_register_dialect(tmp_path, monkeypatch):
+    monkeypatch.setattr(SlicerParser, 'DIALECTS', list(SlicerParser.DIALECTS))
+    monkeypatch.setattr(SlicerParser, '_matcher', None)
+    SlicerParser.register_dialect(_SimplifyDialect())
+
+    f = tmp_path / "s3d.gcode"
+    f.write_text("G1 X1 E1\n;   Build time: 2 hours 30 minutes\n;   Plastic weight: 21.5g (0.05lb)\n")
+    data = SlicerParser().parse_file(str(f), full_scan=True, simulate=False)
+    assert data['slicer_name'] == 'Simplify3D'
+    assert data['print_time_seconds'] == 9000
+    assert data['filament_weight_g'] == pytest.approx(21.5)
+
+    # Los dialectos existentes siguen funcionando con el patrón reconstruido
+    f2 = tmp_path / "cura.gcode"
+    f2.write_text(CURA_CONTENT)
+    assert SlicerParser().parse_file(str(f2))['slicer_name'] == 'Cura'
+
+
+def test_collect_gcode_files_dir_and_glob(tmp_path):
+    (tmp_path / "a.gcode").write_text(CURA_CONTENT)
+    (tmp_path / "b.GCO").write_text(CURA_CONTENT)
+    (tmp_path / "notes.txt").write_text("x")
+    found = SlicerParser.collect_gcode_files(str(tmp_path))
+    assert [os.path.basename(p) for p in found] == ["a.gcode", "b.GCO"]
+    assert SlicerParser.collect_gcode_files(str(tmp_path / "a.*")) == [str(tmp_path / "a.gcode")]
+
+
+def test_parse_batch_and_summary(tmp_path):
+    (tmp_path / "cura.gcode").write_text(CURA_CONTENT)
+    (tmp_path / "prusa.gcode").write_text(PRUSA_CONTENT)
+    (tmp_path / "multi.gcode").write_text(PRUSA_MULTI)
+    (tmp_path / "broken.gcode").write_text("G28\n")
+    results = list(SlicerParser().parse_batch(str(tmp_path), max_workers=2))
+    assert len(results) == 4
+
+    summary = SlicerParser.summarize_batch(results)
+    assert summary['files'] == 4
+    assert summary['parsed'] == 3
+    assert summary['failed'] == [str(tmp_path / "broken.gcode")]
+    assert summary['print_time_seconds'] == 3665 + 5025 + 600
+    assert summary['per_filament'][1]['filament_weight_g'] == pytest.approx(1.5)
+    assert summary['per_filament'][0]['filament_length_m'] == pytest.approx(1.23 + 1.23456 + 1.0, abs=1e-4)
+
+
+def _bgcode_block(block_type, payload, compress=False, params=b'\x00\x00'):
+    import struct
+    import zlib
+    if compress:
+        data = zlib.compress(payload)
+        header = struct.pack('<HHII', block_type, 1, len(payload), len(data))
+    else:
+        data = payload
+        header = struct.pack('<HHI', block_type, 0, len(payload))
+    return header + params + data + b'\x00\x00\x00\x00'  # CRC32 (no se verifica)
+
+
+def test_bgcode_metadata(tmp_path):
+    import struct
+    content = b'GCDE' + struct.pack('<IH', 1, 1)
+    content += _bgcode_block(0, b'Producer=PrusaSlicer 2.7.0\n')
+    content += _bgcode_block(3, b'filament_type=PLA;PETG\n'
+                                b'estimated printing time (normal mode)=1h 2m 3s\n', compress=True)
+    content += _bgcode_block(5, b'\x89PNG' + b'\x00' * 100, params=b'\x00\x00\x10\x00\x10\x00')
+    content += _bgcode_block(4, b'filament used [mm]=1000.00, 500.00\n'
+                                b'filament used [g]=3.00, 1.50\n')
+    # Bloque de G-code con compresión heatshrink: nunca debe leerse
+    content += struct.pack('<HHII', 1, 3, 10 ** 6, 64) + b'\x00\x00' + b'\xff' * 64
+    f = tmp_path / "print.bgcode"
+    f.write_bytes(content)
+
+    data = SlicerParser().parse_file(str(f))
+    assert data['print_time_seconds'] == 3723
+    assert data['filament_weights_g'] == [3.0, 1.5]
+    assert data['filament_length_m'] == pytest.approx(1.5)
+    assert data['filament_types'] == ['PLA', 'PETG']
+    assert data['slicer_name'] == 'PrusaSlicer 2.7.0'
+
+
+SLICE_INFO = """<?xml version="1.0" encoding="UTF-8"?>
+<config>
+  <plate>
+    <metadata key="index" value="1"/>
+    <metadata key="prediction" value="3600"/>
+    <metadata key="weight" value="20.5"/>
+    <filament id="1" type="PLA" color="#FFFFFF" used_m="6.5" used_g="20.5"/>
+  </plate>
+  <plate>
+    <metadata key="index" value="2"/>
+    <metadata key="prediction" value="600"/>
+    <metadata key="weight" value="4.0"/>
+    <filament id="1" type="PLA" color="#FFFFFF" used_m="1.0" used_g="3.0"/>
+    <filament id="2" type="PETG" color="#000000" used_m="0.3" used_g="1.0"/>
+  </plate>
+</config>
+"""
+
+
+def test_gcode_3mf_slice_info(tmp_path):
+    import zipfile
+    f = tmp_path / "plates.gcode.3mf"
+    with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('Metadata/slice_info.config', SLICE_INFO)
+        archive.writestr('Metadata/plate_1.gcode', 'G1 X1\n' * 1000)
+
+    data = SlicerParser().parse_file(str(f))
+    assert data['print_time_seconds'] == 4200
+    assert data['filament_weight_g'] == pytest.approx(24.5)
+    assert data['filament_weights_g'] == pytest.approx([23.5, 1.0])
+    assert data['filament_lengths_m'] == pytest.approx([7.5, 0.3])
+    assert [p['index'] for p in data['plates']] == [1, 2]
+    assert data['plates'][1]['filaments'][1]['type'] == 'PETG'
+
+
+def test_3mf_without_slice_info(tmp_path):
+    import zipfile
+    f = tmp_path / "model.3mf"
+    with zipfile.ZipFile(f, 'w') as archive:
+        archive.writestr('3D/3dmodel.model', '<model/>')
+    assert SlicerParser().parse_file(str(f)) is None
+
+
+def test_extract_thumbnail_from_gcode_comments(tmp_path):
+    import base64
+    small = b'\x89PNG' + b'\x01' * 40
+    large = b'\x89PNG' + b'\x02' * 300
+
+    def block(png, size):
+        encoded = base64.b64encode(png).decode()
+        lines = [encoded[i:i + 78] for i in range(0, len(encoded), 78)]
+        return (f"; thumbnail begin {size}x{size} {len(encoded)}\n"
+                + "".join(f"; {line}\n" for line in lines)
+                + "; thumbnail end\n;\n")
+
+    f = tmp_path / "thumb.gcode"
+    f.write_text(block(small, 16) + block(large, 220) + PRUSA_CONTENT)
+    assert SlicerParser().extract_thumbnail(str(f)) == large
+
+
+def test_extract_thumbnail_from_bgcode(tmp_path):
+    import struct
+    png = b'\x89PNG' + b'\x00' * 100
+    content = b'GCDE' + struct.pack('<IH', 1, 1)
+    content += _bgcode_block(0, b'Producer=PrusaSlicer 2.7.0\n')
+    content += _bgcode_block(5, b'QOIF' + b'\x00' * 500, params=struct.pack('<HHH', 2, 300, 300))
+    content += _bgcode_block(5, png, params=struct.pack('<HHH', 0, 16, 16))
+    f = tmp_path / "print.bgcode"
+    f.write_bytes(content)
+    assert SlicerParser().extract_thumbnail(str(f)) == png
+
+
+def test_extract_thumbnail_missing(tmp_path):
+    f = tmp_path / "plain.gcode"
+    f.write_text(CURA_CONTENT)
+    assert SlicerParser().extract_thumbnail(str(f)) is None
@@ -0,0 +1,66 @@
+import json
+import sys
+import time
+
+from src.utils.startup_timer import TRACE_ENV, ImportTracer, StartupTimer, trace_request
+
+
+def test_checkpoints_and_phases():
+    timer = StartupTimer()
+    time.sleep(0.01)
+    timer.checkpoint("imports")
+    with timer.phase("página home_widget"):
+        time.sleep(0.01)
+    timer.checkpoint("primer frame")
+
+    phases = timer.report()
+    assert [name for name, _ in phases] == ["imports", "página home_widget", "primer frame"]
+    assert phases[0][1] >= 0.01 and phases[1][1] >= 0.01
+    # La fase medida con phase() no se vuelve a contar en el checkpoint siguiente
+    assert phases[2][1] < 0.01
+    # Cada informe empieza una tanda nueva
+    assert timer.report() == []
+
+
+def test_trace_request_flag_and_env():
+    assert trace_request(['main.py'], {}) is None
+    assert trace_request(['main.py', '--trace-startup'], {}) == ''
+    assert trace_request(['main.py', '--trace-startup=t.json'], {}) == 't.json'
+    assert trace_request(['main.py'], {TRACE_ENV: '1'}) == ''
+    assert trace_request(['main.py'], {TRACE_ENV: '0'}) is None
+    assert trace_request(['main.py'], {TRACE_ENV: 'out.json'}) == 'out.json'
+
+
+def test_import_tracer_self_and_cumulative(tmp_path, monkeypatch):
+    pkg = tmp_path / 'trazapkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text("import time\ntime.sleep(0.01)\nfrom . import hijo\n")
+    (pkg / 'hijo.py').write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    tracer = ImportTracer()
+    tracer.install()
+    try:
+        import trazapkg  # noqa: F401
+    finally:
+        tracer.uninstall()
+        sys.modules.pop('trazapkg', None)
+        sys.modules.pop('trazapkg.hijo', None)
+
+    own, total = tracer.modules['trazapkg']
+    child_own, child_total = tracer.modules['trazapkg.hijo']
+    assert child_total >= 0.02
+    assert total >= own + child_total - 0.001
+    assert 0.01 <= own < 0.02
+    assert tracer.by_package()[0][0] == 'trazapkg'
+
+
+def test_finish_trace_writes_json(tmp_path):
+    timer = StartupTimer()
+    timer.start_trace()
+    timer.checkpoint("imports")
+    trace = timer.finish_trace(timer.report(), str(tmp_path / 'trace.json'))
+    assert timer.tracer is None
+    with open(tmp_path / 'trace.json', encoding='utf-8') as f:
+        assert json.load(f)['phases'][0]['name'] == "imports"
+    assert trace['imports']['modules'] >= 0
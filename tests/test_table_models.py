@@ -0,0 +1,137 @@
+from functools import partial
+
+import pytest
+from PyQt5.QtCore import Qt, QEvent, QPoint, QRect
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QStyleOptionViewItem, QTableView
+
+from src.logic.customer_manager import CustomerManager
+from src.logic.order_manager import OrderManager
+from src.ui.table_models import (ActionButtonDelegate, Column, ID_ROLE, PagedTableModel,
+                                 SqlSortFilterProxyModel)
+
+
+def _user(db, username="tmuser"):
+    db.execute(
+        "INSERT INTO users (username, password_hash, email, is_guest) VALUES (?, 'h', '', 0)",
+        (username,)
+    )
+    return db.query_one("SELECT id FROM users WHERE username = ?", (username,))['id']
+
+
+def _manager(cls, db):
+    manager = cls.__new__(cls)
+    manager.db = db
+    return manager
+
+
+@pytest.fixture
+def orders(db):
+    uid = _user(db)
+    customers = _manager(CustomerManager, db)
+    customers.create_customer(uid, "Ana Pérez")
+    customers.create_customer(uid, "Bruno Díaz")
+    ids = [c['id'] for c in customers.get_all_customers(uid)]
+    rows = [(uid, ids[i % 2], float(i), float(i)) for i in range(450)]
+    db.executemany(
+        "INSERT INTO orders (user_id, customer_id, unit_price, total_price) VALUES (?, ?, ?, ?)",
+        rows
+    )
+    return uid, _manager(OrderManager, db)
+
+
+def _order_model(uid, manager):
+    return PagedTableModel(
+        [Column("ID", 'id'), Column("Cliente", 'customer_name'),
+         Column("Total", 'total_price', lambda v: f"{v:.2f} €"), Column("Acciones", None)],
+        partial(manager.get_orders_page, uid), partial(manager.count_orders, uid),
+        sort='created_at', descending=True
+    )
+
+
+def test_orders_page_sort_and_search(orders):
+    uid, manager = orders
+    assert manager.count_orders(uid) == 450
+    page = manager.get_orders_page(uid, offset=0, limit=10, sort='total_price', descending=False)
+    assert [o['total_price'] for o in page] == [float(i) for i in range(10)]
+    assert page[0]['customer_name'] == "Ana Pérez"
+
+    assert manager.count_orders(uid, search="bruno") == 225
+    page = manager.get_orders_page(uid, limit=500, search="bruno")
+    assert {o['customer_name'] for o in page} == {"Bruno Díaz"}
+    # Una clave de orden desconocida no se inyecta en el SQL
+    assert len(manager.get_orders_page(uid, limit=5, sort="id; DROP TABLE orders")) == 5
+
+
+def test_model_fetches_pages_lazily(orders):
+    uid, manager = orders
+    model = _order_model(uid, manager)
+    model.reload()
+    assert model.total_count() == 450
+    assert model.rowCount() == PagedTableModel.PAGE_SIZE
+    assert model.canFetchMore()
+
+    model.fetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 450
+    assert not model.canFetchMore()
+    ids = [model.index(r, 0).data(ID_ROLE) for r in range(model.rowCount())]
+    assert len(set(ids)) == 450
+
+
+def test_proxy_sorts_and_filters_in_sql(orders):
+    uid, manager = orders
+    model = _order_model(uid, manager)
+    proxy = SqlSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    model.reload()
+
+    proxy.sort(2, Qt.DescendingOrder)
+    # El primero es el mayor de todos, no solo de la página cargada
+    assert proxy.index(0, 2).data() == "449.00 €"
+    assert proxy.index(0, 3).data() is None
+
+    proxy.set_search_text("ana")
+    assert model.total_count() == 225
+    assert proxy.index(0, 1).data() == "Ana Pérez"
+
+    proxy.sort(3, Qt.AscendingOrder)  # columna sin clave: se ignora
+    assert proxy.index(0, 2).data() == "448.00 €"
+
+
+def test_view_scroll_fetches_more(orders, qtbot):
+    uid, manager = orders
+    model = _order_model(uid, manager)
+    model.reload()
+    view = QTableView()
+    qtbot.addWidget(view)
+    view.setModel(model)
+    view.resize(400, 300)
+    view.show()
+    view.scrollToBottom()
+    qtbot.waitUntil(lambda: model.rowCount() > PagedTableModel.PAGE_SIZE)
+
+
+def test_delegate_emits_action(qtbot):
+    model = PagedTableModel(
+        [Column("Acciones", None)],
+        lambda offset, limit, sort, desc, search: [{'id': 7}] if offset == 0 else [],
+        lambda search: 1,
+    )
+    model.reload()
+    delegate = ActionButtonDelegate([('edit', "Editar", "#007BFF"), ('delete', "Eliminar", "#dc3545")])
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 300, 40)
+    rects = delegate._button_rects(option)
+
+    triggered = []
+    delegate.action_triggered.connect(lambda action, row_id: triggered.append((action, row_id)))
+    index = model.index(0, 0)
+    for rect in rects:
+        event = QMouseEvent(QEvent.MouseButtonRelease, rect.center(), Qt.LeftButton,
+                            Qt.LeftButton, Qt.NoModifier)
+        assert delegate.editorEvent(event, model, option, index)
+    outside = QMouseEvent(QEvent.MouseButtonRelease, QPoint(299, 39), Qt.LeftButton,
+                          Qt.LeftButton, Qt.NoModifier)
+    delegate.editorEvent(outside, model, option, index)
+    assert triggered == [('edit', 7), ('delete', 7)]
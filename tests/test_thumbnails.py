@@ -0,0 +1,87 @@
+import os
+import shutil
+import zipfile
+
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from src.logic.thumbnails import ThumbnailCache, content_hash
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.fixture
+def box_stl(tmp_path):
+    path = tmp_path / "box.stl"
+    trimesh.creation.box(extents=(10, 20, 5)).export(str(path))
+    return str(path)
+
+
+def test_generate_renders_stl(box_stl, tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"), size=64)
+    thumb = cache.generate(box_stl)
+    assert thumb == cache.path_for_hash(content_hash(box_stl))
+    with open(thumb, 'rb') as f:
+        assert f.read(8) == PNG_HEADER
+
+
+def test_cache_is_keyed_by_content(box_stl, tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"), size=64)
+    first = cache.generate(box_stl)
+    copy = tmp_path / "otra_carpeta" / "copia.stl"
+    copy.parent.mkdir()
+    shutil.copy(box_stl, copy)
+    os.utime(first, (0, 0))
+    assert cache.generate(str(copy)) == first
+    assert os.stat(first).st_mtime == 0  # reutilizada, no regenerada
+
+
+def test_3mf_embedded_thumbnail(tmp_path):
+    png = PNG_HEADER + b'\x00' * 32
+    path = tmp_path / "model.3mf"
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('3D/3dmodel.model', '<model/>')
+        zf.writestr('Metadata/thumbnail.png', png)
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+    with open(cache.generate(str(path)), 'rb') as f:
+        assert f.read() == png
+
+
+def test_generate_batch(box_stl, tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"), size=64)
+    missing = str(tmp_path / "no_existe.stl")
+    results = dict(cache.generate_batch([box_stl, missing], max_workers=2))
+    assert results[missing] is None
+    assert os.path.exists(results[box_stl])
+
+
+def test_library_set_thumbnail(db, tmp_path, monkeypatch):
+    from src.database.db_manager import DBManager
+    from src.logic.library_manager import LibraryManager
+
+    monkeypatch.setattr(DBManager, '_get_user_data_dir', staticmethod(lambda: str(tmp_path)))
+    manager = LibraryManager(db)
+    db.execute("INSERT INTO models (name, file_path, thumbnail_path) VALUES ('m', 'm.stl', '')")
+    model_id = manager.get_all_models()[0]['id']
+    manager.set_thumbnail(model_id, '/thumbs/ab/abc_128.png')
+    assert manager.get_all_models()[0]['thumbnail_path'] == '/thumbs/ab/abc_128.png'
+
+
+def test_worker_reports_failed_thumbnails(qtbot, db, tmp_path):
+    from src.ui.thumbnail_worker import ThumbnailWorker
+
+    class FakeCache:
+        def generate_batch(self, file_paths):
+            for path in file_paths:
+                yield path, (str(tmp_path / "ok.png") if path == 'ok.stl' else None)
+
+    worker = ThumbnailWorker([(1, 'ok.stl'), (2, 'roto.stl'), (3, 'roto.stl')],
+                             cache=FakeCache(), db_manager=db)
+    ready, failed = [], []
+    worker.thumbnail_ready.connect(lambda model_id, path: ready.append(model_id))
+    worker.thumbnail_failed.connect(failed.append)
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker.start()
+    qtbot.waitUntil(lambda: len(ready) + len(failed) == 3, timeout=5000)
+    assert ready == [1] and sorted(failed) == [2, 3]
@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+trimesh = pytest.importorskip("trimesh")
+
+from src.logic.mesh_lod import MeshLODCache
+from src.ui.viewer_3d import (
+    MeshLoadCancelled, MeshLoadTask, Viewer3DWidget, load_mesh_arrays
+)
+
+
+@pytest.fixture
+def sphere_stl(tmp_path):
+    path = tmp_path / "sphere.stl"
+    trimesh.creation.icosphere(subdivisions=5, radius=20).export(str(path))  # 20480 caras
+    return str(path)
+
+
+def test_load_mesh_arrays_decimates(sphere_stl):
+    vertices, faces = load_mesh_arrays(sphere_stl, max_faces=2000)
+    assert 0 < len(faces) <= 2000
+    assert faces.max() < len(vertices)
+    # La forma se conserva aproximadamente
+    assert np.abs(vertices).max() == pytest.approx(20, rel=0.1)
+
+
+def test_load_mesh_arrays_cancelled(sphere_stl):
+    with pytest.raises(MeshLoadCancelled):
+        load_mesh_arrays(sphere_stl, is_cancelled=lambda: True)
+
+
+def test_viewer_discards_stale_load(qtbot, sphere_stl, tmp_path):
+    box_path = tmp_path / "box.stl"
+    trimesh.creation.box(extents=(10, 10, 10)).export(str(box_path))
+
+    viewer = Viewer3DWidget(backend='matplotlib')
+    qtbot.addWidget(viewer)
+    rendered = []
+    viewer.render_mesh = lambda vertices, faces, normals=None: rendered.append(len(faces))
+
+    viewer.load_model(sphere_stl)
+    viewer.load_model(str(box_path))
+    assert viewer.is_loading()
+    qtbot.waitUntil(lambda: not viewer.is_loading(), timeout=10000)
+    viewer.thread_pool.waitForDone()
+    qtbot.wait(50)
+
+    assert rendered == [12]
+    assert viewer.status_label.isHidden()
+
+
+def test_load_mesh_arrays_full_resolution(sphere_stl):
+    vertices, faces = load_mesh_arrays(sphere_stl, max_faces=None)
+    assert len(faces) == 20480
+
+
+def test_auto_backend_falls_back_to_matplotlib(qtbot, monkeypatch):
+    monkeypatch.setattr('src.ui.viewer_3d.opengl_available', lambda: False)
+    viewer = Viewer3DWidget()
+    qtbot.addWidget(viewer)
+    assert viewer.backend == 'matplotlib'
+    assert hasattr(viewer, 'ax')
+
+
+def test_load_task_refines_cached_levels(sphere_stl):
+    MeshLODCache.build(sphere_stl, levels=(1000, 5000, None))
+    task = MeshLoadTask(1, sphere_stl, max_faces=None)
+    emitted = []
+    task.signals.loaded.connect(lambda request_id, mesh: emitted.append(mesh))
+    task.run()
+
+    assert [len(mesh['faces']) <= limit for mesh, limit in zip(emitted, (1000, 5000, 20480))] == [True] * 3
+    assert [mesh['final'] for mesh in emitted] == [False, False, True]
+    assert emitted[0]['normals'] is not None